@@ -0,0 +1,40 @@
+"""add (created_at, id) indexes for the keyset-paginated activity feed
+
+Revision ID: add_activity_feed_indexes
+Revises: add_card_transitions
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'add_activity_feed_indexes'
+down_revision: Union[str, None] = 'add_card_transitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_card_history_created_at_id', 'card_history'),
+    ('ix_comments_created_at_id', 'comments'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ['created_at', 'id'],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,35 @@
+"""add partial (column_id, end_date) index for deadline queries
+
+Revision ID: add_card_deadline_index
+Revises: add_activity_feed_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_card_deadline_index'
+down_revision: Union[str, None] = 'add_activity_feed_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Most cards have no end date; leaving them out keeps the index small
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cards_column_id_end_date',
+            'cards',
+            ['column_id', 'end_date'],
+            postgresql_where=sa.text('end_date IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cards_column_id_end_date', table_name='cards', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""add pg_trgm index on card names for duplicate detection
+
+Revision ID: add_card_name_trgm_index
+Revises: add_webhook_log_compaction
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_card_name_trgm_index'
+down_revision: Union[str, None] = 'add_webhook_log_compaction'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # GiST rather than GIN so the index can serve ORDER BY ... <-> KNN scans
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_cards_name_trgm',
+            'cards',
+            [sa.text('lower(name) gist_trgm_ops')],
+            postgresql_using='gist',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_cards_name_trgm', table_name='cards', postgresql_concurrently=True, if_exists=True)
+    # The extension is left installed; other database objects may use it
@@ -0,0 +1,88 @@
+"""add card_transitions and backfill them from card history
+
+Revision ID: add_card_transitions
+Revises: add_daily_flow_rollups
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'add_card_transitions'
+down_revision: Union[str, None] = 'add_daily_flow_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+
+INDEXES = [
+    ('ix_card_transitions_card_id_at', ['card_id', 'at']),
+    ('ix_card_transitions_to_column_id_at', ['to_column_id', 'at']),
+    ('ix_card_transitions_from_column_id_at', ['from_column_id', 'at']),
+]
+
+
+def upgrade() -> None:
+    op.create_table('card_transitions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('card_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('from_column_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('to_column_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('actor_type', postgresql.ENUM(name='actortype', create_type=False), nullable=False),
+        sa.Column('actor_id', sa.String(length=200), nullable=False),
+        sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Moves: log_card_action stores the columns as JSON strings
+    op.execute(f"""
+        INSERT INTO card_transitions (id, card_id, from_column_id, to_column_id, at, actor_type, actor_id)
+        SELECT
+            gen_random_uuid(),
+            h.card_id,
+            CASE WHEN h.changes->>'from_column' ~ '{UUID_PATTERN}' THEN (h.changes->>'from_column')::uuid END,
+            (h.changes->>'to_column')::uuid,
+            COALESCE(h.created_at, now()),
+            h.actor_type,
+            h.actor_id
+        FROM card_history h
+        WHERE h.action = 'moved'
+          AND h.changes->>'to_column' ~ '{UUID_PATTERN}'
+          AND h.changes->>'from_column' IS DISTINCT FROM h.changes->>'to_column'
+    """)
+
+    # Built before the second pass, which looks up each card's first move
+    for name, columns in INDEXES:
+        op.create_index(name, 'card_transitions', columns)
+
+    # Creations: the card started where its first move left from, or where it still is
+    op.execute("""
+        INSERT INTO card_transitions (id, card_id, from_column_id, to_column_id, at, actor_type, actor_id)
+        SELECT
+            gen_random_uuid(),
+            c.id,
+            NULL,
+            COALESCE(
+                (SELECT t.from_column_id FROM card_transitions t
+                 WHERE t.card_id = c.id ORDER BY t.at LIMIT 1),
+                c.column_id
+            ),
+            COALESCE(h.created_at, c.created_at, now()),
+            h.actor_type,
+            h.actor_id
+        FROM card_history h
+        JOIN cards c ON c.id = h.card_id
+        WHERE h.action = 'created'
+    """)
+
+
+def downgrade() -> None:
+    for name, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name='card_transitions')
+    op.drop_table('card_transitions')
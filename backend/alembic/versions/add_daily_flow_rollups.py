@@ -0,0 +1,41 @@
+"""add daily flow rollups for cycle time and throughput
+
+Revision ID: add_daily_flow_rollups
+Revises: add_card_name_trgm_index
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'add_daily_flow_rollups'
+down_revision: Union[str, None] = 'add_card_name_trgm_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled as cards move; run `kanbot db backfill-flow-rollups` for existing history
+    op.create_table('daily_flow_rollups',
+        sa.Column('space_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('column_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('arrivals', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completions', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cycle_time_seconds_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('cycle_time_seconds_min', sa.Float(), nullable=True),
+        sa.Column('cycle_time_seconds_max', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['space_id'], ['spaces.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['column_id'], ['columns.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('space_id', 'column_id', 'day')
+    )
+    op.create_index('ix_daily_flow_rollups_space_id_day', 'daily_flow_rollups', ['space_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_flow_rollups_space_id_day', table_name='daily_flow_rollups')
+    op.drop_table('daily_flow_rollups')
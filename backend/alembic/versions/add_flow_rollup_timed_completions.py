@@ -0,0 +1,34 @@
+"""count completions with a cycle time separately in daily flow rollups
+
+Revision ID: add_flow_rollup_timed_completions
+Revises: drop_flow_rollup_column_fk
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_flow_rollup_timed_completions'
+down_revision: Union[str, None] = 'drop_flow_rollup_column_fk'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'daily_flow_rollups',
+        sa.Column('timed_completions', sa.Integer(), nullable=False, server_default='0'),
+    )
+    # Exact only for days whose completions were all timed or all untimed; run
+    # `kanbot db backfill-flow-rollups` to recount mixed days from transitions
+    op.execute(
+        "UPDATE daily_flow_rollups SET timed_completions = completions "
+        "WHERE cycle_time_seconds_min IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('daily_flow_rollups', 'timed_completions')
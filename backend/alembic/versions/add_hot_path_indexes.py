@@ -0,0 +1,61 @@
+"""add indexes for card, column, history and notification hot paths
+
+Revision ID: add_hot_path_indexes
+Revises: 42498d75dfca
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'add_hot_path_indexes'
+down_revision: Union[str, None] = '42498d75dfca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('ix_cards_column_id_position', 'cards', ['column_id', 'position'], None),
+    ('ix_cards_column_id_column_entered_at', 'cards', ['column_id', 'column_entered_at'], None),
+    ('ix_card_assignees_user_id', 'card_assignees', ['user_id'], None),
+    ('ix_card_tags_tag_id', 'card_tags', ['tag_id'], None),
+    ('ix_comments_card_id_created_at', 'comments', ['card_id', 'created_at'], None),
+    ('ix_card_history_card_id_created_at', 'card_history', ['card_id', 'created_at'], None),
+    ('ix_card_history_actor_id_created_at', 'card_history', ['actor_id', 'created_at'], None),
+    ('ix_card_history_actor_type_created_at', 'card_history', ['actor_type', 'created_at'], None),
+    ('ix_columns_space_id_position', 'columns', ['space_id', 'position'], None),
+    ('ix_notifications_user_id_created_at', 'notifications', ['user_id', 'created_at'], None),
+    ('ix_notifications_user_id_unread', 'notifications', ['user_id', 'created_at'], 'read = false'),
+    ('ix_webhooks_space_id_active', 'webhooks', ['space_id'], 'active = true'),
+    ('ix_webhook_logs_webhook_id_created_at', 'webhook_logs', ['webhook_id', 'created_at'], None),
+    ('ix_space_members_user_id', 'space_members', ['user_id'], None),
+]
+
+
+def upgrade() -> None:
+    # Build concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _where in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
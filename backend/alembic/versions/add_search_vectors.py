@@ -0,0 +1,60 @@
+"""add full-text search vectors to cards, comments and spaces
+
+Revision ID: add_search_vectors
+Revises: add_hot_path_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+revision: str = 'add_search_vectors'
+down_revision: Union[str, None] = 'add_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, generated expression, index name)
+SEARCH_VECTORS = [
+    (
+        'cards',
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+        'ix_cards_search_vector',
+    ),
+    ('comments', "to_tsvector('simple', content)", 'ix_comments_search_vector'),
+    ('spaces', "to_tsvector('simple', name)", 'ix_spaces_search_vector'),
+]
+
+
+def upgrade() -> None:
+    # Stored generated columns are filled for existing rows as they are added
+    for table, expression, _index in SEARCH_VECTORS:
+        op.add_column(
+            table,
+            sa.Column('search_vector', TSVECTOR(), sa.Computed(expression, persisted=True)),
+        )
+
+    with op.get_context().autocommit_block():
+        for table, _expression, index in SEARCH_VECTORS:
+            op.create_index(
+                index,
+                table,
+                ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, _expression, index in reversed(SEARCH_VECTORS):
+            op.drop_index(index, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    for table, _expression, _index in reversed(SEARCH_VECTORS):
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,49 @@
+"""add webhook delivery queue
+
+Revision ID: add_webhook_deliveries
+Revises: add_search_vectors
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'add_webhook_deliveries'
+down_revision: Union[str, None] = 'add_search_vectors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('webhook_deliveries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('webhook_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event', sa.String(length=100), nullable=False),
+        sa.Column('body', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_status', sa.Integer(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.text('now()')),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['webhook_id'], ['webhooks.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_webhook_deliveries_due',
+        'webhook_deliveries',
+        ['next_attempt_at'],
+        postgresql_where=sa.text("status IN ('pending', 'delivering')"),
+    )
+    op.create_index('ix_webhook_deliveries_webhook_id_status', 'webhook_deliveries', ['webhook_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_deliveries_webhook_id_status', table_name='webhook_deliveries')
+    op.drop_index('ix_webhook_deliveries_due', table_name='webhook_deliveries')
+    op.drop_table('webhook_deliveries')
@@ -0,0 +1,42 @@
+"""add deduplicated webhook payloads
+
+Revision ID: add_webhook_log_compaction
+Revises: add_webhook_deliveries
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'add_webhook_log_compaction'
+down_revision: Union[str, None] = 'add_webhook_deliveries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('webhook_payloads',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('webhook_logs', sa.Column('payload_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_webhook_logs_payload_hash', 'webhook_logs', ['payload_hash'])
+
+
+def downgrade() -> None:
+    # Restore inline payloads before dropping the deduplicated copies
+    op.execute("""
+        UPDATE webhook_logs
+        SET payload = webhook_payloads.payload
+        FROM webhook_payloads
+        WHERE webhook_logs.payload_hash = webhook_payloads.hash
+    """)
+    op.drop_index('ix_webhook_logs_payload_hash', table_name='webhook_logs')
+    op.drop_column('webhook_logs', 'payload_hash')
+    op.drop_table('webhook_payloads')
@@ -0,0 +1,37 @@
+"""keep daily flow rollups when their column is deleted
+
+Revision ID: drop_flow_rollup_column_fk
+Revises: add_card_deadline_index
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = 'drop_flow_rollup_column_fk'
+down_revision: Union[str, None] = 'add_card_deadline_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # column_id is part of the primary key, so it cannot be SET NULL; rows of
+    # deleted columns stay and keep counting towards throughput and cycle time
+    op.drop_constraint('daily_flow_rollups_column_id_fkey', 'daily_flow_rollups', type_='foreignkey')
+
+
+def downgrade() -> None:
+    op.execute(
+        "DELETE FROM daily_flow_rollups r "
+        "WHERE NOT EXISTS (SELECT 1 FROM columns c WHERE c.id = r.column_id)"
+    )
+    op.create_foreign_key(
+        'daily_flow_rollups_column_id_fkey',
+        'daily_flow_rollups',
+        'columns',
+        ['column_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
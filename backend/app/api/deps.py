@@ -2,14 +2,12 @@ from typing import Optional, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import UUID
-from datetime import datetime, timezone
 
 from app.core.database import get_db
-from app.core.security import verify_token, hash_api_key
-from app.models.user import User, APIKey
+from app.core.security import verify_token
+from app.models.user import User
+from app.services.auth_cache import get_user, resolve_api_key
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -28,8 +26,7 @@ async def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token",
             )
-        result = await db.execute(select(User).where(User.id == UUID(user_id)))
-        user = result.scalar_one_or_none()
+        user = await get_user(db, UUID(user_id))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,24 +40,12 @@ async def get_current_user(
         return user
     
     if api_key:
-        key_hash = hash_api_key(api_key)
-        result = await db.execute(
-            select(APIKey)
-            .options(selectinload(APIKey.user))
-            .where(APIKey.key_hash == key_hash)
-        )
-        api_key_obj = result.scalar_one_or_none()
-        
-        if not api_key_obj:
+        key_id, user = await resolve_api_key(db, api_key)
+        if not key_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key",
             )
-        
-        api_key_obj.last_used = datetime.now(timezone.utc)
-        await db.commit()
-        
-        user = api_key_obj.user
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -126,24 +111,14 @@ async def get_actor_info(
     db: AsyncSession = Depends(get_db),
 ) -> ActorInfo:
     if api_key:
-        key_hash = hash_api_key(api_key)
-        result = await db.execute(
-            select(APIKey)
-            .options(selectinload(APIKey.user))
-            .where(APIKey.key_hash == key_hash)
-        )
-        api_key_obj = result.scalar_one_or_none()
-        
-        if not api_key_obj or not api_key_obj.user:
+        key_id, user = await resolve_api_key(db, api_key)
+        if not key_id or not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid API key",
             )
         
-        api_key_obj.last_used = datetime.now(timezone.utc)
-        await db.commit()
-        
-        return ActorInfo(api_key_obj.user, is_agent=True, agent_name=f"{api_key_obj.user.username}-bot")
+        return ActorInfo(user, is_agent=True, agent_name=f"{user.username}-bot")
     
     user = await get_current_user(token, None, db)
     return ActorInfo(user, is_agent=False)
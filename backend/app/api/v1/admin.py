@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID
 
@@ -8,11 +8,13 @@ from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.core.database import get_db
+from app.core import metrics
+from app.core.database import get_db, get_read_db
 from app.api.deps import get_current_admin
 from app.models.user import User
-from app.models.space import Space, SpaceType
-from app.models.card import Card, Comment, Task
+from app.models.space import Space
+from app.services.admin_stats import get_system_stats
+from app.services.auth_cache import invalidate_user
 
 router = APIRouter()
 
@@ -181,6 +183,7 @@ async def update_user(
         user.is_admin = data.is_admin
     
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     
     space_count_result = await db.execute(
@@ -224,6 +227,7 @@ async def ban_user(
     user.banned_at = datetime.now(timezone.utc) if data.is_banned else None
     
     await db.commit()
+    invalidate_user(user.id)
     await db.refresh(user)
     
     space_count_result = await db.execute(
@@ -264,58 +268,23 @@ async def delete_user(
     
     await db.delete(user)
     await db.commit()
+    invalidate_user(user_id)
 
 
 @router.get("/stats", response_model=SystemStats)
 async def get_stats(
-    db: AsyncSession = Depends(get_db),
+    refresh: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(get_current_admin),
 ):
-    now = datetime.now(timezone.utc)
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    total_users = (await db.execute(select(func.count(User.id)))).scalar()
-    new_users_week = (await db.execute(
-        select(func.count(User.id)).where(User.created_at >= week_ago)
-    )).scalar()
-    new_users_month = (await db.execute(
-        select(func.count(User.id)).where(User.created_at >= month_ago)
-    )).scalar()
-    
-    active_users = total_users
-    
-    total_spaces = (await db.execute(select(func.count(Space.id)))).scalar()
-    
-    personal_spaces = (await db.execute(
-        select(func.count(Space.id)).where(Space.type == SpaceType.PERSONAL)
-    )).scalar()
-    company_spaces = (await db.execute(
-        select(func.count(Space.id)).where(Space.type == SpaceType.COMPANY)
-    )).scalar()
-    agent_spaces = (await db.execute(
-        select(func.count(Space.id)).where(Space.type == SpaceType.AGENT)
-    )).scalar()
-    
-    total_cards = (await db.execute(select(func.count(Card.id)))).scalar()
-    
-    total_tasks = (await db.execute(select(func.count(Task.id)))).scalar()
-    completed_tasks = (await db.execute(
-        select(func.count(Task.id)).where(Task.completed == True)
-    )).scalar()
-    
-    total_comments = (await db.execute(select(func.count(Comment.id)))).scalar()
-    
-    return SystemStats(
-        total_users=total_users,
-        new_users_this_week=new_users_week,
-        new_users_this_month=new_users_month,
-        active_users_7_days=active_users,
-        total_spaces=total_spaces,
-        personal_spaces=personal_spaces,
-        team_spaces=company_spaces,
-        agent_spaces=agent_spaces,
-        total_cards=total_cards,
-        completed_cards=completed_tasks,
-        total_comments=total_comments,
-    )
+    """System-wide counts from a single statement, cached for a few seconds."""
+    stats = await get_system_stats(db, datetime.now(timezone.utc), refresh=refresh)
+    return SystemStats(**stats)
+
+
+@router.get("/metrics")
+async def get_metrics(
+    admin: User = Depends(get_current_admin),
+):
+    """Counters and gauges for this worker process."""
+    return metrics.snapshot()
@@ -1,15 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, Integer
-from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone, timedelta
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.user import User
-from app.models.space import Space
 from app.models.column import Column
 from app.models.card import Card, CardHistory
 from app.models.agent import Agent, AgentRun
@@ -22,6 +20,7 @@ from app.schemas.agent import (
     AgentStatsResponse,
 )
 from app.services.notifications import create_notification, serialize_notification
+from app.services.authorization import get_membership, verify_space_access
 from app.api.deps import get_current_user, get_actor_info, ActorInfo
 from app.websocket import manager as ws_manager
 
@@ -98,30 +97,14 @@ async def query_audit_logs(
     since: Optional[datetime] = None,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     query = select(CardHistory)
     
     if card_id:
         query = query.where(CardHistory.card_id == card_id)
     if space_id:
-        space_result = await db.execute(
-            select(Space)
-            .where(Space.id == space_id)
-            .options(selectinload(Space.members))
-        )
-        space = space_result.scalar_one_or_none()
-        if not space:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Space not found",
-            )
-        is_member = any(m.user_id == current_user.id for m in space.members)
-        if not is_member:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not a member of this space",
-            )
+        await verify_space_access(space_id, current_user, db)
         query = (
             query.join(Card, Card.id == CardHistory.card_id)
             .join(Column, Column.id == Card.column_id)
@@ -173,19 +156,13 @@ async def delegate_task(
 
     space_id = delegate_data.space_id
     if space_id:
-        space_result = await db.execute(
-            select(Space)
-            .where(Space.id == space_id)
-            .options(selectinload(Space.members))
-        )
-        space = space_result.scalar_one_or_none()
-        if not space:
+        membership = await get_membership(db, space_id, target_user.id)
+        if not membership.space_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Space not found",
             )
-        is_member = any(m.user_id == target_user.id for m in space.members)
-        if not is_member:
+        if not membership.is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Target user is not a member of the space",
@@ -226,25 +203,6 @@ async def delegate_task(
 # Sub-Agent Registry CRUD Operations
 # =============================================================================
 
-async def verify_space_member(space_id: UUID, user: User, db: AsyncSession) -> Space:
-    """Verify user is a member of the space."""
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-    
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    
-    is_member = any(m.user_id == user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-    
-    return space
-
-
 @router.get("/registry", response_model=List[AgentListResponse])
 async def list_agents(
     space_id: UUID,
@@ -253,7 +211,7 @@ async def list_agents(
     db: AsyncSession = Depends(get_db),
 ):
     """List all agents in a space."""
-    await verify_space_member(space_id, current_user, db)
+    await verify_space_access(space_id, current_user, db)
     
     query = select(Agent).where(Agent.space_id == space_id)
     if enabled_only:
@@ -271,7 +229,7 @@ async def create_agent(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new agent in a space."""
-    await verify_space_member(agent_data.space_id, current_user, db)
+    await verify_space_access(agent_data.space_id, current_user, db)
     
     agent = Agent(
         space_id=agent_data.space_id,
@@ -303,7 +261,7 @@ async def get_agent(
     if not agent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
     
-    await verify_space_member(agent.space_id, current_user, db)
+    await verify_space_access(agent.space_id, current_user, db)
     return agent
 
 
@@ -321,7 +279,7 @@ async def update_agent(
     if not agent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
     
-    await verify_space_member(agent.space_id, current_user, db)
+    await verify_space_access(agent.space_id, current_user, db)
     
     update_data = agent_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
@@ -347,7 +305,7 @@ async def delete_agent(
     if not agent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
     
-    await verify_space_member(agent.space_id, current_user, db)
+    await verify_space_access(agent.space_id, current_user, db)
     
     await db.delete(agent)
     await db.commit()
@@ -367,7 +325,7 @@ async def get_agent_runs(
     if not agent:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agent not found")
     
-    await verify_space_member(agent.space_id, current_user, db)
+    await verify_space_access(agent.space_id, current_user, db)
     
     result = await db.execute(
         select(AgentRun)
@@ -385,7 +343,7 @@ async def get_agent_stats(
     db: AsyncSession = Depends(get_db),
 ):
     """Get aggregate stats for agents in a space."""
-    await verify_space_member(space_id, current_user, db)
+    await verify_space_access(space_id, current_user, db)
     
     # Count agents by status
     result = await db.execute(
@@ -428,6 +386,6 @@ async def get_agent_by_card(
         return None
     
     # Verify user has access to the space
-    await verify_space_member(agent.space_id, current_user, db)
+    await verify_space_access(agent.space_id, current_user, db)
     
     return agent
@@ -4,95 +4,92 @@ Analytics API for Kanbot
 Provides metrics and insights about cards, columns, and workflow efficiency.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import wraps
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, func, and_, or_, tuple_
+from sqlalchemy.orm import noload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
-from app.core.database import get_db
+from app.core.database import get_read_db
+from app.core.pagination import decode_cursor, encode_cursor
 from app.api.deps import get_current_user
 from app.models.user import User
-from app.models.card import Card, CardHistory
+from app.models.card import Card, CardTransition
 from app.models.column import Column
 from app.models.space import Space
+from app.schemas.analytics import TimeInColumnsBatch
+from app.api.v1.cards import CARD_RELATIONSHIPS
+from app.services.analytics import (
+    ACTIVITY_TYPES,
+    activity_entry,
+    activity_query,
+    aging_wip_query,
+    batch_time_in_columns,
+    board_summary_query,
+    bucket_range,
+    cfd_query,
+    columnar_cfd,
+    columnar_timeline,
+    completion_totals_query,
+    daily_completions_query,
+    deadline_query,
+    done_column_ids,
+    due_timeline_query,
+    summarize_column,
+    summarize_workload,
+    time_in_columns,
+    workload_query,
+)
+from app.services.analytics_cache import analytics_cache
+from app.services.authorization import verify_space_access
+from app.services.forecast import DEFAULT_TRIALS, daily_history, forecast_dates, simulate_completion_days
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Users accepted by one multi-user workload request
+MAX_WORKLOAD_USERS = 100
 
-@router.get("/cards/{card_id}/time-in-columns")
-async def get_card_time_in_columns(
-    card_id: UUID,
-    db: AsyncSession = Depends(get_db),
-):
-    """
-    Calculate how long a card has spent in each column.
-    
-    Returns time breakdown by column based on card history.
+# Days the due-date timeline covers by default, and at most
+DEFAULT_TIMELINE_DAYS = 30
+MAX_TIMELINE_DAYS = 366
+
+
+def cached(endpoint: str):
     """
-    # Get card with history and column
-    result = await db.execute(
-        select(Card)
-        .options(joinedload(Card.history), joinedload(Card.column))
-        .where(Card.id == card_id)
-    )
-    card = result.unique().scalar_one_or_none()
+    Serve a space endpoint from analytics_cache, keyed by its query parameters.
     
-    if not card:
-        raise HTTPException(status_code=404, detail="Card not found")
-    
-    # Get space_id from the card's column
-    space_id = card.column.space_id
+    The key does not include the caller, so membership is checked here on
+    every request, hit or miss; decorated endpoints must take current_user.
     
-    # Get column names for this space
-    columns_result = await db.execute(
-        select(Column).where(Column.space_id == space_id)
-    )
-    columns = {str(c.id): c.name for c in columns_result.scalars().all()}
-    
-    # Parse history to find column transitions
-    column_times: dict[str, timedelta] = {}
-    current_column_id = str(card.column_id)
-    last_transition_time = card.created_at
-    
-    # Sort history by created_at ascending
-    sorted_history = sorted(card.history, key=lambda h: h.created_at)
-    
-    for entry in sorted_history:
-        if entry.action == "moved" and entry.changes:
-            old_column = entry.changes.get("old_column_id")
-            new_column = entry.changes.get("new_column_id")
-            
-            if old_column and new_column:
-                # Calculate time in old column
-                time_spent = entry.created_at - last_transition_time
-                
-                if old_column not in column_times:
-                    column_times[old_column] = timedelta()
-                column_times[old_column] += time_spent
-                
-                last_transition_time = entry.created_at
-                current_column_id = new_column
-    
-    # Add time in current column
-    now = datetime.now(timezone.utc)
-    time_in_current = now - last_transition_time
-    
-    if current_column_id not in column_times:
-        column_times[current_column_id] = timedelta()
-    column_times[current_column_id] += time_in_current
-    
-    # Format response
+    Only the response body is cached, so endpoints that set headers (the
+    keyset-paginated activity feed and deadline lists) are not decorated.
+    Column stats are addressed by column rather than space, and card
+    time-in-columns by card, so they are not cached either.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(space_id: UUID, **kwargs):
+            await verify_space_access(space_id, kwargs["current_user"], kwargs["db"])
+            params = {k: v for k, v in kwargs.items() if k not in ("db", "current_user")}
+            return await analytics_cache.get_or_compute(
+                space_id, endpoint, params, lambda: func(space_id, **kwargs)
+            )
+        return wrapper
+    return decorator
+
+
+def format_time_in_columns(card, column_times: dict, columns: dict) -> dict:
     time_breakdown = []
     total_time = timedelta()
     
     for col_id, duration in column_times.items():
         total_time += duration
         time_breakdown.append({
-            "column_id": col_id,
+            "column_id": str(col_id),
             "column_name": columns.get(col_id, "Unknown"),
             "duration_seconds": int(duration.total_seconds()),
             "duration_human": format_duration(duration),
@@ -102,9 +99,9 @@ async def get_card_time_in_columns(
     time_breakdown.sort(key=lambda x: x["duration_seconds"], reverse=True)
     
     return {
-        "card_id": str(card_id),
+        "card_id": str(card.id),
         "card_name": card.name,
-        "current_column": columns.get(current_column_id, "Unknown"),
+        "current_column": columns.get(card.column_id, "Unknown"),
         "total_age_seconds": int(total_time.total_seconds()),
         "total_age_human": format_duration(total_time),
         "created_at": card.created_at.isoformat(),
@@ -112,16 +109,80 @@ async def get_card_time_in_columns(
     }
 
 
+async def verify_cards_access(
+    db: AsyncSession,
+    user: User,
+    card_ids: Optional[List[UUID]] = None,
+    column_id: Optional[UUID] = None,
+):
+    """Check the user belongs to every space the cards (or the column) are in."""
+    query = select(Column.space_id).distinct()
+    if column_id is not None:
+        query = query.where(Column.id == column_id)
+    else:
+        query = query.join(Card, Card.column_id == Column.id).where(Card.id.in_(card_ids))
+    for space_id in (await db.execute(query)).scalars().all():
+        await verify_space_access(space_id, user, db)
+
+
+@router.get("/cards/{card_id}/time-in-columns")
+async def get_card_time_in_columns(
+    card_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Calculate how long a card has spent in each column.
+    
+    Returns time breakdown by column based on the card's column transitions.
+    """
+    await verify_cards_access(db, current_user, card_ids=[card_id])
+    results, columns = await batch_time_in_columns(db, datetime.now(timezone.utc), card_ids=[card_id])
+    
+    if not results:
+        raise HTTPException(status_code=404, detail="Card not found")
+    
+    card, column_times = results[0]
+    return format_time_in_columns(card, column_times, columns)
+
+
+@router.post("/cards/time-in-columns")
+async def get_cards_time_in_columns(
+    batch: TimeInColumnsBatch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Time-in-columns for up to 500 cards, or every card in a column, at once.
+    
+    Each entry has the same shape as the single-card endpoint. Requested
+    card IDs that do not exist are listed in missing.
+    """
+    await verify_cards_access(db, current_user, card_ids=batch.card_ids, column_id=batch.column_id)
+    results, columns = await batch_time_in_columns(
+        db, datetime.now(timezone.utc), card_ids=batch.card_ids, column_id=batch.column_id
+    )
+    
+    found = {card.id for card, _ in results}
+    return {
+        "cards": [format_time_in_columns(card, column_times, columns) for card, column_times in results],
+        "missing": [str(card_id) for card_id in batch.card_ids or [] if card_id not in found],
+    }
+
+
 @router.get("/spaces/{space_id}/cycle-time")
+@cached("cycle_time")
 async def get_space_cycle_time(
     space_id: UUID,
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Calculate average cycle time for cards in a space.
     
     Cycle time = time from card creation to moving to done/archive column.
+    Read from the daily flow rollup for cards completed in the period.
     """
     # Get space
     result = await db.execute(select(Space).where(Space.id == space_id))
@@ -130,44 +191,10 @@ async def get_space_cycle_time(
     if not space:
         raise HTTPException(status_code=404, detail="Space not found")
     
-    # Get columns to identify "done" columns (typically last position or named "Done", "Archive", etc.)
-    columns_result = await db.execute(
-        select(Column)
-        .where(Column.space_id == space_id)
-        .order_by(Column.position.desc())
-    )
-    columns = columns_result.scalars().all()
-    
-    # Find done/archive columns (last 2 columns by position, or by name pattern)
-    done_column_ids = []
-    for col in columns[:2]:  # Last 2 columns
-        done_column_ids.append(str(col.id))
-    
-    # Also add columns with "done", "archive", "hotovo" in name
-    for col in columns:
-        if any(kw in col.name.lower() for kw in ["done", "archive", "hotovo", "dokončen"]):
-            if str(col.id) not in done_column_ids:
-                done_column_ids.append(str(col.id))
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    totals = (await db.execute(completion_totals_query(space_id, since))).one()
     
-    # Get cards that are in done columns and were created in the time range
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    
-    # Join with Column to filter by space
-    cards_result = await db.execute(
-        select(Card)
-        .options(joinedload(Card.history))
-        .join(Column, Card.column_id == Column.id)
-        .where(
-            and_(
-                Column.space_id == space_id,
-                Card.column_id.in_([UUID(cid) for cid in done_column_ids]),
-                Card.created_at >= cutoff,
-            )
-        )
-    )
-    cards = cards_result.unique().scalars().all()
-    
-    if not cards:
+    if not totals.completions:
         return {
             "space_id": str(space_id),
             "space_name": space.name,
@@ -178,61 +205,45 @@ async def get_space_cycle_time(
             "message": "No completed cards in this period",
         }
     
-    # Calculate cycle time for each card
-    cycle_times = []
-    
-    for card in cards:
-        # Find when card moved to done column
-        done_time = None
-        sorted_history = sorted(card.history, key=lambda h: h.created_at)
-        
-        for entry in sorted_history:
-            if entry.action == "moved" and entry.changes:
-                new_column = entry.changes.get("new_column_id")
-                if new_column in done_column_ids:
-                    done_time = entry.created_at
-                    break
-        
-        if done_time:
-            cycle_time = done_time - card.created_at
-            cycle_times.append(cycle_time.total_seconds())
-    
-    if not cycle_times:
+    # Completions of cards without a creation time are counted but not timed
+    if not totals.timed_completions:
         return {
             "space_id": str(space_id),
             "space_name": space.name,
             "period_days": days,
-            "completed_cards": len(cards),
+            "completed_cards": totals.completions,
             "average_cycle_time_seconds": None,
             "average_cycle_time_human": "N/A",
-            "message": "Could not calculate cycle times (no move history)",
+            "message": "No completed card in this period has a creation time",
         }
     
-    avg_seconds = sum(cycle_times) / len(cycle_times)
+    avg_seconds = totals.cycle_time_sum / totals.timed_completions
     avg_duration = timedelta(seconds=avg_seconds)
     
     return {
         "space_id": str(space_id),
         "space_name": space.name,
         "period_days": days,
-        "completed_cards": len(cycle_times),
+        "completed_cards": totals.completions,
         "average_cycle_time_seconds": int(avg_seconds),
         "average_cycle_time_human": format_duration(avg_duration),
-        "min_cycle_time_seconds": int(min(cycle_times)),
-        "max_cycle_time_seconds": int(max(cycle_times)),
+        "min_cycle_time_seconds": int(totals.cycle_time_min),
+        "max_cycle_time_seconds": int(totals.cycle_time_max),
     }
 
 
 @router.get("/spaces/{space_id}/throughput")
+@cached("throughput")
 async def get_space_throughput(
     space_id: UUID,
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Calculate card throughput for a space.
     
-    Shows how many cards were completed per day/week.
+    Shows how many cards were completed per day/week, from the daily flow rollup.
     """
     # Get space
     result = await db.execute(select(Space).where(Space.id == space_id))
@@ -241,58 +252,12 @@ async def get_space_throughput(
     if not space:
         raise HTTPException(status_code=404, detail="Space not found")
     
-    # Get done columns
-    columns_result = await db.execute(
-        select(Column)
-        .where(Column.space_id == space_id)
-        .order_by(Column.position.desc())
-    )
-    columns = columns_result.scalars().all()
-    
-    done_column_ids = []
-    for col in columns[:2]:
-        done_column_ids.append(col.id)
-    for col in columns:
-        if any(kw in col.name.lower() for kw in ["done", "archive", "hotovo", "dokončen"]):
-            if col.id not in done_column_ids:
-                done_column_ids.append(col.id)
-    
-    # Count cards completed per day
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    
-    # Get completed cards with their completion dates from history
-    # Join with Column to filter by space
-    cards_result = await db.execute(
-        select(Card)
-        .options(joinedload(Card.history))
-        .join(Column, Card.column_id == Column.id)
-        .where(
-            and_(
-                Column.space_id == space_id,
-                Card.column_id.in_(done_column_ids),
-            )
-        )
-    )
-    cards = cards_result.unique().scalars().all()
-    
-    # Group by completion date
-    daily_completions: dict[str, int] = {}
-    
-    for card in cards:
-        sorted_history = sorted(card.history, key=lambda h: h.created_at)
-        
-        for entry in sorted_history:
-            if entry.action == "moved" and entry.changes:
-                new_column = entry.changes.get("new_column_id")
-                if new_column and UUID(new_column) in done_column_ids:
-                    if entry.created_at >= cutoff:
-                        date_key = entry.created_at.strftime("%Y-%m-%d")
-                        daily_completions[date_key] = daily_completions.get(date_key, 0) + 1
-                    break
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).date()
+    daily = (await db.execute(daily_completions_query(space_id, since))).all()
     
     # Calculate stats
-    total_completed = sum(daily_completions.values())
-    active_days = len(daily_completions)
+    total_completed = sum(row.completions for row in daily)
+    active_days = len(daily)
     
     return {
         "space_id": str(space_id),
@@ -303,12 +268,138 @@ async def get_space_throughput(
         "avg_per_day": round(total_completed / days, 2) if days > 0 else 0,
         "avg_per_week": round(total_completed / (days / 7), 2) if days >= 7 else 0,
         "daily_breakdown": [
-            {"date": date, "count": count}
-            for date, count in sorted(daily_completions.items())
+            {"date": row.day.isoformat(), "count": row.completions}
+            for row in daily
         ],
     }
 
 
+@router.get("/spaces/{space_id}/forecast")
+@cached("forecast")
+async def get_space_forecast(
+    space_id: UUID,
+    remaining: Optional[int] = Query(None, ge=1, le=100000),
+    days: int = Query(90, ge=7, le=365),
+    trials: int = Query(DEFAULT_TRIALS, ge=1000, le=100000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Forecast when remaining cards will be done by Monte Carlo resampling of
+    the last `days` full days of throughput.
+    
+    remaining defaults to the cards currently outside the done columns.
+    """
+    result = await db.execute(select(Space).where(Space.id == space_id))
+    space = result.scalar_one_or_none()
+    
+    if not space:
+        raise HTTPException(status_code=404, detail="Space not found")
+    
+    if remaining is None:
+        columns_result = await db.execute(
+            select(Column.id, Column.name, Column.position).where(Column.space_id == space_id)
+        )
+        all_columns = columns_result.all()
+        done_ids = done_column_ids(all_columns)
+        open_ids = [c.id for c in all_columns if c.id not in done_ids]
+        count_result = await db.execute(select(func.count(Card.id)).where(Card.column_id.in_(open_ids)))
+        remaining = count_result.scalar() or 0
+    
+    today = datetime.now(timezone.utc).date()
+    since = today - timedelta(days=days)
+    daily = (await db.execute(daily_completions_query(space_id, since))).all()
+    history = daily_history(daily, since, today)
+    
+    response = {
+        "space_id": str(space_id),
+        "space_name": space.name,
+        "remaining_cards": remaining,
+        "history_days": days,
+        "history_completed": int(history.sum()),
+        "trials": trials,
+    }
+    if remaining and not history.any():
+        return {
+            **response,
+            "forecast": None,
+            "message": "No completed cards in the history window",
+        }
+    
+    simulated = simulate_completion_days(history, remaining, trials)
+    return {**response, "forecast": forecast_dates(simulated, today)}
+
+
+@router.get("/spaces/{space_id}/cfd")
+@cached("cfd")
+async def get_cumulative_flow(
+    space_id: UUID,
+    interval: str = Query("day", pattern="^(day|hour)$"),
+    buckets: int = Query(30, ge=1, le=366),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Cumulative flow: cards in each column at the end of every day or hour.
+    
+    counts[i][j] is the number of cards in columns[i] at the end of buckets[j].
+    """
+    now = datetime.now(timezone.utc)
+    first, last = bucket_range(now, interval, buckets)
+    result = await db.execute(cfd_query(space_id, interval, first, last))
+    
+    return {
+        "space_id": str(space_id),
+        "interval": interval,
+        **columnar_cfd(result.all()),
+        "generated_at": now.isoformat(),
+    }
+
+
+@router.get("/spaces/{space_id}/aging-wip")
+@cached("aging_wip")
+async def get_aging_wip(
+    space_id: UUID,
+    unit: str = Query("day", pattern="^(day|hour)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Age of every card that is not in a done column.
+    
+    The cards arrays are parallel: cards.column[k] indexes into columns, age
+    counts whole units since work started and column_age since the card
+    entered its current column.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(Column.id, Column.name, Column.position)
+        .where(Column.space_id == space_id)
+        .order_by(Column.position)
+    )
+    all_columns = result.all()
+    done_ids = done_column_ids(all_columns)
+    columns = [c for c in all_columns if c.id not in done_ids]
+    column_index = {c.id: i for i, c in enumerate(columns)}
+    
+    cards = {"id": [], "column": [], "age": [], "column_age": []}
+    if columns:
+        result = await db.execute(aging_wip_query(list(column_index), now, unit))
+        for row in result.all():
+            cards["id"].append(str(row.id))
+            cards["column"].append(column_index[row.column_id])
+            cards["age"].append(row.age)
+            cards["column_age"].append(row.column_age)
+    
+    return {
+        "space_id": str(space_id),
+        "unit": unit,
+        "columns": [{"id": str(c.id), "name": c.name} for c in columns],
+        "cards": cards,
+        "generated_at": now.isoformat(),
+    }
+
+
 def format_duration(duration: timedelta) -> str:
     """Format a timedelta as human-readable string."""
     total_seconds = int(duration.total_seconds())
@@ -337,78 +428,37 @@ def format_duration(duration: timedelta) -> str:
 
 
 @router.get("/spaces/{space_id}/summary")
+@cached("summary")
 async def get_board_summary(
     space_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get a quick summary of the board state.
     
-    Returns card counts per column, oldest card age, and recent activity.
+    Returns card counts, WIP limits and age distribution per column, and the
+    oldest card age, all from a single grouped query.
     """
-    from app.models.column import Column
-    from app.services.card_age import compute_card_age_days
-    from datetime import datetime, timezone
-    
-    # Get columns in this space
-    result = await db.execute(
-        select(Column)
-        .where(Column.space_id == space_id)
-        .order_by(Column.position)
-    )
-    columns = result.scalars().all()
-    
     now = datetime.now(timezone.utc)
-    column_stats = []
-    total_cards = 0
-    oldest_card_age = 0
-    
-    for column in columns:
-        # Count cards in column
-        card_result = await db.execute(
-            select(func.count(Card.id)).where(Card.column_id == column.id)
-        )
-        card_count = card_result.scalar() or 0
-        total_cards += card_count
-        
-        # Find oldest card in column
-        oldest_result = await db.execute(
-            select(Card.column_entered_at)
-            .where(Card.column_id == column.id)
-            .order_by(Card.column_entered_at.asc())
-            .limit(1)
-        )
-        oldest_entered = oldest_result.scalar()
-        
-        column_oldest_age = 0
-        if oldest_entered:
-            age = compute_card_age_days(oldest_entered, now)
-            if age:
-                column_oldest_age = age
-                if age > oldest_card_age:
-                    oldest_card_age = age
-        
-        column_stats.append({
-            "id": str(column.id),
-            "name": column.name,
-            "card_count": card_count,
-            "oldest_card_age_days": column_oldest_age,
-        })
+    result = await db.execute(board_summary_query(space_id, now))
+    column_stats = [summarize_column(row, now) for row in result.all()]
     
     return {
         "space_id": str(space_id),
-        "total_cards": total_cards,
+        "total_cards": sum(c["card_count"] for c in column_stats),
         "columns": column_stats,
-        "oldest_card_age_days": oldest_card_age,
+        "oldest_card_age_days": max((c["oldest_card_age_days"] for c in column_stats), default=0),
+        "columns_over_wip_limit": sum(1 for c in column_stats if c["over_wip_limit"]),
         "generated_at": now.isoformat(),
     }
 
 
 @router.get("/spaces/{space_id}/tags")
+@cached("tags")
 async def get_tag_statistics(
     space_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get tag usage statistics for a space.
     
@@ -451,67 +501,53 @@ async def get_tag_statistics(
 @router.get("/spaces/{space_id}/activity")
 async def get_space_activity(
     space_id: UUID,
-    limit: int = 20,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    actor_id: Optional[str] = None,
+    types: Optional[List[str]] = Query(None, alias="type", description="card_change and/or comment"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get recent activity feed for a space.
     
-    Returns recent card changes, comments, and movements.
+    Returns card changes and comments, newest first, from one UNION ALL
+    query. When a full page is returned the next page's cursor is in the
+    `X-Next-Cursor` header; every page costs the same however far back it is.
     """
-    from app.models.comment import Comment
-    
-    activities = []
-    
-    # Get recent card history entries
-    history_result = await db.execute(
-        select(CardHistory)
-        .join(Card)
-        .join(Column)
-        .where(Column.space_id == space_id)
-        .order_by(CardHistory.changed_at.desc())
-        .limit(limit)
-    )
-    history_entries = history_result.scalars().all()
-    
-    for entry in history_entries:
-        activities.append({
-            "type": "card_change",
-            "timestamp": entry.changed_at.isoformat() if entry.changed_at else None,
-            "card_id": str(entry.card_id),
-            "field": entry.field_name,
-            "old_value": entry.old_value,
-            "new_value": entry.new_value,
-            "actor_name": entry.actor_name,
-        })
-    
-    # Get recent comments
-    comment_result = await db.execute(
-        select(Comment)
-        .join(Card)
-        .join(Column)
-        .where(Column.space_id == space_id)
-        .order_by(Comment.created_at.desc())
-        .limit(limit)
-    )
-    comments = comment_result.scalars().all()
-    
-    for comment in comments:
-        activities.append({
-            "type": "comment",
-            "timestamp": comment.created_at.isoformat() if comment.created_at else None,
-            "card_id": str(comment.card_id),
-            "actor_name": comment.actor_name,
-            "content_preview": comment.content[:100] if comment.content else None,
-        })
+    await verify_space_access(space_id, current_user, db)
+    
+    types = set(types or ACTIVITY_TYPES)
+    unknown = types - set(ACTIVITY_TYPES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown activity types: {', '.join(sorted(unknown))}",
+        )
     
-    # Sort by timestamp and limit
-    activities.sort(key=lambda x: x["timestamp"] or "", reverse=True)
+    before = None
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        try:
+            before = (datetime.fromisoformat(after["created_at"]), UUID(after["id"]))
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    result = await db.execute(activity_query(space_id, limit, before, since, actor_id, types))
+    rows = result.all()
+    
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            {"created_at": last.created_at.isoformat(), "id": str(last.id)}
+        )
     
+    activities = [activity_entry(row) for row in rows]
     return {
         "space_id": str(space_id),
-        "activities": activities[:limit],
-        "count": len(activities[:limit]),
+        "activities": activities,
+        "count": len(activities),
     }
 
 
@@ -519,25 +555,25 @@ async def get_space_activity(
 async def get_column_stats(
     column_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get statistics for a specific column.
     
     Returns card counts, average age, and throughput.
     """
-    from app.models.column import Column as ColumnModel
     from app.services.card_age import compute_card_age_days
     
     # Get column
     result = await db.execute(
-        select(ColumnModel).where(ColumnModel.id == column_id)
+        select(Column).where(Column.id == column_id)
     )
     column = result.scalar_one_or_none()
     
     if not column:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Column not found")
     
+    await verify_space_access(column.space_id, current_user, db)
+    
     now = datetime.now(timezone.utc)
     
     # Get cards in column
@@ -561,11 +597,10 @@ async def get_column_stats(
     # Count cards moved out in last 7 days (throughput)
     week_ago = now - timedelta(days=7)
     throughput_result = await db.execute(
-        select(func.count(CardHistory.id))
+        select(func.count(CardTransition.id))
         .where(
-            CardHistory.field_name == "column_id",
-            CardHistory.old_value == str(column_id),
-            CardHistory.changed_at >= week_ago,
+            CardTransition.from_column_id == column_id,
+            CardTransition.at >= week_ago,
         )
     )
     weekly_throughput = throughput_result.scalar() or 0
@@ -581,95 +616,163 @@ async def get_column_stats(
     }
 
 
+def workload_viewer(user: User) -> Optional[UUID]:
+    """Whose spaces a workload covers: the caller's, or every space for admins."""
+    return None if user.is_admin else user.id
+
+
+@router.get("/users/workload")
+async def get_users_workload(
+    user_ids: List[UUID] = Query(...),
+    due_soon_days: int = Query(7, ge=1, le=90),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get workload statistics for several users in one request.
+    
+    Returns the same body as /users/{user_id}/workload for each user, in the
+    order requested.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) > MAX_WORKLOAD_USERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_WORKLOAD_USERS} users per request",
+        )
+    
+    now = datetime.now(timezone.utc)
+    result = await db.execute(workload_query(user_ids, now, due_soon_days, workload_viewer(current_user)))
+    workloads = summarize_workload(result.all(), user_ids)
+    
+    return {
+        "due_soon_days": due_soon_days,
+        "users": [workloads[user_id] for user_id in user_ids],
+        "generated_at": now.isoformat(),
+    }
+
+
 @router.get("/users/{user_id}/workload")
 async def get_user_workload(
     user_id: UUID,
+    due_soon_days: int = Query(7, ge=1, le=90),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get workload statistics for a user.
     
-    Returns assigned cards grouped by space.
+    Returns assigned cards grouped by space, with counts per column and
+    column category and how many are overdue or due within due_soon_days,
+    all from a single grouped query.
     """
-    # Get cards assigned to user
-    result = await db.execute(
-        select(Card)
-        .join(Card.assignees)
-        .where(User.id == user_id)
-        .options(
-            selectinload(Card.column).selectinload(Column.space)
+    now = datetime.now(timezone.utc)
+    result = await db.execute(workload_query([user_id], now, due_soon_days, workload_viewer(current_user)))
+    workload = summarize_workload(result.all(), [user_id])[user_id]
+    
+    return {**workload, "due_soon_days": due_soon_days, "generated_at": now.isoformat()}
+
+
+DEADLINE_RELATIONSHIPS = ("assignees", "tags")
+
+
+async def deadline_page(
+    db: AsyncSession,
+    response: Response,
+    query,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+) -> list:
+    """Run a deadline_query page with the requested relationships loaded.
+    
+    Without a limit every match is returned. With one, the first page sets
+    X-Total-Count and full pages set X-Next-Cursor, as in the card list.
+    """
+    if fields is None:
+        relationships = set(DEADLINE_RELATIONSHIPS)
+    else:
+        relationships = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = relationships - set(DEADLINE_RELATIONSHIPS)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+    
+    if limit is not None and cursor is None:
+        count_result = await db.execute(
+            select(func.count()).select_from(query.order_by(None).subquery())
         )
+        response.headers["X-Total-Count"] = str(count_result.scalar() or 0)
+    
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        try:
+            query = query.where(
+                tuple_(Card.end_date, Card.id)
+                > tuple_(datetime.fromisoformat(after["end_date"]), UUID(after["id"]))
+            )
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    query = query.options(
+        *[
+            CARD_RELATIONSHIPS[name]() if name in relationships else noload(getattr(Card, name))
+            for name in DEADLINE_RELATIONSHIPS
+        ]
     )
-    cards = result.scalars().all()
-    
-    # Group by space
-    by_space = {}
-    for card in cards:
-        space_name = card.column.space.name if card.column and card.column.space else "Unknown"
-        space_id = str(card.column.space.id) if card.column and card.column.space else None
-        
-        if space_id not in by_space:
-            by_space[space_id] = {
-                "space_name": space_name,
-                "card_count": 0,
-                "by_column": {},
-            }
-        
-        by_space[space_id]["card_count"] += 1
-        
-        col_name = card.column.name if card.column else "Unknown"
-        if col_name not in by_space[space_id]["by_column"]:
-            by_space[space_id]["by_column"][col_name] = 0
-        by_space[space_id]["by_column"][col_name] += 1
+    if limit is not None:
+        query = query.limit(limit)
+    
+    rows = (await db.execute(query)).all()
+    if limit is not None and len(rows) == limit:
+        last = rows[-1].Card
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            {"end_date": last.end_date.isoformat(), "id": str(last.id)}
+        )
     
-    return {
-        "user_id": str(user_id),
-        "total_assigned": len(cards),
-        "by_space": list(by_space.values()),
-    }
+    entries = []
+    for card, column_name in rows:
+        entry = {
+            "id": str(card.id),
+            "name": card.name,
+            "due_date": card.end_date.isoformat(),
+            "column_name": column_name,
+        }
+        if "assignees" in relationships:
+            entry["assignees"] = [u.username for u in card.assignees]
+        if "tags" in relationships:
+            entry["tags"] = [card_tag.tag.name for card_tag in card.tags if card_tag.tag]
+        entries.append((card, entry))
+    return entries
 
 
 @router.get("/spaces/{space_id}/overdue")
 async def get_overdue_cards(
     space_id: UUID,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated relationships to load: assignees, tags"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all overdue cards in a space.
     
-    Returns cards past their due date, sorted by how overdue.
+    Returns cards past their end date outside archive columns, most overdue
+    first. Pass `limit` to page through them with `X-Next-Cursor`.
     """
-    now = datetime.now(timezone.utc).date()
-    
-    result = await db.execute(
-        select(Card)
-        .join(Column)
-        .where(
-            Column.space_id == space_id,
-            Card.due_date != None,
-            Card.due_date < now,
-        )
-        .options(
-            selectinload(Card.column),
-            selectinload(Card.assignees),
-        )
-        .order_by(Card.due_date.asc())
+    await verify_space_access(space_id, current_user, db)
+    now = datetime.now(timezone.utc)
+    entries = await deadline_page(
+        db, response, deadline_query(space_id, due_until=now), limit, cursor, fields
     )
-    cards = result.scalars().all()
     
     return {
         "space_id": str(space_id),
-        "overdue_count": len(cards),
+        "overdue_count": len(entries),
         "cards": [
-            {
-                "id": str(card.id),
-                "name": card.name,
-                "due_date": card.due_date.isoformat() if card.due_date else None,
-                "days_overdue": (now - card.due_date).days if card.due_date else 0,
-                "column_name": card.column.name if card.column else None,
-                "assignees": [u.username for u in (card.assignees or [])],
-            }
-            for card in cards
+            {**entry, "days_overdue": (now - card.end_date).days}
+            for card, entry in entries
         ],
     }
 
@@ -677,47 +780,61 @@ async def get_overdue_cards(
 @router.get("/spaces/{space_id}/upcoming")
 async def get_upcoming_deadlines(
     space_id: UUID,
-    days: int = 7,
+    response: Response,
+    days: int = Query(7, ge=1, le=366),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated relationships to load: assignees, tags"),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get cards with upcoming deadlines.
     
-    Returns cards due within the specified number of days.
+    Returns cards due within the specified number of days, soonest first.
+    Pass `limit` to page through them with `X-Next-Cursor`.
     """
-    now = datetime.now(timezone.utc).date()
-    future = now + timedelta(days=days)
-    
-    result = await db.execute(
-        select(Card)
-        .join(Column)
-        .where(
-            Column.space_id == space_id,
-            Card.due_date != None,
-            Card.due_date >= now,
-            Card.due_date <= future,
-        )
-        .options(
-            selectinload(Card.column),
-            selectinload(Card.assignees),
-        )
-        .order_by(Card.due_date.asc())
-    )
-    cards = result.scalars().all()
+    await verify_space_access(space_id, current_user, db)
+    now = datetime.now(timezone.utc)
+    query = deadline_query(space_id, due_from=now, due_until=now + timedelta(days=days))
+    entries = await deadline_page(db, response, query, limit, cursor, fields)
     
     return {
         "space_id": str(space_id),
         "days_ahead": days,
-        "upcoming_count": len(cards),
+        "upcoming_count": len(entries),
         "cards": [
-            {
-                "id": str(card.id),
-                "name": card.name,
-                "due_date": card.due_date.isoformat() if card.due_date else None,
-                "days_until_due": (card.due_date - now).days if card.due_date else 0,
-                "column_name": card.column.name if card.column else None,
-                "assignees": [u.username for u in (card.assignees or [])],
-            }
-            for card in cards
+            {**entry, "days_until_due": (card.end_date - now).days}
+            for card, entry in entries
         ],
     }
+
+
+@router.get("/spaces/{space_id}/due-timeline")
+@cached("due_timeline")
+async def get_due_timeline(
+    space_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Open cards due on each day from start to end (default: the next 30 days).
+    
+    days and counts are parallel arrays with one entry per UTC day, from a
+    single grouped query.
+    """
+    start = start or datetime.now(timezone.utc).date()
+    end = end or start + timedelta(days=DEFAULT_TIMELINE_DAYS - 1)
+    if end < start or (end - start).days >= MAX_TIMELINE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"end must be on or after start and at most {MAX_TIMELINE_DAYS} days later",
+        )
+    
+    result = await db.execute(due_timeline_query(space_id, start, end))
+    return {
+        "space_id": str(space_id),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        **columnar_timeline(result.all(), start, end),
+    }
@@ -29,6 +29,7 @@ from app.schemas.user import (
     APIKeyCreatedResponse,
 )
 from app.api.deps import get_current_user
+from app.services.auth_cache import api_key_usage, invalidate_api_key
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -195,3 +196,5 @@ async def delete_api_key(
     
     await db.delete(api_key)
     await db.commit()
+    invalidate_api_key(api_key.key_hash)
+    api_key_usage.forget(api_key.id)
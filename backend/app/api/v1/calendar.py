@@ -18,6 +18,8 @@ from app.schemas.calendar import (
     CalendarResponse,
 )
 from app.api.deps import get_current_user
+from app.services.auth_cache import invalidate_user
+from app.services.authorization import get_membership
 
 router = APIRouter()
 
@@ -26,15 +28,15 @@ async def verify_calendar_access(calendar_id: UUID, user: User, db: AsyncSession
     result = await db.execute(
         select(Calendar)
         .where(Calendar.id == calendar_id)
-        .options(selectinload(Calendar.space).selectinload(Space.members))
+        .options(selectinload(Calendar.space))
     )
     calendar = result.scalar_one_or_none()
     
     if not calendar:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Calendar not found")
     
-    is_member = any(m.user_id == user.id for m in calendar.space.members)
-    if not is_member and not calendar.space.calendar_public:
+    membership = await get_membership(db, calendar.space_id, user.id)
+    if not membership.is_member and not calendar.space.calendar_public:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this calendar")
     
     return calendar
@@ -49,15 +51,15 @@ async def get_space_calendar(
     result = await db.execute(
         select(Space)
         .where(Space.id == space_id)
-        .options(selectinload(Space.members), selectinload(Space.calendar))
+        .options(selectinload(Space.calendar))
     )
     space = result.scalar_one_or_none()
     
     if not space:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
     
-    is_member = any(m.user_id == current_user.id for m in space.members)
-    if not is_member and not space.calendar_public:
+    membership = await get_membership(db, space_id, current_user.id)
+    if not membership.is_member and not space.calendar_public:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this calendar")
     
     return space.calendar
@@ -101,8 +103,8 @@ async def create_calendar_event(
 ):
     calendar = await verify_calendar_access(event_data.calendar_id, current_user, db)
     
-    is_member = any(m.user_id == current_user.id for m in calendar.space.members)
-    if not is_member:
+    membership = await get_membership(db, calendar.space_id, current_user.id)
+    if not membership.is_member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot create events in this calendar")
     
     event = CalendarEvent(
@@ -133,15 +135,15 @@ async def update_calendar_event(
     result = await db.execute(
         select(CalendarEvent)
         .where(CalendarEvent.id == event_id)
-        .options(selectinload(CalendarEvent.calendar).selectinload(Calendar.space).selectinload(Space.members))
+        .options(selectinload(CalendarEvent.calendar))
     )
     event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
     
-    is_member = any(m.user_id == current_user.id for m in event.calendar.space.members)
-    if not is_member:
+    membership = await get_membership(db, event.calendar.space_id, current_user.id)
+    if not membership.is_member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot update events in this calendar")
     
     if event_data.title is not None:
@@ -174,15 +176,15 @@ async def delete_calendar_event(
     result = await db.execute(
         select(CalendarEvent)
         .where(CalendarEvent.id == event_id)
-        .options(selectinload(CalendarEvent.calendar).selectinload(Calendar.space).selectinload(Space.members))
+        .options(selectinload(CalendarEvent.calendar))
     )
     event = result.scalar_one_or_none()
     
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
     
-    is_member = any(m.user_id == current_user.id for m in event.calendar.space.members)
-    if not is_member:
+    membership = await get_membership(db, event.calendar.space_id, current_user.id)
+    if not membership.is_member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot delete events in this calendar")
     
     await db.delete(event)
@@ -247,6 +249,7 @@ async def google_calendar_callback(
     
     current_user.settings["google_calendar_token"] = token_data
     await db.commit()
+    invalidate_user(current_user.id)
     
     return {"success": True}
 
@@ -259,6 +262,7 @@ async def disconnect_google_calendar(
     if current_user.settings:
         current_user.settings.pop("google_calendar_token", None)
         await db.commit()
+        invalidate_user(current_user.id)
     
     return {"success": True}
 
@@ -1,18 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, and_, func, distinct, tuple_, false
+from sqlalchemy.orm import selectinload, noload
 from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime, timezone
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.pagination import encode_cursor, decode_cursor
 from app.core.sanitize import sanitize_text
 from app.models.user import User
 from app.services.card_age import compute_card_age_days
 from app.models.space import Space, SpaceMember
 from app.models.column import Column, ColumnCategory
-from app.models.card import Card, Task, Comment, CardTag, CardDependency, CardHistory
+from app.models.card import Card, Task, Comment, CardTag, CardDependency, CardHistory, CardTransition
 from app.models.tag import Tag
 from app.schemas.card import (
     CardCreate,
@@ -33,6 +34,9 @@ from app.websocket import manager as ws_manager
 from app.services.webhooks import dispatch_webhooks
 from app.services.notifications import create_notification, serialize_notification, notify_mentions
 from app.services.duplicates import find_similar_cards, calculate_similarity
+from app.services.search import build_tsquery, to_tsquery, matches
+from app.services.analytics import record_card_move
+from app.services.authorization import get_membership, space_member_ids, verify_space_access
 
 router = APIRouter()
 
@@ -42,9 +46,7 @@ async def verify_card_access(card_id: UUID, user: User, db: AsyncSession) -> Car
         select(Card)
         .where(Card.id == card_id)
         .options(
-            selectinload(Card.column)
-            .selectinload(Column.space)
-            .selectinload(Space.members),
+            selectinload(Card.column).selectinload(Column.space),
             selectinload(Card.assignees),
             selectinload(Card.tags).selectinload(CardTag.tag),
             selectinload(Card.creator),
@@ -55,9 +57,7 @@ async def verify_card_access(card_id: UUID, user: User, db: AsyncSession) -> Car
     if not card:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
     
-    is_member = any(m.user_id == user.id for m in card.column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(card.column.space_id, user, db)
     
     return card
 
@@ -80,8 +80,34 @@ async def log_card_action(
     db.add(history)
 
 
+def log_card_transition(
+    db: AsyncSession,
+    card: Card,
+    from_column_id: Optional[UUID],
+    to_column_id: UUID,
+    at: datetime,
+    actor: ActorInfo,
+):
+    db.add(CardTransition(
+        card_id=card.id,
+        from_column_id=from_column_id,
+        to_column_id=to_column_id,
+        at=at,
+        actor_type=actor.actor_type,
+        actor_id=actor.actor_id,
+    ))
+
+
+CARD_RELATIONSHIPS = {
+    "tags": lambda: selectinload(Card.tags).selectinload(CardTag.tag),
+    "assignees": lambda: selectinload(Card.assignees),
+    "creator": lambda: selectinload(Card.creator),
+}
+
+
 @router.get("", response_model=List[CardResponse])
 async def list_cards(
+    response: Response,
     space_id: Optional[UUID] = None,
     column_id: Optional[UUID] = None,
     assignee_id: Optional[UUID] = None,
@@ -93,20 +119,35 @@ async def list_cards(
     search: Optional[str] = None,
     waiting_only: Optional[bool] = None,
     urgent_only: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated relationships to load: tags, assignees, creator"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """List cards across the user's spaces.
+
+    Results are ordered by (position, id). Pass `limit` to page through them;
+    the next page's cursor is returned in the `X-Next-Cursor` header and the
+    first page also reports the total match count in `X-Total-Count`.
+    """
+    if fields is None:
+        relationships = set(CARD_RELATIONSHIPS)
+    else:
+        relationships = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = relationships - set(CARD_RELATIONSHIPS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+
     query = (
         select(Card)
         .join(Column)
         .join(Space, Column.space_id == Space.id)
         .join(SpaceMember)
         .where(SpaceMember.user_id == current_user.id)
-        .options(
-            selectinload(Card.tags).selectinload(CardTag.tag),
-            selectinload(Card.assignees),
-            selectinload(Card.creator),
-        )
     )
     
     if space_id:
@@ -126,20 +167,47 @@ async def list_cards(
     if end_date_to:
         query = query.where(Card.end_date <= end_date_to)
     if search:
-        query = query.where(
-            or_(
-                Card.name.ilike(f"%{search}%"),
-                Card.description.ilike(f"%{search}%"),
-            )
-        )
+        search_query = build_tsquery(search)
+        if search_query is None:
+            query = query.where(false())
+        else:
+            query = query.where(matches(Card.search_vector, to_tsquery(search_query)))
     if waiting_only:
         query = query.where(Column.category == ColumnCategory.WAITING)
     if urgent_only:
         query = query.where(Card.end_date != None, Card.end_date <= date.today())
     
-    query = query.order_by(Card.position)
+    if limit is not None and cursor is None:
+        count_result = await db.execute(
+            query.with_only_columns(func.count(distinct(Card.id))).order_by(None)
+        )
+        response.headers["X-Total-Count"] = str(count_result.scalar() or 0)
+
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        try:
+            after_position, after_id = int(after["position"]), UUID(after["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.where(tuple_(Card.position, Card.id) > tuple_(after_position, after_id))
+
+    query = query.options(
+        *[
+            CARD_RELATIONSHIPS[name]() if name in relationships else noload(getattr(Card, name))
+            for name in CARD_RELATIONSHIPS
+        ]
+    ).order_by(Card.position, Card.id)
+    if limit is not None:
+        query = query.limit(limit)
+
     result = await db.execute(query)
-    return result.scalars().unique().all()
+    cards = result.scalars().unique().all()
+
+    if limit is not None and len(cards) == limit:
+        last = cards[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor({"position": last.position, "id": str(last.id)})
+
+    return cards
 
 
 @router.post("", response_model=CardResponse, status_code=status.HTTP_201_CREATED)
@@ -151,19 +219,14 @@ async def create_card(
     result = await db.execute(
         select(Column)
         .where(Column.id == card_data.column_id)
-        .options(
-            selectinload(Column.space)
-            .selectinload(Space.members)
-        )
+        .options(selectinload(Column.space))
     )
     column = result.scalar_one_or_none()
     
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found")
     
-    is_member = any(m.user_id == actor.user.id for m in column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(column.space_id, actor.user, db)
     
     result = await db.execute(
         select(Card)
@@ -235,6 +298,7 @@ async def create_card(
                 db.add(card_tag)
     
     await log_card_action(db, card, "created", {"name": card.name}, actor)
+    log_card_transition(db, card, None, card.column_id, card.column_entered_at, actor)
     
     await db.commit()
 
@@ -246,9 +310,7 @@ async def create_card(
             selectinload(Card.tags).selectinload(CardTag.tag),
             selectinload(Card.assignees),
             selectinload(Card.creator),
-            selectinload(Card.column)
-            .selectinload(Column.space)
-            .selectinload(Space.members),
+            selectinload(Card.column).selectinload(Column.space),
         )
     )
     created_card = result.scalar_one()
@@ -275,9 +337,9 @@ async def create_card(
     )
     if actor.is_agent:
         notify_targets = {
-            member.user_id
-            for member in created_card.column.space.members
-            if member.user_id != actor.user.id
+            user_id
+            for user_id in await space_member_ids(db, created_card.column.space_id)
+            if user_id != actor.user.id
         }
         created_notifications = []
         for user_id in notify_targets:
@@ -331,9 +393,7 @@ async def get_card(
             selectinload(Card.tasks),
             selectinload(Card.comments),
             selectinload(Card.creator),
-            selectinload(Card.column)
-            .selectinload(Column.space)
-            .selectinload(Space.members),
+            selectinload(Card.column).selectinload(Column.space),
         )
     )
     card = result.scalar_one_or_none()
@@ -341,9 +401,7 @@ async def get_card(
     if not card:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
     
-    is_member = any(m.user_id == current_user.id for m in card.column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(card.column.space_id, current_user, db)
     
     return card
 
@@ -428,7 +486,6 @@ async def update_card(
     for ct in card.tags:
         await db.refresh(ct, attribute_names=["tag"])
     await db.refresh(card.column, attribute_names=["space"])
-    await db.refresh(card.column.space, attribute_names=["members"])
     updated_card = card
     space_id = str(updated_card.column.space.id)
     
@@ -452,9 +509,9 @@ async def update_card(
     )
     if actor.is_agent:
         notify_targets = {
-            member.user_id
-            for member in updated_card.column.space.members
-            if member.user_id != actor.user.id
+            user_id
+            for user_id in await space_member_ids(db, updated_card.column.space_id)
+            if user_id != actor.user.id
         }
         created_notifications = []
         for user_id in notify_targets:
@@ -505,18 +562,15 @@ async def move_card(
     result = await db.execute(
         select(Column)
         .where(Column.id == move_data.column_id)
-        .options(
-            selectinload(Column.space)
-            .selectinload(Space.members)
-        )
+        .options(selectinload(Column.space))
     )
     target_column = result.scalar_one_or_none()
     
     if not target_column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Target column not found")
     
-    is_member = any(m.user_id == actor.user.id for m in target_column.space.members)
-    if not is_member:
+    membership = await get_membership(db, target_column.space_id, actor.user.id)
+    if not membership.is_member:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of target space")
     
     old_column_id = card.column_id
@@ -528,8 +582,9 @@ async def move_card(
         card.start_date = date.today()
 
     # Update column_entered_at when card moves to a different column
+    moved_at = datetime.now(timezone.utc)
     if old_column_id != move_data.column_id:
-        card.column_entered_at = datetime.now(timezone.utc)
+        card.column_entered_at = moved_at
 
     card.column_id = move_data.column_id
     if move_data.position is not None:
@@ -540,6 +595,9 @@ async def move_card(
         {"from_column": str(old_column_id), "to_column": str(move_data.column_id)},
         actor
     )
+    if old_column_id != move_data.column_id:
+        log_card_transition(db, card, old_column_id, move_data.column_id, moved_at, actor)
+    await record_card_move(db, card, old_column_id, target_column, moved_at)
     
     await db.commit()
     
@@ -555,9 +613,9 @@ async def move_card(
     )
     if actor.is_agent:
         notify_targets = {
-            member.user_id
-            for member in target_column.space.members
-            if member.user_id != actor.user.id
+            user_id
+            for user_id in await space_member_ids(db, target_column.space_id)
+            if user_id != actor.user.id
         }
         created_notifications = []
         for user_id in notify_targets:
@@ -632,9 +690,9 @@ async def delete_card(
     await ws_manager.send_card_deleted(space_id, str(card_id), str(column_id), str(actor.user.id))
     if actor.is_agent:
         notify_targets = {
-            member.user_id
-            for member in card.column.space.members
-            if member.user_id != actor.user.id
+            user_id
+            for user_id in await space_member_ids(db, card.column.space_id)
+            if user_id != actor.user.id
         }
         created_notifications = []
         for user_id in notify_targets:
@@ -882,9 +940,9 @@ async def add_comment(
 
     if actor.is_agent:
         notify_targets = {
-            member.user_id
-            for member in card.column.space.members
-            if member.user_id != actor.user.id
+            user_id
+            for user_id in await space_member_ids(db, card.column.space_id)
+            if user_id != actor.user.id
         }
         created_notifications = []
         for user_id in notify_targets:
@@ -1208,7 +1266,7 @@ async def export_cards(
     include_tasks: bool = True,
     include_history: bool = False,
     actor: ActorInfo = Depends(get_actor_info),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Export all cards in a space as JSON.
     
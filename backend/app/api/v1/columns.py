@@ -7,33 +7,16 @@ from uuid import UUID
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.space import Space, SpaceMember
 from app.models.column import Column
 from app.models.card import Card, CardTag
 from app.schemas.column import ColumnCreate, ColumnUpdate, ColumnResponse, ColumnWithCardsResponse
+from app.services.analytics_cache import analytics_cache
+from app.services.authorization import verify_space_access
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
 
-async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> Space:
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-    
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    
-    is_member = any(m.user_id == user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-    
-    return space
-
-
 @router.get("", response_model=List[ColumnResponse])
 async def list_columns(
     space_id: UUID,
@@ -78,6 +61,7 @@ async def create_column(
     )
     db.add(column)
     await db.commit()
+    await analytics_cache.invalidate(column.space_id)
     await db.refresh(column)
     
     return column
@@ -95,7 +79,6 @@ async def get_column(
         .options(
             selectinload(Column.cards).selectinload(Card.tags).selectinload(CardTag.tag),
             selectinload(Column.cards).selectinload(Card.assignees),
-            selectinload(Column.space).selectinload(Space.members),
         )
     )
     column = result.scalar_one_or_none()
@@ -103,9 +86,7 @@ async def get_column(
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found")
     
-    is_member = any(m.user_id == current_user.id for m in column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(column.space_id, current_user, db)
     
     return column
 
@@ -118,18 +99,14 @@ async def update_column(
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
-        select(Column)
-        .where(Column.id == column_id)
-        .options(selectinload(Column.space).selectinload(Space.members))
+        select(Column).where(Column.id == column_id)
     )
     column = result.scalar_one_or_none()
     
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found")
     
-    is_member = any(m.user_id == current_user.id for m in column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(column.space_id, current_user, db)
     
     if column_data.name is not None:
         column.name = column_data.name
@@ -141,6 +118,8 @@ async def update_column(
         column.settings = column_data.settings
     
     await db.commit()
+    # Names, order, WIP limits and the done-column set all feed analytics
+    await analytics_cache.invalidate(column.space_id)
     await db.refresh(column)
     
     return column
@@ -153,18 +132,16 @@ async def delete_column(
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
-        select(Column)
-        .where(Column.id == column_id)
-        .options(selectinload(Column.space).selectinload(Space.members))
+        select(Column).where(Column.id == column_id)
     )
     column = result.scalar_one_or_none()
     
     if not column:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Column not found")
     
-    is_member = any(m.user_id == current_user.id for m in column.space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(column.space_id, current_user, db)
     
+    space_id = column.space_id
     await db.delete(column)
     await db.commit()
+    await analytics_cache.invalidate(space_id)
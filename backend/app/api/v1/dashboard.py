@@ -8,7 +8,7 @@ from pydantic import BaseModel
 import os
 import json
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.user import User
 from app.models.card import Card, CardHistory
 from app.models.space import Space
@@ -213,7 +213,7 @@ async def get_cron_jobs(
 @router.get("/status", response_model=DashboardStats)
 async def get_dashboard_status(
     current_user: User = Depends(get_current_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get comprehensive dashboard status for Qratos monitoring"""
     
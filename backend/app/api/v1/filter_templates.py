@@ -6,25 +6,14 @@ from uuid import UUID
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.space import SpaceMember
 from app.models.filter_template import FilterTemplate
 from app.schemas.filter_template import FilterTemplateCreate, FilterTemplateUpdate, FilterTemplateResponse
+from app.services.authorization import verify_space_access
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
 
-async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> None:
-    result = await db.execute(
-        select(SpaceMember).where(
-            SpaceMember.space_id == space_id,
-            SpaceMember.user_id == user.id,
-        )
-    )
-    if not result.scalar_one_or_none():
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-
-
 @router.get("", response_model=List[FilterTemplateResponse])
 async def list_filter_templates(
     space_id: UUID,
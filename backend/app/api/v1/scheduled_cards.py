@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from typing import List
 from uuid import UUID
 from datetime import datetime, timedelta
@@ -9,12 +8,12 @@ from datetime import timezone as dt_timezone
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.space import Space, SpaceMember
 from app.models.column import Column
 from app.models.column import Column, ColumnCategory
 from app.models.card import Card, Task, CardTag
 from app.models.scheduled_card import ScheduledCard, RecurrenceInterval
 from app.schemas.scheduled_card import ScheduledCardCreate, ScheduledCardUpdate, ScheduledCardResponse
+from app.services.authorization import verify_space_access
 from app.api.deps import get_current_user, get_actor_info, ActorInfo
 
 router = APIRouter()
@@ -50,24 +49,6 @@ def calculate_next_run(current_datetime: datetime, interval: RecurrenceInterval)
     return current_datetime + timedelta(days=1)
 
 
-async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> Space:
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-    
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    
-    is_member = any(m.user_id == user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-    
-    return space
-
-
 @router.get("", response_model=List[ScheduledCardResponse])
 async def list_scheduled_cards(
     space_id: UUID,
@@ -1,17 +1,17 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, or_, func
 from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.space import Space, SpaceMember
 from app.models.column import Column
-from app.models.card import Card
+from app.models.card import Card, Comment
+from app.services.search import build_tsquery, to_tsquery, matches, rank, headline
 
 router = APIRouter()
 
@@ -23,11 +23,23 @@ class SearchCardResult(BaseModel):
     space_id: UUID
     space_name: str
     column_name: str
+    snippet: Optional[str] = None
+    rank: float = 0.0
     
     class Config:
         from_attributes = True
 
 
+class SearchCommentResult(BaseModel):
+    id: UUID
+    card_id: UUID
+    card_name: str
+    space_id: UUID
+    space_name: str
+    snippet: str
+    rank: float = 0.0
+
+
 class SearchSpaceResult(BaseModel):
     id: UUID
     name: str
@@ -39,8 +51,10 @@ class SearchSpaceResult(BaseModel):
 
 class SearchResponse(BaseModel):
     cards: List[SearchCardResult] = Field(default_factory=list)
+    comments: List[SearchCommentResult] = Field(default_factory=list)
     spaces: List[SearchSpaceResult] = Field(default_factory=list)
     total_cards: int = 0
+    total_comments: int = 0
     total_spaces: int = 0
 
 
@@ -51,8 +65,16 @@ async def global_search(
     space_id: Optional[UUID] = None,
     limit: int = Query(default=20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    """Ranked full-text search over cards, comments and spaces.
+
+    Every word in `q` is matched as a prefix. Results are ordered by relevance.
+    `snippet` is HTML-escaped text with matches in <mark> tags, taken from a
+    card's description, or from its name when only the name matches. The
+    `total_*` fields count every match, not just the returned page. Comments
+    are only searched when "comments" is listed in `types`.
+    """
     user_space_ids_result = await db.execute(
         select(Space.id).where(
             or_(
@@ -71,56 +93,142 @@ async def global_search(
     if space_id and space_id not in user_space_ids:
         return SearchResponse()
     
+    query_text = build_tsquery(q)
+    if query_text is None:
+        return SearchResponse()
+    
     search_space_ids = [space_id] if space_id else user_space_ids
-    search_term = f"%{q}%"
+    tsquery = to_tsquery(query_text)
     
     response = SearchResponse()
     
     if "cards" in types:
-        cards_query = (
-            select(Card, Column.name.label('column_name'), Space.name.label('space_name'), Space.id.label('space_id'))
+        card_filter = (
+            select(Card.id)
             .join(Column, Card.column_id == Column.id)
-            .join(Space, Column.space_id == Space.id)
             .where(
-                Space.id.in_(search_space_ids),
-                or_(
-                    Card.name.ilike(search_term),
-                    Card.description.ilike(search_term)
-                )
+                Column.space_id.in_(search_space_ids),
+                matches(Card.search_vector, tsquery),
             )
-            .limit(limit)
         )
+        response.total_cards = (
+            await db.execute(select(func.count()).select_from(card_filter.subquery()))
+        ).scalar() or 0
         
-        cards_result = await db.execute(cards_query)
-        for row in cards_result.fetchall():
-            card, column_name, space_name, space_id = row
-            response.cards.append(SearchCardResult(
-                id=card.id,
-                name=card.name,
-                description=card.description[:100] if card.description else None,
-                space_id=space_id,
-                space_name=space_name,
-                column_name=column_name,
-            ))
-        response.total_cards = len(response.cards)
+        if response.total_cards:
+            # Rank and limit first so ts_headline only runs on the returned page
+            top_cards = (
+                card_filter
+                .add_columns(rank(Card.search_vector, tsquery).label("rank"))
+                .order_by(rank(Card.search_vector, tsquery).desc(), Card.id)
+                .limit(limit)
+                .subquery()
+            )
+            cards_query = (
+                select(
+                    Card.id,
+                    Card.name,
+                    Card.description,
+                    headline(Card.description, tsquery, fallback=Card.name).label("snippet"),
+                    Column.name.label("column_name"),
+                    Space.name.label("space_name"),
+                    Space.id.label("space_id"),
+                    top_cards.c.rank,
+                )
+                .join(top_cards, top_cards.c.id == Card.id)
+                .join(Column, Card.column_id == Column.id)
+                .join(Space, Column.space_id == Space.id)
+                .order_by(top_cards.c.rank.desc(), Card.id)
+            )
+            
+            cards_result = await db.execute(cards_query)
+            for row in cards_result.fetchall():
+                response.cards.append(SearchCardResult(
+                    id=row.id,
+                    name=row.name,
+                    description=row.description[:100] if row.description else None,
+                    space_id=row.space_id,
+                    space_name=row.space_name,
+                    column_name=row.column_name,
+                    snippet=row.snippet or None,
+                    rank=row.rank,
+                ))
     
-    if "spaces" in types:
-        spaces_query = (
-            select(Space)
+    if "comments" in types:
+        comment_filter = (
+            select(Comment.id)
+            .join(Card, Comment.card_id == Card.id)
+            .join(Column, Card.column_id == Column.id)
             .where(
-                Space.id.in_(search_space_ids),
-                Space.name.ilike(search_term)
+                Column.space_id.in_(search_space_ids),
+                Comment.is_deleted == False,
+                matches(Comment.search_vector, tsquery),
             )
-            .limit(limit)
         )
+        response.total_comments = (
+            await db.execute(select(func.count()).select_from(comment_filter.subquery()))
+        ).scalar() or 0
+        
+        if response.total_comments:
+            top_comments = (
+                comment_filter
+                .add_columns(rank(Comment.search_vector, tsquery).label("rank"))
+                .order_by(rank(Comment.search_vector, tsquery).desc(), Comment.id)
+                .limit(limit)
+                .subquery()
+            )
+            comments_query = (
+                select(
+                    Comment.id,
+                    Comment.card_id,
+                    Card.name.label("card_name"),
+                    headline(Comment.content, tsquery).label("snippet"),
+                    Space.name.label("space_name"),
+                    Space.id.label("space_id"),
+                    top_comments.c.rank,
+                )
+                .join(top_comments, top_comments.c.id == Comment.id)
+                .join(Card, Comment.card_id == Card.id)
+                .join(Column, Card.column_id == Column.id)
+                .join(Space, Column.space_id == Space.id)
+                .order_by(top_comments.c.rank.desc(), Comment.id)
+            )
+            
+            comments_result = await db.execute(comments_query)
+            for row in comments_result.fetchall():
+                response.comments.append(SearchCommentResult(
+                    id=row.id,
+                    card_id=row.card_id,
+                    card_name=row.card_name,
+                    space_id=row.space_id,
+                    space_name=row.space_name,
+                    snippet=row.snippet,
+                    rank=row.rank,
+                ))
+    
+    if "spaces" in types:
+        space_filter = [
+            Space.id.in_(search_space_ids),
+            matches(Space.search_vector, tsquery),
+        ]
+        response.total_spaces = (
+            await db.execute(select(func.count(Space.id)).where(*space_filter))
+        ).scalar() or 0
         
-        spaces_result = await db.execute(spaces_query)
-        for space in spaces_result.scalars():
-            response.spaces.append(SearchSpaceResult(
-                id=space.id,
-                name=space.name,
-                type=space.type.value,
-            ))
-        response.total_spaces = len(response.spaces)
+        if response.total_spaces:
+            spaces_query = (
+                select(Space)
+                .where(*space_filter)
+                .order_by(rank(Space.search_vector, tsquery).desc(), Space.id)
+                .limit(limit)
+            )
+            
+            spaces_result = await db.execute(spaces_query)
+            for space in spaces_result.scalars():
+                response.spaces.append(SearchSpaceResult(
+                    id=space.id,
+                    name=space.name,
+                    type=space.type.value,
+                ))
     
     return response
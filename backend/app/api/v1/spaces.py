@@ -17,6 +17,7 @@ from app.models.tag import Tag
 from app.models.notification import Notification
 from app.schemas.space import SpaceCreate, SpaceUpdate, SpaceResponse, SpaceMemberResponse, InviteMember
 from app.schemas.space import SpaceStatsResponse
+from app.services.authorization import invalidate_membership, verify_space_access
 from app.api.deps import get_current_user
 from app.websocket import manager as ws_manager
 
@@ -206,19 +207,7 @@ async def get_space_stats(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-
-    is_member = any(m.user_id == current_user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    await verify_space_access(space_id, current_user, db)
 
     result = await db.execute(
         select(Column.category, Card.id, Card.end_date)
@@ -357,6 +346,7 @@ async def delete_space(
     
     await db.delete(space)
     await db.commit()
+    invalidate_membership(space_id, db=db)
 
 
 @router.post("/{space_id}/invite", response_model=SpaceMemberResponse)
@@ -407,6 +397,7 @@ async def invite_member(
     db.add(notification)
     
     await db.commit()
+    invalidate_membership(space_id, user_to_invite.id, db)
     await db.refresh(member)
     
     member_response = SpaceMemberResponse(
@@ -462,3 +453,4 @@ async def remove_member(
     
     await db.delete(member_to_remove)
     await db.commit()
+    invalidate_membership(space_id, user_id, db)
@@ -1,39 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from typing import List
 from uuid import UUID
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.space import Space, SpaceMember
 from app.models.tag import Tag
 from app.schemas.tag import TagCreate, TagUpdate, TagResponse
+from app.services.authorization import verify_space_access
 from app.api.deps import get_current_user
 from app.websocket import manager as ws_manager
 
 router = APIRouter()
 
 
-async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> Space:
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-    
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    
-    is_member = any(m.user_id == user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-    
-    return space
-
-
 @router.get("", response_model=List[TagResponse])
 async def list_tags(
     space_id: UUID,
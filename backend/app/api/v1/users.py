@@ -10,6 +10,7 @@ from app.core.security import get_password_hash, verify_password
 from app.models.user import User
 from app.schemas.user import UserUpdate, UserResponse
 from app.api.deps import get_current_user
+from app.services.auth_cache import invalidate_user
 
 router = APIRouter()
 
@@ -68,6 +69,7 @@ async def update_current_user(
         current_user.settings = user_data.settings
     
     await db.commit()
+    invalidate_user(current_user.id)
     await db.refresh(current_user)
     return current_user
 
@@ -86,6 +88,7 @@ async def change_password(
     
     current_user.password_hash = get_password_hash(data.new_password)
     await db.commit()
+    invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
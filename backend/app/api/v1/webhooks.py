@@ -1,39 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
+from datetime import datetime, timezone
 from uuid import UUID
 import secrets
 
 from app.core.database import get_db
 from app.models.user import User
-from app.models.space import Space, SpaceMember
-from app.models.webhook import Webhook, WebhookLog
-from app.schemas.webhook import WebhookCreate, WebhookUpdate, WebhookResponse, WebhookLogResponse
+from app.models.webhook import Webhook, WebhookLog, WebhookDelivery, WebhookPayload, DeliveryStatus
+from app.schemas.webhook import WebhookCreate, WebhookUpdate, WebhookResponse, WebhookLogResponse, WebhookDeliveryResponse
+from app.services.webhooks import delivery_worker
+from app.services.authorization import verify_space_access
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
 
-async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> Space:
-    result = await db.execute(
-        select(Space)
-        .where(Space.id == space_id)
-        .options(selectinload(Space.members))
-    )
-    space = result.scalar_one_or_none()
-    
-    if not space:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
-    
-    is_member = any(m.user_id == user.id for m in space.members)
-    if not is_member:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
-    
-    return space
-
-
 @router.get("", response_model=List[WebhookResponse])
 async def list_webhooks(
     space_id: UUID,
@@ -132,9 +115,85 @@ async def get_webhook_logs(
     await verify_space_access(webhook.space_id, current_user, db)
     
     result = await db.execute(
-        select(WebhookLog)
+        select(WebhookLog, WebhookPayload.payload)
+        .outerjoin(WebhookPayload, WebhookLog.payload_hash == WebhookPayload.hash)
         .where(WebhookLog.webhook_id == webhook_id)
         .order_by(WebhookLog.created_at.desc())
         .limit(100)
     )
+    return [
+        WebhookLogResponse(
+            id=log.id,
+            webhook_id=log.webhook_id,
+            event=log.event,
+            payload=(stored_payload if log.payload_hash else log.payload) or {},
+            response_status=log.response_status,
+            success=log.success,
+            created_at=log.created_at,
+        )
+        for log, stored_payload in result.all()
+    ]
+
+
+@router.get("/{webhook_id}/deliveries", response_model=List[WebhookDeliveryResponse])
+async def list_webhook_deliveries(
+    webhook_id: UUID,
+    delivery_status: Optional[str] = Query(None, alias="status"),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queued, in-flight, delivered and dead-lettered calls for a webhook."""
+    result = await db.execute(select(Webhook).where(Webhook.id == webhook_id))
+    webhook = result.scalar_one_or_none()
+    
+    if not webhook:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
+    
+    await verify_space_access(webhook.space_id, current_user, db)
+    
+    query = select(WebhookDelivery).where(WebhookDelivery.webhook_id == webhook_id)
+    if delivery_status:
+        query = query.where(WebhookDelivery.status == delivery_status)
+    result = await db.execute(query.order_by(WebhookDelivery.created_at.desc()).limit(limit))
     return result.scalars().all()
+
+
+@router.post("/{webhook_id}/deliveries/{delivery_id}/retry", response_model=WebhookDeliveryResponse)
+async def retry_webhook_delivery(
+    webhook_id: UUID,
+    delivery_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Requeue a dead-lettered delivery with a fresh attempt budget."""
+    result = await db.execute(select(Webhook).where(Webhook.id == webhook_id))
+    webhook = result.scalar_one_or_none()
+    
+    if not webhook:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
+    
+    await verify_space_access(webhook.space_id, current_user, db)
+    
+    result = await db.execute(
+        select(WebhookDelivery).where(
+            WebhookDelivery.id == delivery_id,
+            WebhookDelivery.webhook_id == webhook_id,
+        )
+    )
+    delivery = result.scalar_one_or_none()
+    
+    if not delivery:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
+    if delivery.status != DeliveryStatus.DEAD:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only dead-lettered deliveries can be retried")
+    
+    delivery.status = DeliveryStatus.PENDING
+    delivery.attempts = 0
+    delivery.next_attempt_at = datetime.now(timezone.utc)
+    delivery.completed_at = None
+    await db.commit()
+    await db.refresh(delivery)
+    delivery_worker.wake()
+    
+    return delivery
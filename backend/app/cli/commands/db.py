@@ -197,3 +197,113 @@ def seed(
         output_error(str(e), json, "SEED_ERROR")
     finally:
         session.close()
+
+
+@app.command("compact-webhook-logs")
+def compact_webhook_logs(
+    json: bool = typer.Option(False, help="Output as JSON"),
+):
+    """Apply the webhook log retention policy now."""
+    from datetime import timezone
+    from sqlalchemy import text
+    from app.cli.utils.db import get_db_session
+    from app.services.webhook_logs import compaction_statements, COMPACTION_LOCK_KEY
+    
+    session = get_db_session()
+    try:
+        locked = session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": COMPACTION_LOCK_KEY}).scalar()
+        if not locked:
+            output_error("Compaction is already running in another process", json, "COMPACTION_LOCKED")
+            return
+        
+        deleted = {}
+        for label, statement in compaction_statements(
+            datetime.now(timezone.utc),
+            settings.WEBHOOK_LOG_RETENTION_DAYS,
+            settings.WEBHOOK_LOG_MAX_PER_WEBHOOK,
+        ):
+            deleted[label] = session.execute(statement).rowcount
+        session.commit()
+        
+        output_success("Webhook logs compacted", json, {"deleted": deleted})
+        if not json:
+            for label, count in deleted.items():
+                console.print(f"  {label}: {count}")
+    
+    except Exception as e:
+        session.rollback()
+        output_error(str(e), json, "COMPACTION_ERROR")
+    finally:
+        session.close()
+
+
+@app.command("backfill-flow-rollups")
+def backfill_flow_rollups(
+    space_id: Optional[str] = typer.Option(None, "--space", help="Only rebuild this space"),
+    json: bool = typer.Option(False, help="Output as JSON"),
+):
+    """Rebuild the daily cycle-time and throughput rollup from card transitions."""
+    from uuid import UUID
+    from sqlalchemy import delete, select
+    from app.cli.utils.db import get_db_session
+    from app.models.analytics import DailyFlowRollup
+    from app.models.card import Card, CardTransition
+    from app.models.column import Column
+    from app.services.analytics import done_column_ids, flow_row, merge_flow_rows, rollup_upsert
+    
+    only_space = None
+    if space_id:
+        try:
+            only_space = UUID(space_id)
+        except ValueError:
+            output_error(f"Invalid space ID: {space_id}", json, "INVALID_ID")
+            return
+    
+    session = get_db_session()
+    try:
+        columns = session.execute(select(Column.id, Column.space_id, Column.name, Column.position)).all()
+        column_space = {c.id: c.space_id for c in columns}
+        columns_by_space = {}
+        for c in columns:
+            columns_by_space.setdefault(c.space_id, []).append(c)
+        done_by_space = {space: done_column_ids(cols) for space, cols in columns_by_space.items()}
+        
+        moves = session.execute(
+            select(CardTransition.from_column_id, CardTransition.to_column_id, CardTransition.at, Card.created_at)
+            .join(Card, CardTransition.card_id == Card.id)
+            .where(CardTransition.from_column_id.is_not(None))
+            .execution_options(yield_per=5000)
+        )
+        
+        def increments():
+            for from_column, to_column, moved_at, card_created_at in moves:
+                space = column_space.get(to_column)
+                if space is None or (only_space and space != only_space):
+                    continue
+                yield flow_row(space, from_column, to_column, moved_at, card_created_at, done_by_space[space])
+        
+        rows = merge_flow_rows(increments())
+        
+        cleared = delete(DailyFlowRollup)
+        if only_space:
+            cleared = cleared.where(DailyFlowRollup.space_id == only_space)
+        session.execute(cleared)
+        for start in range(0, len(rows), 1000):
+            session.execute(rollup_upsert(rows[start:start + 1000]))
+        session.commit()
+        
+        data = {
+            "rows": len(rows),
+            "moves": sum(r["arrivals"] for r in rows),
+            "completions": sum(r["completions"] for r in rows),
+        }
+        output_success("Flow rollups rebuilt", json, data)
+        if not json:
+            for label, count in data.items():
+                console.print(f"  {label}: {count}")
+    
+    except Exception as e:
+        session.rollback()
+        output_error(str(e), json, "BACKFILL_ERROR")
+    finally:
+        session.close()
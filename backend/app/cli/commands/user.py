@@ -10,6 +10,7 @@ from rich.table import Table
 
 from app.cli.utils.output import output_success, output_error, output_data, create_table, console
 from app.cli.utils.db import get_db_session
+from app.core.invalidation import publish_invalidation
 from app.core.security import get_password_hash
 from app.models.user import User
 
@@ -222,6 +223,7 @@ def delete_user(
         user_email = user.email
         session.delete(user)
         session.commit()
+        publish_invalidation("auth_user", user_id)
         
         output_success(f"User '{user_email}' deleted", json, {"id": user_id, "email": user_email})
     
@@ -258,6 +260,7 @@ def reset_password(
         user.failed_login_count = 0
         user.locked_until = None
         session.commit()
+        publish_invalidation("auth_user", str(user.id))
         
         data = {"id": str(user.id), "email": user.email}
         if generated_password:
@@ -293,6 +296,7 @@ def ban_user(
         user.is_banned = True
         user.banned_at = datetime.now(timezone.utc)
         session.commit()
+        publish_invalidation("auth_user", str(user.id))
         
         output_success(f"User '{user.email}' has been banned", json, {"id": str(user.id), "email": user.email})
     
@@ -320,6 +324,7 @@ def unban_user(
         user.is_banned = False
         user.banned_at = None
         session.commit()
+        publish_invalidation("auth_user", str(user.id))
         
         output_success(f"User '{user.email}' has been unbanned", json, {"id": str(user.id), "email": user.email})
     
@@ -347,6 +352,7 @@ def set_admin(
         
         user.is_admin = not revoke
         session.commit()
+        publish_invalidation("auth_user", str(user.id))
         
         action = "revoked from" if revoke else "granted to"
         output_success(f"Admin status {action} '{user.email}'", json, {"id": str(user.id), "email": user.email, "is_admin": user.is_admin})
@@ -0,0 +1,62 @@
+"""Bounded in-process LRU caches with a time-to-live.
+
+Each worker keeps its own entries, so a change made through another worker
+(or the CLI) is only seen once the entry expires; callers that change the
+underlying data in this process invalidate it directly. Hits, misses and
+invalidations are counted as <name>_cache_* metrics.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core import metrics
+
+_MISSING = object()
+
+
+class TTLCache:
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live entry for key, counting a hit or a miss."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                metrics.inc(f"{self.name}_cache_hits")
+                return entry[1]
+            del self._entries[key]
+        metrics.inc(f"{self.name}_cache_misses")
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        if self._entries.pop(key, _MISSING) is not _MISSING:
+            metrics.inc(f"{self.name}_cache_invalidations")
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            self.invalidate(key)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,16 +1,138 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from sqlalchemy import create_engine
+"""Database engines and sessions.
+
+The API's async engine is sized by the DB_POOL_* settings. Its pool reports
+checkouts, checkout wait time, timeouts, overflow and utilisation as
+db_pool_* metrics. With DB_PGBOUNCER the connections go through PgBouncer in
+transaction mode: pooling is left to PgBouncer (NullPool) and asyncpg's
+prepared statement caches are disabled. The psycopg2 engine used by the CLI
+is only created the first time a sync session is requested.
+
+With DATABASE_READ_URL set, a second engine with the same pool settings
+serves get_read_db; see app.core.read_routing for when reads stay on the
+primary.
+"""
+import time
 from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from fastapi import Request
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.read_routing import wants_primary
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout; the wait includes opening a new connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc("db_pool_checkout_timeouts")
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            metrics.inc("db_pool_checkouts")
+            metrics.inc("db_pool_checkout_wait_seconds", waited)
+            metrics.max_gauge("db_pool_checkout_wait_max_seconds", waited)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(InstrumentedPoolMixin, NullPool):
+    pass
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+def pgbouncer_connect_args() -> Dict[str, Any]:
+    """asyncpg arguments for PgBouncer transaction pooling: no named statements are reused."""
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def engine_options(config=settings) -> Dict[str, Any]:
+    """Keyword arguments for create_async_engine built from the DB_* settings."""
+    options: Dict[str, Any] = {"echo": False, "pool_pre_ping": config.DB_POOL_PRE_PING}
+    if config.DB_PGBOUNCER:
+        options["poolclass"] = InstrumentedNullPool
+        options["connect_args"] = pgbouncer_connect_args()
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+        connect_args={"prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE},
+    )
+    return options
+
+
+def pool_stats(pool: Pool, config=settings) -> Dict[str, float]:
+    """Current size, checked-out and overflow connections of a queue pool sized by DB_MAX_OVERFLOW."""
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"size": 0, "checked_out": 0, "overflow": 0, "utilisation": 0.0}
+    capacity = pool.size() + max(config.DB_MAX_OVERFLOW, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "utilisation": checked_out / capacity if capacity else 0.0,
+    }
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-sync_database_url = settings.DATABASE_URL.replace('+asyncpg', '+psycopg2')
-sync_engine = create_engine(sync_database_url, echo=False)
-sync_session_maker = sessionmaker(bind=sync_engine, expire_on_commit=False)
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(settings.DATABASE_READ_URL, **engine_options())
+    read_session_maker = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+else:
+    read_engine = engine
+    read_session_maker = async_session_maker
+
+for _stat in ("size", "checked_out", "overflow", "utilisation"):
+    metrics.register_gauge(f"db_pool_{_stat}", lambda stat=_stat: pool_stats(engine.pool)[stat])
+    if read_engine is not engine:
+        metrics.register_gauge(f"db_read_pool_{_stat}", lambda stat=_stat: pool_stats(read_engine.pool)[stat])
+
+_sync_engine: Optional[Engine] = None
+_sync_session_maker: Optional[sessionmaker] = None
+
+
+def get_sync_engine() -> Engine:
+    global _sync_engine
+    if _sync_engine is None:
+        sync_database_url = settings.DATABASE_URL.replace('+asyncpg', '+psycopg2')
+        _sync_engine = create_engine(
+            sync_database_url,
+            echo=False,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    return _sync_engine
+
+
+def sync_session_maker() -> Session:
+    global _sync_session_maker
+    if _sync_session_maker is None:
+        _sync_session_maker = sessionmaker(bind=get_sync_engine(), expire_on_commit=False)
+    return _sync_session_maker()
 
 
 class Base(DeclarativeBase):
@@ -25,6 +147,22 @@ async def get_db():
             await session.close()
 
 
+async def get_read_db(request: Request):
+    """Session on the read replica, or on the primary when the caller needs its own writes."""
+    session_maker = read_session_maker
+    if read_session_maker is not async_session_maker:
+        if wants_primary(request):
+            session_maker = async_session_maker
+            metrics.inc("db_read_primary_sessions")
+        else:
+            metrics.inc("db_read_replica_sessions")
+    async with session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 @contextmanager
 def get_sync_db():
     session = sync_session_maker()
@@ -0,0 +1,170 @@
+"""Cache invalidations shared between API workers.
+
+Per-worker caches register a handler under a name and invalidate through
+invalidation_bus instead of calling their TTLCache directly. The handler runs
+in the calling worker at once. With BROADCAST_BACKEND=redis the invalidation
+is also published on one Redis channel that every worker listens to, so the
+other workers forget the entry as soon as the message arrives. If Redis is
+unreachable they fall back on their cache's TTL.
+
+Keys travel as JSON, so handlers receive strings and lists rather than UUIDs
+and tuples. Processes without an event loop, such as the CLI, reach the
+workers with publish_invalidation.
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], None]
+
+CHANNEL = "kanbot:invalidate"
+
+
+def encode_invalidation(name: str, key: Any) -> str:
+    return json.dumps({"cache": name, "key": key})
+
+
+class InvalidationBus:
+    """Single-process bus: invalidations only reach this worker's caches."""
+
+    def __init__(self):
+        self._handlers: Dict[str, Handler] = {}
+
+    def register(self, name: str, handler: Handler):
+        self._handlers[name] = handler
+
+    def invalidate(self, name: str, key: Any):
+        """Run the handler for name here and in every other worker. key must be JSON serializable."""
+        self._apply(name, key)
+
+    def _apply(self, name: str, key: Any):
+        handler = self._handlers.get(name)
+        if handler is None:
+            logger.warning(f"No cache registered for invalidation {name!r}")
+            return
+        handler(key)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Redis pub/sub bus: every worker subscribes to one channel.
+
+    invalidate() is synchronous so callers need not await it; the publish
+    runs as a task. The publishing worker also receives its own message and
+    applies it a second time, which is harmless.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, client=None, channel: str = CHANNEL):
+        super().__init__()
+        if client is None:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(redis_url)
+        self.client = client
+        self.channel = channel
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._publishing: Set[asyncio.Task] = set()
+
+    def invalidate(self, name: str, key: Any):
+        super().invalidate(name, key)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(f"No event loop, invalidation {name!r} not published to other workers")
+            return
+        task = loop.create_task(self._publish(encode_invalidation(name, key)))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish(self, payload: str) -> None:
+        try:
+            await self.client.publish(self.channel, payload)
+            metrics.inc("cache_invalidations_published")
+        except Exception as e:
+            logger.error(f"Redis publish of cache invalidation failed: {e}")
+            metrics.inc("cache_invalidation_publish_errors")
+
+    async def start(self) -> None:
+        self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._publishing:
+            await asyncio.gather(*self._publishing, return_exceptions=True)
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.client.aclose()
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                raw = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis invalidation receive failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if not raw or raw.get("type") != "message":
+                continue
+
+            try:
+                message = json.loads(raw["data"])
+                self._apply(message["cache"], message["key"])
+            except Exception as e:
+                logger.error(f"Error applying cache invalidation: {e}")
+
+
+def create_invalidation_bus(name: str, redis_url: Optional[str] = None) -> InvalidationBus:
+    """Build the bus matching the BROADCAST_BACKEND setting."""
+    if name == "redis":
+        return RedisInvalidationBus(redis_url)
+    if name == "memory":
+        return InvalidationBus()
+    raise ValueError(f"Unknown broadcast backend: {name}")
+
+
+def publish_invalidation(name: str, key: Any, config=settings) -> bool:
+    """
+    Tell running API workers to invalidate, from a process without a bus.
+
+    Returns False if nothing was published, because BROADCAST_BACKEND is
+    memory or Redis is unreachable; workers then keep the entry until its TTL.
+    """
+    if config.BROADCAST_BACKEND != "redis":
+        return False
+    import redis
+    try:
+        client = redis.from_url(config.REDIS_URL)
+        try:
+            client.publish(CHANNEL, encode_invalidation(name, key))
+        finally:
+            client.close()
+    except Exception as e:
+        logger.warning(f"Could not publish invalidation {name!r}: {e}")
+        return False
+    return True
+
+
+invalidation_bus = create_invalidation_bus(settings.BROADCAST_BACKEND, settings.REDIS_URL)
@@ -0,0 +1,47 @@
+"""In-process metrics registry.
+
+Counters and gauges live in this worker's memory and are exposed through
+GET /api/v1/admin/metrics. Gauges can be registered as callables so they are
+computed when read instead of being updated on every change.
+"""
+from typing import Callable, Dict, Union
+
+Number = Union[int, float]
+
+_counters: Dict[str, Number] = {}
+_gauges: Dict[str, Number] = {}
+_gauge_callbacks: Dict[str, Callable[[], Number]] = {}
+
+
+def inc(name: str, value: Number = 1) -> None:
+    """Add value to a counter, creating it at zero."""
+    _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: Number) -> None:
+    _gauges[name] = value
+
+
+def max_gauge(name: str, value: Number) -> None:
+    """Raise a gauge to value if it is the largest seen."""
+    if value > _gauges.get(name, 0):
+        _gauges[name] = value
+
+
+def register_gauge(name: str, callback: Callable[[], Number]) -> None:
+    """Compute a gauge from callback whenever metrics are read."""
+    _gauge_callbacks[name] = callback
+
+
+def snapshot() -> Dict[str, Dict[str, Number]]:
+    gauges = dict(_gauges)
+    for name, callback in _gauge_callbacks.items():
+        gauges[name] = callback()
+    return {"counters": dict(_counters), "gauges": gauges}
+
+
+def reset() -> None:
+    """Clear every metric. Intended for tests."""
+    _counters.clear()
+    _gauges.clear()
+    _gauge_callbacks.clear()
@@ -0,0 +1,32 @@
+"""Opaque keyset cursors for paginated list endpoints"""
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises a 400 error for anything that was not issued by this API.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return values
@@ -0,0 +1,47 @@
+"""Read-your-writes routing for read-only endpoints.
+
+Endpoints that depend on get_read_db are served from DATABASE_READ_URL,
+which may lag behind the primary. A caller is sent to the primary instead
+when it asks for it with the X-Read-Primary header, or when it made a
+successful write through this worker within READ_YOUR_WRITES_SECONDS.
+Callers are told apart by a hash of their Authorization or X-API-Key header.
+"""
+import hashlib
+from typing import Optional
+
+from starlette.requests import Request
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+READ_PRIMARY_HEADER = "X-Read-Primary"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+recent_writes = TTLCache(
+    "recent_write",
+    max_entries=100000,
+    ttl_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def caller_key(request: Request) -> Optional[str]:
+    credential = request.headers.get("authorization") or request.headers.get("x-api-key")
+    if not credential:
+        return None
+    return hashlib.sha256(credential.encode()).hexdigest()
+
+
+def mark_write(request: Request, status_code: int):
+    """Remember that the caller just changed data, so its next reads see it."""
+    if request.method in SAFE_METHODS or status_code >= 400:
+        return
+    key = caller_key(request)
+    if key is not None:
+        recent_writes.set(key, True)
+
+
+def wants_primary(request: Request) -> bool:
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return True
+    key = caller_key(request)
+    return key is not None and recent_writes.get(key, False)
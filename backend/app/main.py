@@ -2,8 +2,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, text
 from uuid import UUID
 import logging
 import asyncio
@@ -14,11 +13,17 @@ from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
 from app.core.database import engine, Base, async_session_maker
+from app.core.invalidation import invalidation_bus
+from app.core.read_routing import READ_PRIMARY_HEADER, mark_write
 from app.core.security import get_password_hash, verify_token
 from app.api.v1 import api_router
 from app.websocket import manager
+from app.services.analytics_cache import analytics_cache
+from app.services.auth_cache import api_key_usage
+from app.services.authorization import get_membership
+from app.services.webhooks import delivery_worker
+from app.services.webhook_logs import webhook_log_buffer, compaction_loop
 from app.models.user import User
-from app.models.space import Space
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -83,23 +88,8 @@ async def check_space_access(user_id: UUID, space_id: str) -> bool:
     try:
         space_uuid = UUID(space_id)
         async with async_session_maker() as db:
-            result = await db.execute(
-                select(Space)
-                .options(selectinload(Space.members))
-                .where(Space.id == space_uuid)
-            )
-            space = result.scalar_one_or_none()
-            if not space:
-                return False
-            
-            if space.owner_id == user_id:
-                return True
-            
-            for member in space.members:
-                if member.user_id == user_id:
-                    return True
-            
-            return False
+            membership = await get_membership(db, space_uuid, user_id)
+            return membership.is_member
     except Exception as e:
         logger.warning(f"Space access check failed: {e}")
         return False
@@ -109,12 +99,31 @@ async def check_space_access(user_id: UUID, space_id: str) -> bool:
 async def lifespan(app: FastAPI):
     logger.info("Starting Kanbot API...")
     async with engine.begin() as conn:
+        # ix_cards_name_trgm needs the trigram operator classes
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
     
     await seed_admin()
+    manager.add_listener(analytics_cache.on_event)
+    await manager.start()
+    await invalidation_bus.start()
+    webhook_log_buffer.start()
+    api_key_usage.start()
+    compaction_task = asyncio.create_task(compaction_loop())
+    if settings.WEBHOOK_WORKER_ENABLED:
+        delivery_worker.start()
     
     yield
     logger.info("Shutting down Kanbot API...")
+    if settings.WEBHOOK_WORKER_ENABLED:
+        await delivery_worker.stop()
+    compaction_task.cancel()
+    await api_key_usage.stop()
+    await webhook_log_buffer.stop()
+    await invalidation_bus.stop()
+    await manager.stop()
+    manager.remove_listener(analytics_cache.on_event)
+    await analytics_cache.close()
 
 
 app = FastAPI(
@@ -148,13 +157,20 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 
+@app.middleware("http")
+async def mark_recent_writes(request: Request, call_next):
+    response = await call_next(request)
+    mark_write(request, response.status_code)
+    return response
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "X-API-Key", "Accept"],
-    expose_headers=["X-Total-Count"],
+    allow_headers=["Authorization", "Content-Type", "X-API-Key", "Accept", READ_PRIMARY_HEADER],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
     max_age=600,
 )
 
@@ -189,24 +205,26 @@ async def websocket_endpoint(
         await websocket.close(code=4003, reason="Forbidden")
         return
     
-    await manager.connect(websocket, space_id)
+    client = await manager.connect(websocket, space_id)
     
     try:
-        while True:
+        # The writer closes the client when a send fails; stop reading then too
+        while not client.closed:
             try:
                 data = await asyncio.wait_for(
                     websocket.receive_text(),
                     timeout=90
                 )
                 if data == "ping":
-                    await websocket.send_text("pong")
+                    client.enqueue("pong")
             except asyncio.TimeoutError:
-                await websocket.send_text("pong")
+                client.enqueue("pong")
+        await manager.disconnect(websocket, space_id)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, space_id)
+        await manager.disconnect(websocket, space_id)
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
-        manager.disconnect(websocket, space_id)
+        await manager.disconnect(websocket, space_id)
 
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
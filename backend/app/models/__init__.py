@@ -2,13 +2,14 @@ from app.core.database import Base
 from app.models.user import User, APIKey
 from app.models.space import Space, SpaceMember
 from app.models.column import Column
-from app.models.card import Card, Task, CardTag, CardDependency, CardHistory, Comment
+from app.models.card import Card, Task, CardTag, CardDependency, CardHistory, CardTransition, Comment
 from app.models.tag import Tag
 from app.models.calendar import Calendar, CalendarEvent
-from app.models.webhook import Webhook, WebhookLog
+from app.models.webhook import Webhook, WebhookLog, WebhookDelivery, WebhookPayload
 from app.models.notification import Notification
 from app.models.filter_template import FilterTemplate
 from app.models.agent import Agent, AgentRun
+from app.models.analytics import DailyFlowRollup
 
 __all__ = [
     "Base",
@@ -22,14 +23,18 @@ __all__ = [
     "CardTag",
     "CardDependency",
     "CardHistory",
+    "CardTransition",
     "Comment",
     "Tag",
     "Calendar",
     "CalendarEvent",
     "Webhook",
     "WebhookLog",
+    "WebhookDelivery",
+    "WebhookPayload",
     "Notification",
     "FilterTemplate",
     "Agent",
     "AgentRun",
+    "DailyFlowRollup",
 ]
@@ -0,0 +1,32 @@
+import uuid
+from datetime import date
+from sqlalchemy import Date, Float, ForeignKey, Integer, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class DailyFlowRollup(Base):
+    """Card arrivals and completions per space, column and UTC day.
+
+    Upserted in the same transaction as each card move. A completion is a
+    move from a non-done column into a done column; its cycle time runs from
+    card creation to that move. column_id has no foreign key: deleting a
+    column keeps its history in the space's throughput and cycle time.
+    """
+    __tablename__ = "daily_flow_rollups"
+    __table_args__ = (
+        Index("ix_daily_flow_rollups_space_id_day", "space_id", "day"),
+    )
+
+    space_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("spaces.id", ondelete="CASCADE"), primary_key=True)
+    column_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    arrivals: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Completions with a cycle time; cards without created_at count only in completions
+    timed_completions: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cycle_time_seconds_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    cycle_time_seconds_min: Mapped[float] = mapped_column(Float, nullable=True)
+    cycle_time_seconds_max: Mapped[float] = mapped_column(Float, nullable=True)
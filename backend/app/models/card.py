@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime, date, timezone
-from sqlalchemy import String, DateTime, Date, Integer, ForeignKey, JSON, Boolean, Text, Enum, Table, Column
+from sqlalchemy import String, DateTime, Date, Integer, ForeignKey, JSON, Boolean, Text, Enum, Table, Column, Index, Computed
+from sqlalchemy import text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import enum
 
 from app.core.database import Base
@@ -13,11 +14,24 @@ card_assignees = Table(
     Base.metadata,
     Column("card_id", UUID(as_uuid=True), ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_card_assignees_user_id", "user_id"),
 )
 
 
 class Card(Base):
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_column_id_position", "column_id", "position"),
+        Index("ix_cards_column_id_column_entered_at", "column_id", "column_entered_at"),
+        Index("ix_cards_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_cards_name_trgm", text("lower(name) gist_trgm_ops"), postgresql_using="gist"),
+        Index(
+            "ix_cards_column_id_end_date",
+            "column_id",
+            "end_date",
+            postgresql_where=text("end_date IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     column_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("columns.id", ondelete="CASCADE"), nullable=False)
@@ -37,6 +51,15 @@ class Card(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     column_entered_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     
     column: Mapped["Column"] = relationship("Column", back_populates="cards", foreign_keys=[column_id])
     tasks: Mapped[list["Task"]] = relationship("Task", back_populates="card", cascade="all, delete-orphan", order_by="Task.position")
@@ -76,6 +99,11 @@ class Task(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_card_id_created_at", "card_id", "created_at"),
+        Index("ix_comments_created_at_id", "created_at", "id"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     card_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
@@ -87,6 +115,11 @@ class Comment(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     is_edited: Mapped[bool] = mapped_column(Boolean, default=False)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', content)", persisted=True),
+        deferred=True,
+    )
     
     card: Mapped["Card"] = relationship("Card", back_populates="comments")
     user: Mapped["User"] = relationship("User")
@@ -94,6 +127,9 @@ class Comment(Base):
 
 class CardTag(Base):
     __tablename__ = "card_tags"
+    __table_args__ = (
+        Index("ix_card_tags_tag_id", "tag_id"),
+    )
 
     card_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("cards.id", ondelete="CASCADE"), primary_key=True)
     tag_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
@@ -120,6 +156,12 @@ class ActorType(str, enum.Enum):
 
 class CardHistory(Base):
     __tablename__ = "card_history"
+    __table_args__ = (
+        Index("ix_card_history_card_id_created_at", "card_id", "created_at"),
+        Index("ix_card_history_actor_id_created_at", "actor_id", "created_at"),
+        Index("ix_card_history_actor_type_created_at", "actor_type", "created_at"),
+        Index("ix_card_history_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     card_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
@@ -133,6 +175,28 @@ class CardHistory(Base):
     card: Mapped["Card"] = relationship("Card", back_populates="history")
 
 
+class CardTransition(Base):
+    """A card entering a column, written next to the "created"/"moved" history.
+
+    from_column_id is NULL when the card was created in to_column_id. Column
+    ids are not foreign keys so transitions outlive deleted columns.
+    """
+    __tablename__ = "card_transitions"
+    __table_args__ = (
+        Index("ix_card_transitions_card_id_at", "card_id", "at"),
+        Index("ix_card_transitions_to_column_id_at", "to_column_id", "at"),
+        Index("ix_card_transitions_from_column_id_at", "from_column_id", "at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    card_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
+    from_column_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    to_column_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    actor_type: Mapped[ActorType] = mapped_column(Enum(ActorType), nullable=False, default=ActorType.USER)
+    actor_id: Mapped[str] = mapped_column(String(200), nullable=False)
+
+
 from app.models.column import Column
 from app.models.user import User
 from app.models.tag import Tag
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, DateTime, Integer, ForeignKey, JSON, Enum
+from sqlalchemy import String, DateTime, Integer, ForeignKey, JSON, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import enum
@@ -19,6 +19,9 @@ class ColumnCategory(str, enum.Enum):
 
 class Column(Base):
     __tablename__ = "columns"
+    __table_args__ = (
+        Index("ix_columns_space_id_position", "space_id", "position"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     space_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("spaces.id", ondelete="CASCADE"), nullable=False)
@@ -1,9 +1,9 @@
 import uuid
 from datetime import datetime, timezone
 from typing import Optional
-from sqlalchemy import String, DateTime, JSON, Boolean, ForeignKey, Enum
+from sqlalchemy import String, DateTime, JSON, Boolean, ForeignKey, Enum, Index, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 import enum
 
 from app.core.database import Base
@@ -30,6 +30,9 @@ class MemberRole(str, enum.Enum):
 
 class Space(Base):
     __tablename__ = "spaces"
+    __table_args__ = (
+        Index("ix_spaces_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -39,6 +42,11 @@ class Space(Base):
     settings: Mapped[dict] = mapped_column(JSON, default=dict)
     calendar_public: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', name)", persisted=True),
+        deferred=True,
+    )
     
     owner: Mapped["User"] = relationship("User", back_populates="owned_spaces", foreign_keys=[owner_id])
     members: Mapped[list["SpaceMember"]] = relationship("SpaceMember", back_populates="space", cascade="all, delete-orphan")
@@ -57,6 +65,9 @@ class Space(Base):
 
 class SpaceMember(Base):
     __tablename__ = "space_members"
+    __table_args__ = (
+        Index("ix_space_members_user_id", "user_id"),
+    )
 
     space_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("spaces.id", ondelete="CASCADE"), primary_key=True)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
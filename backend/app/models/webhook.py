@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, DateTime, Boolean, ForeignKey, JSON, Text, Integer
+from sqlalchemy import String, DateTime, Boolean, ForeignKey, JSON, Text, Integer, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -9,6 +9,9 @@ from app.core.database import Base
 
 class Webhook(Base):
     __tablename__ = "webhooks"
+    __table_args__ = (
+        Index("ix_webhooks_space_id_active", "space_id", postgresql_where=text("active = true")),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     space_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("spaces.id", ondelete="CASCADE"), nullable=False)
@@ -20,15 +23,22 @@ class Webhook(Base):
     
     space: Mapped["Space"] = relationship("Space", back_populates="webhooks")
     logs: Mapped[list["WebhookLog"]] = relationship("WebhookLog", back_populates="webhook", cascade="all, delete-orphan")
+    deliveries: Mapped[list["WebhookDelivery"]] = relationship("WebhookDelivery", back_populates="webhook", cascade="all, delete-orphan")
 
 
 class WebhookLog(Base):
     __tablename__ = "webhook_logs"
+    __table_args__ = (
+        Index("ix_webhook_logs_webhook_id_created_at", "webhook_id", "created_at"),
+        Index("ix_webhook_logs_payload_hash", "payload_hash"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     webhook_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("webhooks.id", ondelete="CASCADE"), nullable=False)
     event: Mapped[str] = mapped_column(String(100), nullable=False)
     payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Set instead of payload when WEBHOOK_LOG_DEDUPE_PAYLOADS stores payloads in webhook_payloads
+    payload_hash: Mapped[str] = mapped_column(String(64), nullable=True)
     response_status: Mapped[int] = mapped_column(Integer, nullable=True)
     response_body: Mapped[str] = mapped_column(Text, nullable=True)
     success: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -37,4 +47,52 @@ class WebhookLog(Base):
     webhook: Mapped["Webhook"] = relationship("Webhook", back_populates="logs")
 
 
+class WebhookPayload(Base):
+    """A webhook payload stored once per distinct content, keyed by SHA-256."""
+    __tablename__ = "webhook_payloads"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+
+class DeliveryStatus:
+    PENDING = "pending"
+    DELIVERING = "delivering"
+    DELIVERED = "delivered"
+    DEAD = "dead"
+
+
+class WebhookDelivery(Base):
+    """A queued webhook call, drained by the background delivery worker.
+
+    Due work is status pending/delivering with next_attempt_at in the past;
+    a claimed delivery's next_attempt_at is pushed out by a lease so it is
+    picked up again if the worker that claimed it dies.
+    """
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index(
+            "ix_webhook_deliveries_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('pending', 'delivering')"),
+        ),
+        Index("ix_webhook_deliveries_webhook_id_status", "webhook_id", "status"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    webhook_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("webhooks.id", ondelete="CASCADE"), nullable=False)
+    event: Mapped[str] = mapped_column(String(100), nullable=False)
+    body: Mapped[dict] = mapped_column(JSON, default=dict)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=DeliveryStatus.PENDING)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    last_status: Mapped[int] = mapped_column(Integer, nullable=True)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    completed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    
+    webhook: Mapped["Webhook"] = relationship("Webhook", back_populates="deliveries")
+
+
 from app.models.space import Space
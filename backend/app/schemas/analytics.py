@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from uuid import UUID
+
+
+class TimeInColumnsBatch(BaseModel):
+    """Cards to report on: an explicit list or every card in one column."""
+    card_ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=500)
+    column_id: Optional[UUID] = None
+
+    @model_validator(mode='after')
+    def check_one_selector(self) -> 'TimeInColumnsBatch':
+        if (self.card_ids is None) == (self.column_id is None):
+            raise ValueError("Provide either card_ids or column_id")
+        return self
@@ -41,3 +41,19 @@ class WebhookLogResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class WebhookDeliveryResponse(BaseModel):
+    id: UUID
+    webhook_id: UUID
+    event: str
+    status: str
+    attempts: int
+    next_attempt_at: datetime
+    last_status: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
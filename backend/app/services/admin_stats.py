@@ -0,0 +1,80 @@
+"""System-wide counts for the admin dashboard"""
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.card import ActorType, Card, CardHistory, Comment, Task
+from app.models.space import Space, SpaceType
+from app.models.user import User
+
+ACTIVE_USER_DAYS = 7
+
+_cached: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def system_stats_query(now: datetime):
+    """
+    Every admin dashboard count in one statement: one aggregate per table,
+    using FILTER for the subsets, cross-joined into a single row.
+
+    Active users are the distinct user actors (not agents) in card history
+    over the last ACTIVE_USER_DAYS days, read through
+    ix_card_history_created_at_id.
+    """
+    week_ago = now - timedelta(days=ACTIVE_USER_DAYS)
+    month_ago = now - timedelta(days=30)
+
+    users = select(
+        func.count().label("total_users"),
+        func.count().filter(User.created_at >= week_ago).label("new_users_this_week"),
+        func.count().filter(User.created_at >= month_ago).label("new_users_this_month"),
+    ).select_from(User).subquery("user_counts")
+    active = select(
+        func.count(CardHistory.actor_id.distinct()).label("active_users_7_days"),
+    ).where(
+        CardHistory.created_at >= week_ago,
+        CardHistory.actor_type == ActorType.USER,
+    ).subquery("active_counts")
+    spaces = select(
+        func.count().label("total_spaces"),
+        func.count().filter(Space.type == SpaceType.PERSONAL).label("personal_spaces"),
+        func.count().filter(Space.type == SpaceType.COMPANY).label("team_spaces"),
+        func.count().filter(Space.type == SpaceType.AGENT).label("agent_spaces"),
+    ).select_from(Space).subquery("space_counts")
+    cards = select(func.count().label("total_cards")).select_from(Card).subquery("card_counts")
+    tasks = select(
+        func.count().filter(Task.completed.is_(True)).label("completed_cards"),
+    ).select_from(Task).subquery("task_counts")
+    comments = select(func.count().label("total_comments")).select_from(Comment).subquery("comment_counts")
+
+    parts = [users, active, spaces, cards, tasks, comments]
+    joined = parts[0]
+    for part in parts[1:]:
+        joined = joined.join(part, true())
+    return select(*[column for part in parts for column in part.c]).select_from(joined)
+
+
+async def get_system_stats(db: AsyncSession, now: datetime, refresh: bool = False) -> Dict[str, Any]:
+    """Run system_stats_query, reusing the last result for ADMIN_STATS_CACHE_SECONDS."""
+    global _cached
+    ttl = settings.ADMIN_STATS_CACHE_SECONDS
+    if not refresh and ttl > 0 and _cached is not None and _cached[0] > time.monotonic():
+        metrics.inc("admin_stats_cache_hits")
+        return _cached[1]
+
+    metrics.inc("admin_stats_cache_misses")
+    row = (await db.execute(system_stats_query(now))).one()
+    stats = dict(row._mapping)
+    if ttl > 0:
+        _cached = (time.monotonic() + ttl, stats)
+    return stats
+
+
+def clear_cache():
+    global _cached
+    _cached = None
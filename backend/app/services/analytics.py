@@ -0,0 +1,618 @@
+"""Aggregate queries behind the analytics endpoints"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import JSON, DateTime, Float, Integer, Interval, String, Text, and_, cast, extract, func, literal, literal_column, null, select, true, tuple_, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, array, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import DailyFlowRollup
+from app.models.card import Card, CardHistory, CardTransition, Comment, card_assignees
+from app.models.column import Column, ColumnCategory
+from app.models.space import Space, SpaceMember
+from app.services.card_age import compute_card_age_days
+
+SECONDS_PER_DAY = 86400
+
+# Bucket sizes accepted by the flow charts
+BUCKET_SECONDS = {"day": SECONDS_PER_DAY, "hour": 3600}
+
+# Column names that mark a column as done, in addition to the last two columns
+DONE_KEYWORDS = ("done", "archive", "hotovo", "dokončen")
+
+# Kinds of entry in the activity feed
+ACTIVITY_TYPES = ("card_change", "comment")
+
+# Characters of a comment shown in the activity feed
+COMMENT_PREVIEW_LENGTH = 100
+
+# Age percentiles reported per column, computed from one sort per group
+AGE_PERCENTILES = (0.5, 0.85, 0.95)
+
+
+def time_in_columns(
+    transitions: Iterable,
+    created_at: datetime,
+    current_column_id: UUID,
+    now: datetime,
+) -> Dict[UUID, timedelta]:
+    """
+    Time a card spent in each column, from its CardTransition rows in order.
+
+    Cards created before transitions were recorded, or by paths that do not
+    write one, start in the source column of their first move (or their
+    current column) at created_at.
+    """
+    transitions = list(transitions)
+    if transitions and transitions[0].from_column_id is None:
+        column_id, since = transitions[0].to_column_id, transitions[0].at
+        transitions = transitions[1:]
+    else:
+        column_id = transitions[0].from_column_id if transitions else current_column_id
+        since = created_at
+
+    times: Dict[UUID, timedelta] = {}
+    for transition in transitions:
+        times[column_id] = times.get(column_id, timedelta()) + (transition.at - since)
+        column_id, since = transition.to_column_id, transition.at
+    times[column_id] = times.get(column_id, timedelta()) + (now - since)
+    return times
+
+
+async def batch_time_in_columns(
+    db: AsyncSession,
+    now: datetime,
+    card_ids: Optional[List[UUID]] = None,
+    column_id: Optional[UUID] = None,
+) -> Tuple[List[Tuple[Any, Dict[UUID, timedelta]]], Dict[UUID, str]]:
+    """
+    time_in_columns for a list of cards or every card in a column.
+
+    Three queries however many cards: the cards, all their transitions in
+    one ordered scan, and the names of every column in the spaces involved.
+    Returns ([(card row, durations)], {column id: name}).
+    """
+    if column_id is not None:
+        selected = select(Card.id).where(Card.column_id == column_id)
+    else:
+        selected = select(Card.id).where(Card.id.in_(card_ids))
+
+    cards_result = await db.execute(
+        select(Card.id, Card.name, Card.created_at, Card.column_id, Column.space_id)
+        .join(Column, Card.column_id == Column.id)
+        .where(Card.id.in_(selected))
+        .order_by(Card.position, Card.id)
+    )
+    cards = cards_result.all()
+    if not cards:
+        return [], {}
+
+    transitions_result = await db.execute(
+        select(CardTransition.card_id, CardTransition.from_column_id, CardTransition.to_column_id, CardTransition.at)
+        .where(CardTransition.card_id.in_(selected))
+        .order_by(CardTransition.card_id, CardTransition.at)
+    )
+    by_card: Dict[UUID, List[Any]] = {}
+    for transition in transitions_result.all():
+        by_card.setdefault(transition.card_id, []).append(transition)
+
+    columns_result = await db.execute(
+        select(Column.id, Column.name).where(Column.space_id.in_({card.space_id for card in cards}))
+    )
+    column_names = {c.id: c.name for c in columns_result.all()}
+
+    return [
+        (card, time_in_columns(by_card.get(card.id, []), card.created_at, card.column_id, now))
+        for card in cards
+    ], column_names
+
+
+def board_summary_query(space_id: UUID, now: datetime):
+    """
+    One row per column of the space, in board order, with its card count,
+    oldest column_entered_at and age percentiles in days.
+
+    Columns without cards still get a row (count 0, NULL ages).
+    """
+    age_days = (extract("epoch", now - Card.column_entered_at) / SECONDS_PER_DAY).cast(Float)
+    return (
+        select(
+            Column.id,
+            Column.name,
+            Column.settings,
+            func.count(Card.id).label("card_count"),
+            func.min(Card.column_entered_at).label("oldest_entered_at"),
+            func.percentile_cont(array(AGE_PERCENTILES))
+            .within_group(age_days)
+            .cast(ARRAY(Float))
+            .label("age_percentiles"),
+        )
+        .outerjoin(Card, Card.column_id == Column.id)
+        .where(Column.space_id == space_id)
+        # settings is grouped through the primary key, json has no equality operator
+        .group_by(Column.id)
+        .order_by(Column.position)
+    )
+
+
+def wip_limit(settings: Optional[Dict[str, Any]]) -> Optional[int]:
+    """The column's WIP limit from its settings, if one is configured."""
+    value = (settings or {}).get("wip_limit")
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
+
+def summarize_column(row, now: datetime) -> Dict[str, Any]:
+    """Format one board_summary_query row for the API."""
+    limit = wip_limit(row.settings)
+    percentiles = row.age_percentiles or [None] * len(AGE_PERCENTILES)
+    ages = {
+        f"p{int(p * 100)}": round(max(0.0, value), 1) if value is not None else None
+        for p, value in zip(AGE_PERCENTILES, percentiles)
+    }
+    return {
+        "id": str(row.id),
+        "name": row.name,
+        "card_count": row.card_count,
+        "oldest_card_age_days": compute_card_age_days(row.oldest_entered_at, now) or 0,
+        "median_age_days": ages["p50"],
+        "age_percentiles_days": ages,
+        "wip_limit": limit,
+        "over_wip_limit": limit is not None and row.card_count > limit,
+    }
+
+
+def done_column_ids(columns: Iterable) -> Set[UUID]:
+    """Columns whose cards count as completed: the last two by position plus
+    any named like a done or archive column."""
+    ordered = sorted(columns, key=lambda c: c.position or 0, reverse=True)
+    done = {c.id for c in ordered[:2]}
+    done.update(c.id for c in ordered if any(kw in c.name.lower() for kw in DONE_KEYWORDS))
+    return done
+
+
+def utc_day(moment: datetime) -> date:
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.date()
+
+
+def flow_row(
+    space_id: UUID,
+    from_column_id: Optional[UUID],
+    to_column_id: UUID,
+    moved_at: datetime,
+    card_created_at: Optional[datetime],
+    done_ids: Set[UUID],
+) -> Dict[str, Any]:
+    """Rollup increments for one card arriving in to_column_id."""
+    completed = to_column_id in done_ids and from_column_id not in done_ids
+    cycle_time = None
+    if completed and card_created_at is not None:
+        cycle_time = max(0.0, (moved_at - card_created_at).total_seconds())
+    return {
+        "space_id": space_id,
+        "column_id": to_column_id,
+        "day": utc_day(moved_at),
+        "arrivals": 1,
+        "completions": 1 if completed else 0,
+        "timed_completions": 1 if cycle_time is not None else 0,
+        "cycle_time_seconds_sum": cycle_time or 0.0,
+        "cycle_time_seconds_min": cycle_time,
+        "cycle_time_seconds_max": cycle_time,
+    }
+
+
+def merge_flow_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combine increments that share a (space, column, day) key."""
+    merged: Dict[Tuple[UUID, UUID, date], Dict[str, Any]] = {}
+    for row in rows:
+        key = (row["space_id"], row["column_id"], row["day"])
+        total = merged.get(key)
+        if total is None:
+            merged[key] = dict(row)
+            continue
+        total["arrivals"] += row["arrivals"]
+        total["completions"] += row["completions"]
+        total["timed_completions"] += row["timed_completions"]
+        total["cycle_time_seconds_sum"] += row["cycle_time_seconds_sum"]
+        for field, pick in (("cycle_time_seconds_min", min), ("cycle_time_seconds_max", max)):
+            values = [v for v in (total[field], row[field]) if v is not None]
+            total[field] = pick(values) if values else None
+    return list(merged.values())
+
+
+def rollup_upsert(rows: List[Dict[str, Any]]):
+    """INSERT ... ON CONFLICT that adds rows onto the existing daily totals."""
+    stmt = pg_insert(DailyFlowRollup).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=["space_id", "column_id", "day"],
+        set_={
+            "arrivals": DailyFlowRollup.arrivals + excluded.arrivals,
+            "completions": DailyFlowRollup.completions + excluded.completions,
+            "timed_completions": DailyFlowRollup.timed_completions + excluded.timed_completions,
+            "cycle_time_seconds_sum": DailyFlowRollup.cycle_time_seconds_sum + excluded.cycle_time_seconds_sum,
+            # LEAST/GREATEST skip NULLs, so days without completions keep NULL
+            "cycle_time_seconds_min": func.least(DailyFlowRollup.cycle_time_seconds_min, excluded.cycle_time_seconds_min),
+            "cycle_time_seconds_max": func.greatest(DailyFlowRollup.cycle_time_seconds_max, excluded.cycle_time_seconds_max),
+        },
+    )
+
+
+async def record_card_move(
+    db: AsyncSession,
+    card: Card,
+    from_column_id: UUID,
+    to_column: Column,
+    moved_at: datetime,
+):
+    """Add a move to the daily rollup. Runs in the caller's transaction."""
+    if from_column_id == to_column.id:
+        return
+    result = await db.execute(
+        select(Column.id, Column.name, Column.position).where(Column.space_id == to_column.space_id)
+    )
+    done_ids = done_column_ids(result.all())
+    await db.execute(rollup_upsert([
+        flow_row(to_column.space_id, from_column_id, to_column.id, moved_at, card.created_at, done_ids)
+    ]))
+
+
+def completion_totals_query(space_id: UUID, since: date):
+    """Completion counts and cycle-time aggregates over a window of days."""
+    return select(
+        func.coalesce(func.sum(DailyFlowRollup.completions), 0).label("completions"),
+        func.coalesce(func.sum(DailyFlowRollup.timed_completions), 0).label("timed_completions"),
+        func.sum(DailyFlowRollup.cycle_time_seconds_sum).label("cycle_time_sum"),
+        func.min(DailyFlowRollup.cycle_time_seconds_min).label("cycle_time_min"),
+        func.max(DailyFlowRollup.cycle_time_seconds_max).label("cycle_time_max"),
+    ).where(DailyFlowRollup.space_id == space_id, DailyFlowRollup.day >= since)
+
+
+def daily_completions_query(space_id: UUID, since: date):
+    """Completions per day with at least one, oldest first."""
+    completions = func.sum(DailyFlowRollup.completions)
+    return (
+        select(DailyFlowRollup.day, completions.label("completions"))
+        .where(DailyFlowRollup.space_id == space_id, DailyFlowRollup.day >= since)
+        .group_by(DailyFlowRollup.day)
+        .having(completions > 0)
+        .order_by(DailyFlowRollup.day)
+    )
+
+
+def bucket_range(now: datetime, unit: str, count: int) -> Tuple[datetime, datetime]:
+    """First and last bucket start (naive UTC) of the count buckets ending at now."""
+    now = now.astimezone(timezone.utc).replace(tzinfo=None)
+    if unit == "day":
+        last = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        last = now.replace(minute=0, second=0, microsecond=0)
+    return last - timedelta(seconds=BUCKET_SECONDS[unit] * (count - 1)), last
+
+
+def cfd_query(space_id: UUID, unit: str, first: datetime, last: datetime):
+    """
+    Cards per column at the end of each bucket from first to last, in one pass.
+
+    Every transition is +1 for the column it enters and -1 for the one it
+    leaves. Deltas are summed per (column, bucket), with everything before the
+    window folded into the first bucket, then a running SUM() OVER each column
+    turns them into counts. generate_series supplies buckets without moves.
+    """
+    space_columns = select(Column.id).where(Column.space_id == space_id)
+    # Typed so generate_series and greatest resolve to the timestamp overloads
+    first, last = cast(first, DateTime()), cast(last, DateTime())
+    bucket = func.date_trunc(unit, func.timezone("UTC", CardTransition.at))
+    step = literal(timedelta(seconds=BUCKET_SECONDS[unit]), Interval)
+    before_end = func.timezone("UTC", CardTransition.at) < last + step
+
+    events = union_all(
+        select(CardTransition.to_column_id.label("column_id"), bucket.label("bucket"), literal(1).label("delta"))
+        .where(CardTransition.to_column_id.in_(space_columns), before_end),
+        select(CardTransition.from_column_id, bucket, literal(-1))
+        .where(CardTransition.from_column_id.in_(space_columns), before_end),
+    ).subquery("events")
+
+    folded_bucket = func.greatest(events.c.bucket, first)
+    deltas = (
+        select(events.c.column_id, folded_bucket.label("bucket"), func.sum(events.c.delta).label("delta"))
+        .group_by(events.c.column_id, folded_bucket)
+        .subquery("deltas")
+    )
+
+    series = select(func.generate_series(first, last, step).label("bucket")).subquery("series")
+    grid = (
+        select(Column.id.label("column_id"), Column.name, Column.position, series.c.bucket)
+        .join(series, true())
+        .where(Column.space_id == space_id)
+        .subquery("grid")
+    )
+
+    return (
+        select(
+            grid.c.column_id,
+            grid.c.name,
+            grid.c.bucket,
+            func.sum(func.coalesce(deltas.c.delta, 0))
+            .over(partition_by=grid.c.column_id, order_by=grid.c.bucket)
+            .cast(Integer)
+            .label("cards"),
+        )
+        .select_from(grid)
+        .outerjoin(deltas, and_(deltas.c.column_id == grid.c.column_id, deltas.c.bucket == grid.c.bucket))
+        .order_by(grid.c.position, grid.c.column_id, grid.c.bucket)
+    )
+
+
+def columnar_cfd(rows: Iterable) -> Dict[str, Any]:
+    """Turn cfd_query rows into bucket and per-column count arrays."""
+    buckets: List[str] = []
+    columns: List[Dict[str, str]] = []
+    counts: List[List[int]] = []
+    for row in rows:
+        if not columns or columns[-1]["id"] != str(row.column_id):
+            columns.append({"id": str(row.column_id), "name": row.name})
+            counts.append([])
+        if len(columns) == 1:
+            buckets.append(row.bucket.replace(tzinfo=timezone.utc).isoformat())
+        # Cards created before transitions were recorded can push a column below zero
+        counts[-1].append(max(0, row.cards))
+    return {"buckets": buckets, "columns": columns, "counts": counts}
+
+
+def aging_wip_query(column_ids: List[UUID], now: datetime, unit: str):
+    """
+    Open cards with their age since work started and age in the current
+    column, both in whole units.
+
+    Work starts at the card's first move out of the column it was created in,
+    or at creation for cards that never moved.
+    """
+    started = (
+        select(CardTransition.card_id, func.min(CardTransition.at).label("started_at"))
+        .where(CardTransition.from_column_id.is_not(None))
+        .group_by(CardTransition.card_id)
+        .subquery("started")
+    )
+    seconds = BUCKET_SECONDS[unit]
+
+    def whole_units(since):
+        return func.floor(func.greatest(extract("epoch", now - since), 0) / seconds).cast(Integer)
+
+    return (
+        select(
+            Card.id,
+            Card.column_id,
+            whole_units(func.coalesce(started.c.started_at, Card.created_at)).label("age"),
+            whole_units(func.coalesce(Card.column_entered_at, Card.created_at)).label("column_age"),
+        )
+        .outerjoin(started, started.c.card_id == Card.id)
+        .where(Card.column_id.in_(column_ids))
+        .order_by(Card.column_id, Card.id)
+    )
+
+
+def workload_query(
+    user_ids: List[UUID],
+    now: datetime,
+    due_soon_days: int,
+    viewer_id: Optional[UUID] = None,
+):
+    """
+    Assigned card counts per user and column, with how many are overdue or
+    due within due_soon_days. Cards in archive columns are never overdue.
+    With viewer_id only spaces that user is a member of are counted.
+    """
+    open_card = Column.category != ColumnCategory.ARCHIVE
+    query = (
+        select(
+            card_assignees.c.user_id,
+            Space.id.label("space_id"),
+            Space.name.label("space_name"),
+            Column.name.label("column_name"),
+            Column.category,
+            func.count().label("card_count"),
+            func.count().filter(open_card, Card.end_date < now).label("overdue"),
+            func.count().filter(
+                open_card,
+                Card.end_date >= now,
+                Card.end_date < now + timedelta(days=due_soon_days),
+            ).label("due_soon"),
+        )
+        .select_from(card_assignees)
+        .join(Card, Card.id == card_assignees.c.card_id)
+        .join(Column, Column.id == Card.column_id)
+        .join(Space, Space.id == Column.space_id)
+        .where(card_assignees.c.user_id.in_(user_ids))
+        .group_by(card_assignees.c.user_id, Space.id, Space.name, Column.name, Column.category)
+        .order_by(card_assignees.c.user_id, Space.name, Column.name)
+    )
+    if viewer_id is not None:
+        query = query.join(
+            SpaceMember,
+            and_(SpaceMember.space_id == Space.id, SpaceMember.user_id == viewer_id),
+        )
+    return query
+
+
+def summarize_workload(rows: Iterable, user_ids: List[UUID]) -> Dict[UUID, Dict[str, Any]]:
+    """Fold workload_query rows into one response body per user, by space."""
+    workloads = {
+        user_id: {"user_id": str(user_id), "total_assigned": 0, "overdue": 0, "due_soon": 0, "by_space": {}}
+        for user_id in user_ids
+    }
+    for row in rows:
+        workload = workloads[row.user_id]
+        space = workload["by_space"].setdefault(row.space_id, {
+            "space_id": str(row.space_id),
+            "space_name": row.space_name,
+            "card_count": 0,
+            "overdue": 0,
+            "due_soon": 0,
+            "by_column": {},
+            "by_category": {},
+        })
+        category = ColumnCategory(row.category).value
+        for target in (workload, space):
+            target["overdue"] += row.overdue
+            target["due_soon"] += row.due_soon
+        workload["total_assigned"] += row.card_count
+        space["card_count"] += row.card_count
+        space["by_column"][row.column_name] = space["by_column"].get(row.column_name, 0) + row.card_count
+        space["by_category"][category] = space["by_category"].get(category, 0) + row.card_count
+    for workload in workloads.values():
+        workload["by_space"] = list(workload["by_space"].values())
+    return workloads
+
+
+def activity_query(
+    space_id: UUID,
+    limit: int,
+    before: Optional[Tuple[datetime, UUID]] = None,
+    since: Optional[datetime] = None,
+    actor_id: Optional[str] = None,
+    types: Iterable[str] = ACTIVITY_TYPES,
+):
+    """
+    Card history and comments of a space, newest first by (created_at, id).
+
+    before is the (created_at, id) of the last entry already returned. Each
+    branch seeks to it on its (created_at, id) index and stops after limit
+    rows before the branches are merged, so every page costs the same.
+    """
+    branches = []
+    if "card_change" in types:
+        branches.append((
+            CardHistory,
+            select(
+                literal_column("'card_change'").label("type"),
+                CardHistory.id,
+                CardHistory.card_id,
+                CardHistory.created_at,
+                CardHistory.action,
+                func.lower(cast(CardHistory.actor_type, String)).label("actor_type"),
+                CardHistory.actor_id,
+                CardHistory.actor_name,
+                CardHistory.changes,
+                cast(null(), Text).label("content_preview"),
+            ),
+            CardHistory.actor_id,
+        ))
+    if "comment" in types:
+        branches.append((
+            Comment,
+            select(
+                literal_column("'comment'").label("type"),
+                Comment.id,
+                Comment.card_id,
+                Comment.created_at,
+                literal_column("'commented'").label("action"),
+                Comment.actor_type,
+                cast(Comment.user_id, String).label("actor_id"),
+                Comment.actor_name,
+                cast(null(), JSON).label("changes"),
+                func.substr(Comment.content, 1, COMMENT_PREVIEW_LENGTH).label("content_preview"),
+            ).where(Comment.is_deleted.is_not(True)),
+            cast(Comment.user_id, String),
+        ))
+
+    pages = []
+    for model, query, actor_column in branches:
+        query = (
+            query.join(Card, Card.id == model.card_id)
+            .join(Column, Column.id == Card.column_id)
+            .where(Column.space_id == space_id)
+        )
+        if before is not None:
+            query = query.where(tuple_(model.created_at, model.id) < tuple_(*before))
+        if since is not None:
+            query = query.where(model.created_at >= since)
+        if actor_id is not None:
+            query = query.where(actor_column == actor_id)
+        page = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit).subquery()
+        pages.append(select(*page.c))
+
+    feed = union_all(*pages).subquery("activity")
+    return select(feed).order_by(feed.c.created_at.desc(), feed.c.id.desc()).limit(limit)
+
+
+def activity_entry(row) -> Dict[str, Any]:
+    entry = {
+        "id": str(row.id),
+        "type": row.type,
+        "action": row.action,
+        "timestamp": row.created_at.isoformat() if row.created_at else None,
+        "card_id": str(row.card_id),
+        "actor_type": row.actor_type,
+        "actor_id": row.actor_id,
+        "actor_name": row.actor_name,
+    }
+    if row.type == "comment":
+        entry["content_preview"] = row.content_preview
+    else:
+        entry["changes"] = row.changes
+    return entry
+
+
+def deadline_query(
+    space_id: UUID,
+    due_from: Optional[datetime] = None,
+    due_until: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, UUID]] = None,
+):
+    """
+    Cards of a space with an end date in [due_from, due_until), outside
+    archive columns, ordered by (end_date, id) and seeking past after.
+
+    Rows are (Card, column_name), read through ix_cards_column_id_end_date.
+    """
+    query = (
+        select(Card, Column.name.label("column_name"))
+        .join(Column, Column.id == Card.column_id)
+        .where(
+            Column.space_id == space_id,
+            Column.category != ColumnCategory.ARCHIVE,
+            Card.end_date.is_not(None),
+        )
+    )
+    if due_from is not None:
+        query = query.where(Card.end_date >= due_from)
+    if due_until is not None:
+        query = query.where(Card.end_date < due_until)
+    if after is not None:
+        query = query.where(tuple_(Card.end_date, Card.id) > tuple_(*after))
+    return query.order_by(Card.end_date, Card.id)
+
+
+def due_timeline_query(space_id: UUID, start: date, end: date):
+    """Open cards due on each UTC day from start to end inclusive; days without any are omitted."""
+    day = func.date(func.timezone("UTC", Card.end_date))
+    return (
+        select(day.label("day"), func.count().label("cards"))
+        .join(Column, Column.id == Card.column_id)
+        .where(
+            Column.space_id == space_id,
+            Column.category != ColumnCategory.ARCHIVE,
+            Card.end_date >= datetime.combine(start, datetime.min.time(), timezone.utc),
+            Card.end_date < datetime.combine(end + timedelta(days=1), datetime.min.time(), timezone.utc),
+        )
+        .group_by(day)
+        .order_by(day)
+    )
+
+
+def columnar_timeline(rows: Iterable, start: date, end: date) -> Dict[str, List]:
+    """Zero-filled parallel days/counts arrays from due_timeline_query rows."""
+    counts = [0] * ((end - start).days + 1)
+    for row in rows:
+        offset = (row.day - start).days
+        if 0 <= offset < len(counts):
+            counts[offset] = row.cards
+    return {
+        "days": [(start + timedelta(days=i)).isoformat() for i in range(len(counts))],
+        "counts": counts,
+    }
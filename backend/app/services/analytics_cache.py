@@ -0,0 +1,172 @@
+"""Per-space cache for analytics responses.
+
+Entries are keyed by space, endpoint and query parameters, plus the space's
+generation number. Any card, column, tag, task, comment or member event
+published through ws_manager bumps the generation before clients are told,
+so a client that refetches on the event never sees the old result. Column
+endpoints publish no events and call invalidate() themselves. Entries
+of older generations are simply never read again. A short TTL bounds results
+that age with the clock, and changes made outside the API.
+
+With ANALYTICS_CACHE_BACKEND=redis the generation and the cached responses
+also live in Redis, so an event handled by one worker invalidates every
+worker's entries. If Redis fails the request is computed without the cache.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core import metrics
+from app.core.config import settings
+from app.websocket.encoding import encode_message
+
+logger = logging.getLogger(__name__)
+
+# ws_manager event types that change what analytics report
+INVALIDATING_EVENTS = ("card_", "column_", "tag_", "task_", "comment_", "member_")
+
+
+def params_key(params: Dict[str, Any]) -> Tuple:
+    return tuple(sorted((name, str(value)) for name, value in params.items()))
+
+
+class AnalyticsCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0,
+        redis_client=None,
+        key_prefix: str = "kanbot:analytics:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation_key(self, space_id: str) -> str:
+        return f"{self.key_prefix}gen:{space_id}"
+
+    async def _generation(self, space_id: str) -> int:
+        if self.redis is None:
+            return self._generations.get(space_id, 0)
+        return int(await self.redis.get(self.generation_key(space_id)) or 0)
+
+    async def get_or_compute(
+        self,
+        space_id,
+        endpoint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached response or compute and store it."""
+        space_id = str(space_id)
+        try:
+            generation = await self._generation(space_id)
+        except Exception as e:
+            logger.warning(f"Analytics cache unavailable, computing directly: {e}")
+            metrics.inc("analytics_cache_errors")
+            return await compute()
+
+        key = (space_id, generation, endpoint, params_key(params))
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            metrics.inc("analytics_cache_hits")
+            return entry[1]
+
+        redis_key = f"{self.key_prefix}{space_id}:{generation}:{endpoint}:{json.dumps(key[3])}"
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(redis_key)
+            except Exception as e:
+                logger.warning(f"Analytics cache read failed: {e}")
+                metrics.inc("analytics_cache_errors")
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self._store(key, value, now)
+                metrics.inc("analytics_cache_hits")
+                metrics.inc("analytics_cache_redis_hits")
+                return value
+
+        metrics.inc("analytics_cache_misses")
+        value = await compute()
+        self._store(key, value, now)
+        if self.redis is not None:
+            try:
+                await self.redis.set(redis_key, encode_message(value), ex=max(1, int(self.ttl_seconds)))
+            except Exception as e:
+                logger.warning(f"Analytics cache write failed: {e}")
+                metrics.inc("analytics_cache_errors")
+        return value
+
+    def _store(self, key: Tuple, value: Any, now: float):
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            metrics.inc("analytics_cache_evictions")
+
+    async def invalidate(self, space_id):
+        """Make every cached response of the space stale."""
+        space_id = str(space_id)
+        self._generations[space_id] = self._generations.get(space_id, 0) + 1
+        for key in [key for key in self._entries if key[0] == space_id]:
+            del self._entries[key]
+        metrics.inc("analytics_cache_invalidations")
+        if self.redis is not None:
+            try:
+                await self.redis.incr(self.generation_key(space_id))
+            except Exception as e:
+                logger.error(f"Failed to invalidate analytics cache for space {space_id}: {e}")
+                metrics.inc("analytics_cache_errors")
+
+    async def on_event(self, space_id: str, message: dict):
+        """ws_manager listener: invalidate on events that change the board."""
+        if str(message.get("type", "")).startswith(INVALIDATING_EVENTS):
+            await self.invalidate(space_id)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
+
+
+class DisabledAnalyticsCache(AnalyticsCache):
+    """Used when ANALYTICS_CACHE_ENABLED is false: always computes."""
+
+    async def get_or_compute(self, space_id, endpoint, params, compute):
+        return await compute()
+
+    async def invalidate(self, space_id):
+        pass
+
+
+def create_analytics_cache() -> AnalyticsCache:
+    if not settings.ANALYTICS_CACHE_ENABLED:
+        return DisabledAnalyticsCache()
+    redis_client = None
+    if settings.ANALYTICS_CACHE_BACKEND == "redis":
+        import redis.asyncio as aioredis
+        redis_client = aioredis.from_url(settings.REDIS_URL)
+    elif settings.ANALYTICS_CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown analytics cache backend: {settings.ANALYTICS_CACHE_BACKEND}")
+    return AnalyticsCache(
+        max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+        redis_client=redis_client,
+    )
+
+
+analytics_cache = create_analytics_cache()
+metrics.register_gauge("analytics_cache_entries", lambda: len(analytics_cache))
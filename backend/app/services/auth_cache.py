@@ -0,0 +1,188 @@
+"""Caches that spare authenticated requests their lookups on users and API keys.
+
+get_current_user verifies the token on every request but reads the user
+from user_cache. Cached users are stored as column values and attached to
+the request's session with merge(load=False), which issues no SELECT; each
+request gets its own instance, so changes it makes never leak into the
+cache. Endpoints that change a user call invalidate_user, which reaches
+every worker through invalidation_bus; the user CLI commands publish the
+same invalidation with publish_invalidation. Without Redis, other workers
+keep a changed user for up to AUTH_USER_CACHE_TTL_SECONDS.
+
+API keys resolve through api_key_cache to (key id, user id), and the user
+then comes from user_cache. Their last_used time is collected in
+api_key_usage and written with one UPDATE per flush instead of a commit per
+request, so it may lag by up to API_KEY_LAST_USED_FLUSH_SECONDS. Revoked
+keys are dropped from every worker's api_key_cache via invalidation_bus.
+"""
+import asyncio
+import copy
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, func, inspect, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.invalidation import invalidation_bus
+from app.core.security import hash_api_key
+from app.models.user import APIKey, User
+
+logger = logging.getLogger(__name__)
+
+user_cache = TTLCache(
+    "auth_user",
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("auth_user_cache_entries", lambda: len(user_cache))
+
+
+def snapshot_user(user: User) -> Dict[str, Any]:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """The user with user_id attached to db, from the cache when possible."""
+    values = user_cache.get(user_id)
+    if values is not None:
+        user = User(**copy.deepcopy(values))
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    metrics.inc("auth_user_queries")
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        user_cache.set(user_id, copy.deepcopy(snapshot_user(user)))
+    return user
+
+
+invalidation_bus.register("auth_user", lambda key: user_cache.invalidate(UUID(key)))
+
+
+def invalidate_user(user_id: UUID):
+    """Forget a changed user in this worker and, through invalidation_bus, in the others."""
+    invalidation_bus.invalidate("auth_user", str(user_id))
+
+
+api_key_cache = TTLCache(
+    "auth_api_key",
+    max_entries=settings.AUTH_API_KEY_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_API_KEY_CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("auth_api_key_cache_entries", lambda: len(api_key_cache))
+invalidation_bus.register("auth_api_key", api_key_cache.invalidate)
+
+
+async def resolve_api_key(db: AsyncSession, raw_key: str) -> Tuple[Optional[UUID], Optional[User]]:
+    """
+    (key id, owner) for a raw API key, or (None, None) if no key matches.
+
+    The owner is None if the user no longer exists. Use is recorded in
+    api_key_usage; nothing is written to the database here.
+    """
+    key_hash = hash_api_key(raw_key)
+    resolved = api_key_cache.get(key_hash)
+    if resolved is None:
+        metrics.inc("auth_api_key_queries")
+        result = await db.execute(
+            select(APIKey.id, APIKey.user_id).where(APIKey.key_hash == key_hash)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None, None
+        resolved = (row.id, row.user_id)
+        api_key_cache.set(key_hash, resolved)
+
+    key_id, user_id = resolved
+    api_key_usage.touch(key_id)
+    return key_id, await get_user(db, user_id)
+
+
+def invalidate_api_key(key_hash: str):
+    """Forget a revoked key in this worker and, through invalidation_bus, in the others."""
+    invalidation_bus.invalidate("auth_api_key", key_hash)
+
+
+class APIKeyUsage:
+    """Latest use of each API key since the last flush."""
+
+    def __init__(self, session_maker=None):
+        self.session_maker = session_maker or async_session_maker
+        self._pending: Dict[UUID, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, key_id: UUID, at: Optional[datetime] = None):
+        at = at or datetime.now(timezone.utc)
+        if key_id not in self._pending or self._pending[key_id] < at:
+            self._pending[key_id] = at
+
+    def forget(self, key_id: UUID):
+        self._pending.pop(key_id, None)
+
+    @staticmethod
+    def update_statement(pending: Dict[UUID, datetime]):
+        """One UPDATE ... FROM (VALUES ...) setting last_used for every key."""
+        used = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("used_at", DateTime(timezone=True)),
+            name="used",
+        ).data(list(pending.items()))
+        keys = APIKey.__table__
+        return (
+            update(keys)
+            .where(keys.c.id == used.c.id)
+            .values(last_used=func.greatest(func.coalesce(keys.c.last_used, used.c.used_at), used.c.used_at))
+        )
+
+    async def flush(self) -> int:
+        """Write pending last_used times in one statement. Returns the number of keys."""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                async with self.session_maker() as db:
+                    await db.execute(self.update_statement(pending))
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Failed to record last use of {len(pending)} API keys, will retry: {e}")
+                for key_id, at in pending.items():
+                    self.touch(key_id, at)
+                return 0
+            metrics.inc("api_key_last_used_flushed", len(pending))
+            return len(pending)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        metrics.register_gauge("api_key_last_used_pending", lambda: len(self._pending))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.API_KEY_LAST_USED_FLUSH_SECONDS)
+            await self.flush()
+
+
+api_key_usage = APIKeyUsage()
@@ -0,0 +1,115 @@
+"""Space membership checks shared by every endpoint.
+
+"Is user U a member of space S, with what role" is answered by one query on
+the spaces and space_members primary keys, never by loading Space.members.
+Answers are memoized on the request's session (db.info) and cached across
+requests in membership_cache, which invite_member, remove_member and
+delete_space invalidate in every worker through invalidation_bus. Owners
+count as members even without a space_members row.
+"""
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.models.space import MemberRole, Space, SpaceMember
+from app.models.user import User
+
+# db.info key of the per-request memo
+MEMO_KEY = "space_memberships"
+
+membership_cache = TTLCache(
+    "space_membership",
+    max_entries=settings.SPACE_MEMBERSHIP_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SPACE_MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+metrics.register_gauge("space_membership_cache_entries", lambda: len(membership_cache))
+
+
+class Membership(NamedTuple):
+    space_exists: bool
+    role: Optional[MemberRole]
+
+    @property
+    def is_member(self) -> bool:
+        return self.role is not None
+
+
+def membership_query(space_id: UUID, user_id: UUID):
+    """The space's owner and the user's role in it; no row if the space does not exist."""
+    return (
+        select(Space.owner_id, SpaceMember.role)
+        .outerjoin(
+            SpaceMember,
+            and_(SpaceMember.space_id == Space.id, SpaceMember.user_id == user_id),
+        )
+        .where(Space.id == space_id)
+    )
+
+
+async def get_membership(db: AsyncSession, space_id: UUID, user_id: UUID) -> Membership:
+    memo = db.info.setdefault(MEMO_KEY, {})
+    key = (space_id, user_id)
+    if key in memo:
+        return memo[key]
+
+    membership = membership_cache.get(key)
+    if membership is None:
+        metrics.inc("space_membership_queries")
+        row = (await db.execute(membership_query(space_id, user_id))).one_or_none()
+        if row is None:
+            membership = Membership(False, None)
+        else:
+            role = row.role or (MemberRole.OWNER if row.owner_id == user_id else None)
+            membership = Membership(True, role)
+            membership_cache.set(key, membership)
+    memo[key] = membership
+    return membership
+
+
+async def verify_space_access(space_id: UUID, user: User, db: AsyncSession) -> MemberRole:
+    """The user's role in the space; 404 if it does not exist, 403 if not a member."""
+    membership = await get_membership(db, space_id, user.id)
+    if not membership.space_exists:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Space not found")
+    if not membership.is_member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a member of this space")
+    return membership.role
+
+
+async def space_member_ids(db: AsyncSession, space_id: UUID) -> List[UUID]:
+    result = await db.execute(select(SpaceMember.user_id).where(SpaceMember.space_id == space_id))
+    return list(result.scalars().all())
+
+
+def _membership_matcher(space_id: UUID, user_id: Optional[UUID]):
+    def matches(key) -> bool:
+        return key[0] == space_id and (user_id is None or key[1] == user_id)
+    return matches
+
+
+def _forget_memberships(key):
+    """invalidation_bus handler; key is [space_id, user_id or None] as strings."""
+    space_id, user_id = key
+    membership_cache.invalidate_where(
+        _membership_matcher(UUID(space_id), UUID(user_id) if user_id else None)
+    )
+
+
+invalidation_bus.register("space_membership", _forget_memberships)
+
+
+def invalidate_membership(space_id: UUID, user_id: Optional[UUID] = None, db: Optional[AsyncSession] = None):
+    """Forget cached answers for one member of the space, or all of them, in every worker."""
+    invalidation_bus.invalidate("space_membership", [str(space_id), str(user_id) if user_id else None])
+    if db is not None:
+        matches = _membership_matcher(space_id, user_id)
+        memo = db.info.get(MEMO_KEY, {})
+        for key in [key for key in memo if matches(key)]:
+            del memo[key]
@@ -1,12 +1,24 @@
-"""Duplicate detection service for cards"""
+"""Duplicate detection service for cards
+
+Candidates come from the pg_trgm GiST index on lower(cards.name): a KNN
+query (ORDER BY lower(name) <-> :name) returns the nearest names by trigram
+distance, and only those are re-scored with SequenceMatcher, so a call costs
+a bounded amount of Python work however many cards the space holds.
+"""
 from difflib import SequenceMatcher
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.card import Card
+from app.models.column import Column
+
+# Nearest trigram neighbours fetched per call, at least this many and
+# CANDIDATE_FACTOR times the requested limit
+MIN_CANDIDATES = 50
+CANDIDATE_FACTOR = 10
 
 
 def calculate_similarity(text1: str, text2: str) -> float:
@@ -24,6 +36,54 @@ def calculate_similarity(text1: str, text2: str) -> float:
     return SequenceMatcher(None, t1, t2).ratio()
 
 
+def rank_similar(
+    name: str,
+    cards: Iterable[Card],
+    threshold: float,
+    limit: int,
+) -> List[Tuple[Card, float]]:
+    """Score cards against name and keep the best ones at or above threshold."""
+    target = (name or "").lower().strip()
+    if not target:
+        return []
+
+    # Same argument order as calculate_similarity; ratio is not always symmetric
+    matcher = SequenceMatcher(None)
+    matcher.set_seq1(target)
+    similar_cards = []
+    for card in cards:
+        if not card.name:
+            continue
+        matcher.set_seq2(card.name.lower().strip())
+        # quick_ratio is an upper bound on ratio, so this skips no real match
+        if matcher.quick_ratio() < threshold:
+            continue
+        similarity = matcher.ratio()
+        if similarity >= threshold:
+            similar_cards.append((card, similarity))
+
+    similar_cards.sort(key=lambda x: x[1], reverse=True)
+    return similar_cards[:limit]
+
+
+def candidate_query(
+    name: str,
+    space_id: UUID,
+    limit: int,
+    exclude_card_id: Optional[UUID] = None,
+):
+    """Nearest cards of the space by trigram distance, served by ix_cards_name_trgm."""
+    query = (
+        select(Card)
+        .where(Card.column_id.in_(select(Column.id).where(Column.space_id == space_id)))
+        .order_by(func.lower(Card.name).op("<->")(name.lower().strip()))
+        .limit(max(MIN_CANDIDATES, limit * CANDIDATE_FACTOR))
+    )
+    if exclude_card_id:
+        query = query.where(Card.id != exclude_card_id)
+    return query
+
+
 async def find_similar_cards(
     db: AsyncSession,
     name: str,
@@ -45,29 +105,11 @@ async def find_similar_cards(
     Returns:
         List of (Card, similarity_score) tuples, sorted by similarity descending
     """
-    # Get all cards in the space
-    query = (
-        select(Card)
-        .join(Card.column)
-        .where(Card.column.has(space_id=space_id))
-    )
-    
-    if exclude_card_id:
-        query = query.where(Card.id != exclude_card_id)
-    
-    result = await db.execute(query)
-    cards = result.scalars().all()
-    
-    # Calculate similarity for each card
-    similar_cards = []
-    for card in cards:
-        similarity = calculate_similarity(name, card.name)
-        if similarity >= threshold:
-            similar_cards.append((card, similarity))
-    
-    # Sort by similarity (highest first) and limit
-    similar_cards.sort(key=lambda x: x[1], reverse=True)
-    return similar_cards[:limit]
+    if not name or not name.strip():
+        return []
+
+    result = await db.execute(candidate_query(name, space_id, limit, exclude_card_id))
+    return rank_similar(name, result.scalars().all(), threshold, limit)
 
 
 def format_duplicate_warning(similar_cards: List[Tuple[Card, float]]) -> str:
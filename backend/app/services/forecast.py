@@ -0,0 +1,89 @@
+"""Monte Carlo delivery forecasts from daily throughput history.
+
+Each trial replays the future by drawing days, with replacement, from the
+space's recent daily completion counts until the remaining cards are done.
+All trials advance together as NumPy arrays, a block of days at a time, so
+10k trials take milliseconds instead of a Python loop per trial and day.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_TRIALS = 10_000
+FORECAST_PERCENTILES = (50, 85, 95)
+
+# Trials still unfinished after this many simulated days count as never finishing
+MAX_FORECAST_DAYS = 3650
+# Days simulated per step; bounds memory at trials * BLOCK_DAYS counters
+BLOCK_DAYS = 128
+
+
+def daily_history(completions: Iterable, since: date, until: date) -> np.ndarray:
+    """Completions per day from since up to (not including) until, zero-filled."""
+    history = np.zeros((until - since).days, dtype=np.int32)
+    for row in completions:
+        offset = (row.day - since).days
+        if 0 <= offset < len(history):
+            history[offset] = row.completions
+    return history
+
+
+def simulate_completion_days(
+    history: np.ndarray,
+    remaining: int,
+    trials: int = DEFAULT_TRIALS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Days each trial needed to complete remaining cards.
+
+    Trials that do not finish within MAX_FORECAST_DAYS get MAX_FORECAST_DAYS + 1.
+    """
+    rng = rng or np.random.default_rng()
+    days = np.full(trials, MAX_FORECAST_DAYS + 1, dtype=np.int32)
+    if remaining <= 0:
+        return np.zeros(trials, dtype=np.int32)
+    if not history.any():
+        return days
+
+    # Size the first block so most trials finish in it; later blocks mop up the tail
+    block = int(min(BLOCK_DAYS, np.ceil(remaining / history.mean() * 1.25) + 7))
+    done = np.zeros(trials, dtype=np.int32)
+    active = np.arange(trials)
+    elapsed = 0
+    while active.size and elapsed < MAX_FORECAST_DAYS:
+        block = min(block, MAX_FORECAST_DAYS - elapsed)
+        draws = history[rng.integers(0, len(history), size=(active.size, block))]
+        totals = np.cumsum(draws, axis=1, dtype=np.int32)
+        totals += done[active, None]
+        reached = totals >= remaining
+        finished = reached[:, -1]
+        days[active[finished]] = elapsed + reached[finished].argmax(axis=1) + 1
+        done[active] = totals[:, -1]
+        active = active[~finished]
+        elapsed += block
+        block = BLOCK_DAYS
+    return days
+
+
+def forecast_dates(
+    days: np.ndarray,
+    start: date,
+    percentiles: Sequence[int] = FORECAST_PERCENTILES,
+) -> Dict[str, Optional[Dict]]:
+    """
+    Completion date at each percentile of the simulated durations, where
+    start is the first simulated day.
+
+    Uses the "higher" method so every date is one some trial actually
+    reached. A percentile is None if it falls among unfinished trials.
+    """
+    forecast = {}
+    for p, value in zip(percentiles, np.percentile(days, percentiles, method="higher")):
+        value = int(value)
+        forecast[f"p{p}"] = (
+            None if value > MAX_FORECAST_DAYS
+            else {"days": value, "date": (start + timedelta(days=max(value, 1) - 1)).isoformat()}
+        )
+    return forecast
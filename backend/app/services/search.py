@@ -0,0 +1,89 @@
+"""Full-text search helpers shared by global search and card filtering"""
+import re
+from typing import Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.sql.elements import ColumnElement
+
+
+# Text search configuration used by the generated search_vector columns.
+# 'simple' does no stemming or stop-word removal, so it behaves the same for
+# every interface language and keeps prefix matching predictable.
+SEARCH_CONFIG = "simple"
+
+MAX_QUERY_TERMS = 16
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=20, MinWords=8, MaxFragments=2"
+
+# & first, so the entities added for < and > are not escaped again
+HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"))
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_tsquery(text: str) -> Optional[str]:
+    """
+    Turn free-form user input into a prefix-matching tsquery string.
+
+    Every word becomes a prefix term and all terms must match, so "deplo prod"
+    finds "Deploy to production". Punctuation is dropped, which also strips any
+    tsquery operators the user may have typed.
+
+    Args:
+        text: Raw search input
+
+    Returns:
+        A string for to_tsquery(), or None if the input has no searchable words
+    """
+    terms = _TERM_RE.findall(text.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def to_tsquery(query: str) -> ColumnElement:
+    """SQL expression for a tsquery string built by build_tsquery."""
+    return func.to_tsquery(SEARCH_CONFIG, query)
+
+
+def matches(search_vector: ColumnElement, tsquery: ColumnElement) -> ColumnElement:
+    """search_vector @@ tsquery, answerable from the GIN index."""
+    return search_vector.bool_op("@@")(tsquery)
+
+
+def rank(search_vector: ColumnElement, tsquery: ColumnElement) -> ColumnElement:
+    """Relevance of a row; name matches outweigh description matches."""
+    return func.ts_rank_cd(search_vector, tsquery)
+
+
+def escape_html(document: ColumnElement) -> ColumnElement:
+    """document with &, < and > replaced by HTML entities; NULL becomes ''."""
+    escaped = func.coalesce(document, "")
+    for char, entity in HTML_ESCAPES:
+        escaped = func.replace(escaped, char, entity)
+    return escaped
+
+
+def headline(
+    document: ColumnElement,
+    tsquery: ColumnElement,
+    fallback: Optional[ColumnElement] = None,
+) -> ColumnElement:
+    """
+    HTML snippet of document with matching terms wrapped in <mark> tags.
+
+    The text is escaped before ts_headline runs, so the <mark> tags are the
+    only markup in the snippet and it is safe to render as HTML. With a
+    fallback, rows whose document has no match are summarised from the
+    fallback instead, e.g. a card that only matched on its name.
+    """
+    snippet = func.ts_headline(
+        SEARCH_CONFIG,
+        escape_html(document),
+        tsquery,
+        HEADLINE_OPTIONS,
+    )
+    if fallback is None:
+        return snippet
+    document_matches = matches(func.to_tsvector(SEARCH_CONFIG, func.coalesce(document, "")), tsquery)
+    return case((document_matches, snippet), else_=headline(fallback, tsquery))
@@ -0,0 +1,248 @@
+"""Webhook log persistence and retention.
+
+Delivery attempts are collected in WebhookLogBuffer and written with one
+multi-row INSERT per flush instead of a transaction per attempt. A batch is
+only kept for the next flush when the database was unreachable; logs of
+webhooks deleted in the meantime are dropped. The
+compaction job deletes logs past WEBHOOK_LOG_RETENTION_DAYS, keeps at most
+WEBHOOK_LOG_MAX_PER_WEBHOOK rows per webhook, prunes finished deliveries of
+the same age and removes payloads no log references any more.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, exists, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, IntegrityError, InterfaceError, OperationalError
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.webhook import Webhook, WebhookLog, WebhookPayload, WebhookDelivery, DeliveryStatus
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock key so only one process compacts at a time. Flushes that
+# store payloads hold it in shared mode, so compaction cannot delete a payload
+# that a log being inserted is about to reference.
+COMPACTION_LOCK_KEY = 7_410_021
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed flush is worth retrying: the database was unreachable, not the rows invalid."""
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return isinstance(error, OSError)
+
+
+def payload_hash(payload: Dict[str, Any]) -> str:
+    """SHA-256 of the payload's canonical JSON, independent of key order."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class WebhookLogBuffer:
+    def __init__(self, session_maker=None):
+        self.session_maker = session_maker or async_session_maker
+        self._rows: List[Dict[str, Any]] = []
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._flush_now = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(
+        self,
+        webhook_id,
+        event: str,
+        payload: Dict[str, Any],
+        response_status: Optional[int],
+        response_body: Optional[str],
+        success: bool,
+    ):
+        row = {
+            "webhook_id": webhook_id,
+            "event": event,
+            "payload": payload,
+            "payload_hash": None,
+            "response_status": response_status,
+            "response_body": response_body,
+            "success": success,
+            "created_at": datetime.now(timezone.utc),
+        }
+        if settings.WEBHOOK_LOG_DEDUPE_PAYLOADS:
+            digest = payload_hash(payload)
+            self._payloads[digest] = payload
+            row["payload"] = None
+            row["payload_hash"] = digest
+        self._rows.append(row)
+
+        if len(self._rows) > settings.WEBHOOK_LOG_BUFFER_MAX:
+            # The database has been unreachable for a while; keep the newest rows
+            dropped = len(self._rows) - settings.WEBHOOK_LOG_BUFFER_MAX
+            del self._rows[:dropped]
+            metrics.inc("webhook_logs_dropped", dropped)
+        if len(self._rows) >= settings.WEBHOOK_LOG_BATCH_SIZE:
+            self._flush_now.set()
+
+    async def flush(self) -> int:
+        """Write buffered rows in one transaction. Returns the number written."""
+        async with self._flush_lock:
+            rows, self._rows = self._rows, []
+            payloads, self._payloads = self._payloads, {}
+            if not rows:
+                return 0
+            try:
+                try:
+                    await self._write(rows, payloads)
+                except IntegrityError:
+                    # A webhook was deleted while one of its deliveries was in flight
+                    live = await self._existing_webhook_ids({row["webhook_id"] for row in rows})
+                    kept = [row for row in rows if row["webhook_id"] in live]
+                    metrics.inc("webhook_logs_orphaned", len(rows) - len(kept))
+                    rows = kept
+                    if rows:
+                        await self._write(rows, payloads)
+            except Exception as e:
+                if not is_transient(e):
+                    logger.error(f"Dropping {len(rows)} webhook logs that cannot be written: {e}")
+                    metrics.inc("webhook_logs_dropped", len(rows))
+                    return 0
+                logger.error(f"Failed to write {len(rows)} webhook logs, will retry: {e}")
+                self._rows[:0] = rows
+                self._payloads.update(payloads)
+                return 0
+            metrics.inc("webhook_logs_written", len(rows))
+            return len(rows)
+
+    async def _write(self, rows: List[Dict[str, Any]], payloads: Dict[str, Dict[str, Any]]):
+        async with self.session_maker() as db:
+            if payloads:
+                await db.execute(
+                    text("SELECT pg_advisory_xact_lock_shared(:key)"), {"key": COMPACTION_LOCK_KEY}
+                )
+                await db.execute(
+                    pg_insert(WebhookPayload)
+                    .values([{"hash": h, "payload": p} for h, p in payloads.items()])
+                    .on_conflict_do_nothing(index_elements=["hash"])
+                )
+            await db.execute(insert(WebhookLog), rows)
+            await db.commit()
+
+    async def _existing_webhook_ids(self, webhook_ids: Set[Any]) -> Set[Any]:
+        async with self.session_maker() as db:
+            result = await db.execute(select(Webhook.id).where(Webhook.id.in_(webhook_ids)))
+            return set(result.scalars().all())
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        metrics.register_gauge("webhook_logs_buffered", lambda: len(self._rows))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=settings.WEBHOOK_LOG_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+
+def compaction_statements(
+    now: datetime,
+    retention_days: int,
+    max_per_webhook: int,
+) -> List[Tuple[str, Any]]:
+    """(label, DELETE statement) pairs for one compaction pass, in order."""
+    cutoff = now - timedelta(days=retention_days)
+
+    ranked = (
+        select(
+            WebhookLog.id,
+            func.row_number()
+            .over(partition_by=WebhookLog.webhook_id, order_by=WebhookLog.created_at.desc())
+            .label("rank"),
+        )
+        .subquery()
+    )
+
+    return [
+        ("expired_logs", delete(WebhookLog).where(WebhookLog.created_at < cutoff)),
+        (
+            "excess_logs",
+            delete(WebhookLog).where(
+                WebhookLog.id.in_(select(ranked.c.id).where(ranked.c.rank > max_per_webhook))
+            ),
+        ),
+        (
+            "finished_deliveries",
+            delete(WebhookDelivery).where(
+                WebhookDelivery.status.in_([DeliveryStatus.DELIVERED, DeliveryStatus.DEAD]),
+                WebhookDelivery.completed_at < cutoff,
+            ),
+        ),
+        (
+            "orphaned_payloads",
+            delete(WebhookPayload).where(
+                ~exists().where(WebhookLog.payload_hash == WebhookPayload.hash)
+            ),
+        ),
+    ]
+
+
+async def compact_webhook_logs(db, now: Optional[datetime] = None) -> Optional[Dict[str, int]]:
+    """
+    Apply the retention policy in one transaction.
+
+    Returns rows deleted per step, or None if another process holds the
+    compaction lock.
+    """
+    locked = await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": COMPACTION_LOCK_KEY})
+    if not locked.scalar():
+        await db.rollback()
+        return None
+
+    deleted = {}
+    for label, statement in compaction_statements(
+        now or datetime.now(timezone.utc),
+        settings.WEBHOOK_LOG_RETENTION_DAYS,
+        settings.WEBHOOK_LOG_MAX_PER_WEBHOOK,
+    ):
+        result = await db.execute(statement)
+        deleted[label] = result.rowcount
+    await db.commit()
+    return deleted
+
+
+async def compaction_loop():
+    while True:
+        await asyncio.sleep(settings.WEBHOOK_LOG_COMPACTION_INTERVAL_SECONDS)
+        try:
+            async with async_session_maker() as db:
+                deleted = await compact_webhook_logs(db)
+            if deleted:
+                logger.info(f"Webhook log compaction: {deleted}")
+                metrics.inc("webhook_logs_compacted", deleted["expired_logs"] + deleted["excess_logs"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Webhook log compaction failed: {e}")
+
+
+webhook_log_buffer = WebhookLogBuffer()
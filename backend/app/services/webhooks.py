@@ -1,11 +1,28 @@
+"""Outbound webhooks.
+
+Request handlers call dispatch_webhooks, which only writes WebhookDelivery
+rows. WebhookDeliveryWorker runs in the API process, claims due deliveries
+with SELECT ... FOR UPDATE SKIP LOCKED (so several workers can share the
+queue), posts them through one pooled HTTP client and retries failures with
+exponential backoff until they succeed or are dead-lettered. Attempts are
+logged through the buffered writer in app.services.webhook_logs.
+"""
+import asyncio
 import logging
-from typing import Any, Dict, List
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.webhook import Webhook, WebhookLog
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.webhook import Webhook, WebhookDelivery, DeliveryStatus
+from app.services.webhook_logs import webhook_log_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -16,40 +33,291 @@ async def dispatch_webhooks(
     event: str,
     payload: Dict[str, Any],
 ):
+    """Queue event for every active webhook of the space that subscribes to it."""
     result = await db.execute(
         select(Webhook).where(Webhook.space_id == space_id, Webhook.active == True)
     )
     webhooks: List[Webhook] = result.scalars().all()
 
-    if not webhooks:
+    body = {"event": event, "space_id": str(space_id), "payload": payload}
+    queued = 0
+    for webhook in webhooks:
+        if webhook.events and event not in webhook.events:
+            continue
+        db.add(WebhookDelivery(webhook_id=webhook.id, event=event, body=body))
+        queued += 1
+
+    if not queued:
         return
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        for webhook in webhooks:
-            if webhook.events and event not in webhook.events:
-                continue
+    await db.commit()
+    metrics.inc("webhook_deliveries_queued", queued)
+    delivery_worker.wake()
 
-            log = WebhookLog(
-                webhook_id=webhook.id,
-                event=event,
-                payload=payload,
-            )
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    cap: float,
+    jitter: Callable[[], float] = random.random,
+) -> float:
+    """
+    Seconds to wait before retrying after the given failed attempt.
+
+    Doubles from base on each attempt up to cap. Half of the delay is
+    randomized so endpoints that come back up are not hit by every queued
+    retry at the same moment.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + jitter() * delay / 2
+
+
+def is_retryable(status_code: Optional[int]) -> bool:
+    """Network errors, timeouts, 408, 429 and 5xx are worth retrying."""
+    if status_code is None:
+        return True
+    return status_code in (408, 429) or status_code >= 500
+
+
+@dataclass
+class AttemptResult:
+    status_code: Optional[int]
+    response_body: str
+
+    @property
+    def success(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code < 300
+
+
+async def post_webhook(
+    client: httpx.AsyncClient,
+    url: str,
+    secret: Optional[str],
+    body: Dict[str, Any],
+) -> AttemptResult:
+    headers = {}
+    if secret:
+        headers["X-Kanbot-Secret"] = secret
+    try:
+        response = await client.post(url, json=body, headers=headers)
+    except Exception as exc:
+        return AttemptResult(status_code=None, response_body=str(exc)[:1000] or exc.__class__.__name__)
+    return AttemptResult(status_code=response.status_code, response_body=response.text[:1000])
+
+
+class EndpointLimiter:
+    """Caps concurrent requests to any single webhook URL.
+
+    Slots are taken without waiting when deliveries are claimed, so the backlog
+    of a slow endpoint stays in the queue instead of holding worker capacity.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._in_use: Dict[str, int] = {}
+
+    def try_acquire(self, url: str) -> bool:
+        if self._in_use.get(url, 0) >= self.limit:
+            return False
+        self._in_use[url] = self._in_use.get(url, 0) + 1
+        return True
+
+    def release(self, url: str):
+        self._in_use[url] -= 1
+        if not self._in_use[url]:
+            # Forget idle endpoints so the map does not grow with every URL ever seen
+            del self._in_use[url]
+
+    def saturated(self) -> List[str]:
+        """URLs with no free slot."""
+        return [url for url, count in self._in_use.items() if count >= self.limit]
+
+
+def claim_query(now: datetime, limit: int, exclude_urls: List[str]):
+    """Due deliveries, oldest first, locked so concurrent workers skip them."""
+    query = (
+        select(WebhookDelivery, Webhook.url, Webhook.secret, Webhook.active)
+        .join(Webhook, WebhookDelivery.webhook_id == Webhook.id)
+        .where(
+            WebhookDelivery.status.in_([DeliveryStatus.PENDING, DeliveryStatus.DELIVERING]),
+            WebhookDelivery.next_attempt_at <= now,
+        )
+    )
+    if exclude_urls:
+        query = query.where(Webhook.url.notin_(exclude_urls))
+    return (
+        query.order_by(WebhookDelivery.next_attempt_at)
+        .limit(limit)
+        .with_for_update(of=WebhookDelivery, skip_locked=True)
+    )
+
+
+class WebhookDeliveryWorker:
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+        self.limiter = EndpointLimiter(settings.WEBHOOK_CONCURRENCY_PER_ENDPOINT)
+        self._task: Optional[asyncio.Task] = None
+        # Delivery task -> URL whose slot it holds (None for disabled webhooks)
+        self._in_flight: Dict[asyncio.Task, Optional[str]] = {}
+        self._wake = asyncio.Event()
+
+    def wake(self):
+        """Check the queue now instead of waiting for the next poll."""
+        self._wake.set()
+
+    def start(self):
+        self.client = httpx.AsyncClient(
+            timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.WEBHOOK_WORKER_CONCURRENCY,
+                max_keepalive_connections=settings.WEBHOOK_WORKER_CONCURRENCY,
+            ),
+        )
+        self._task = asyncio.create_task(self._run())
+        metrics.register_gauge("webhook_deliveries_in_flight", lambda: len(self._in_flight))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Unfinished deliveries keep their lease and are retried once it expires
+        for task in list(self._in_flight):
+            task.cancel()
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self._claim(settings.WEBHOOK_WORKER_CONCURRENCY - len(self._in_flight))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to claim webhook deliveries: {e}")
+                claimed = []
+
+            for delivery, url, secret, active in claimed:
+                task = asyncio.create_task(self._deliver(delivery, url, secret, active))
+                self._in_flight[task] = url if active else None
+                task.add_done_callback(self._delivery_done)
+
+            if claimed and len(self._in_flight) < settings.WEBHOOK_WORKER_CONCURRENCY:
+                continue
             try:
-                headers = {}
-                if webhook.secret:
-                    headers["X-Kanbot-Secret"] = webhook.secret
-                response = await client.post(
-                    webhook.url,
-                    json={"event": event, "space_id": str(space_id), "payload": payload},
-                    headers=headers,
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.WEBHOOK_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def _delivery_done(self, task: asyncio.Task):
+        was_full = len(self._in_flight) >= settings.WEBHOOK_WORKER_CONCURRENCY
+        url = self._in_flight.pop(task, None)
+        if url is not None:
+            # Released here so a delivery cancelled before it ran frees its slot too
+            self.limiter.release(url)
+        if was_full:
+            self.wake()
+
+    async def _claim(self, limit: int) -> list:
+        """
+        Lease up to limit due deliveries whose endpoint has a free slot.
+
+        The slot is taken here, so every claimed delivery is posted at once and
+        its lease covers only the request. Rows locked but not taken because
+        their endpoint filled up within this batch are left untouched.
+        """
+        if limit <= 0:
+            return []
+        now = datetime.now(timezone.utc)
+        claimed = []
+        try:
+            async with async_session_maker() as db:
+                result = await db.execute(claim_query(now, limit, self.limiter.saturated()))
+                for row in result.all():
+                    delivery, url, secret, active = row
+                    if not active or self.limiter.try_acquire(url):
+                        claimed.append(tuple(row))
+                if claimed:
+                    await db.execute(
+                        update(WebhookDelivery)
+                        .where(WebhookDelivery.id.in_([row[0].id for row in claimed]))
+                        .values(
+                            status=DeliveryStatus.DELIVERING,
+                            next_attempt_at=now + timedelta(seconds=settings.WEBHOOK_DELIVERY_LEASE_SECONDS),
+                        )
+                    )
+                await db.commit()
+        except BaseException:
+            for delivery, url, secret, active in claimed:
+                if active:
+                    self.limiter.release(url)
+            raise
+        return claimed
+
+    async def _deliver(self, delivery: WebhookDelivery, url: str, secret: Optional[str], active: bool):
+        if not active:
+            await self._finish(delivery, DeliveryStatus.DEAD, None, "Webhook disabled")
+            return
+
+        attempt = await post_webhook(self.client, url, secret, delivery.body)
+
+        attempts = delivery.attempts + 1
+        if attempt.success:
+            status = DeliveryStatus.DELIVERED
+            metrics.inc("webhook_deliveries_succeeded")
+        elif attempts >= settings.WEBHOOK_MAX_ATTEMPTS or not is_retryable(attempt.status_code):
+            status = DeliveryStatus.DEAD
+            metrics.inc("webhook_deliveries_dead")
+            logger.warning(f"Webhook delivery {delivery.id} dead-lettered after {attempts} attempts")
+        else:
+            status = DeliveryStatus.PENDING
+            metrics.inc("webhook_deliveries_retried")
+
+        await self._finish(delivery, status, attempt, attempt.response_body, attempts)
+
+    async def _finish(
+        self,
+        delivery: WebhookDelivery,
+        status: str,
+        attempt: Optional[AttemptResult],
+        error: Optional[str],
+        attempts: Optional[int] = None,
+    ):
+        now = datetime.now(timezone.utc)
+        values = {"status": status, "last_status": attempt.status_code if attempt else None}
+        if attempts is not None:
+            values["attempts"] = attempts
+        if status == DeliveryStatus.PENDING:
+            delay = backoff_delay(attempts, settings.WEBHOOK_BACKOFF_BASE_SECONDS, settings.WEBHOOK_BACKOFF_MAX_SECONDS)
+            values["next_attempt_at"] = now + timedelta(seconds=delay)
+        else:
+            values["completed_at"] = now
+        values["last_error"] = None if attempt is not None and attempt.success else error
+
+        try:
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(WebhookDelivery).where(WebhookDelivery.id == delivery.id).values(**values)
                 )
-                log.response_status = response.status_code
-                log.response_body = response.text[:1000]
-                log.success = 200 <= response.status_code < 300
-            except Exception as exc:
-                log.response_body = str(exc)[:1000]
-                log.success = False
-                logger.warning("Webhook dispatch failed: %s", exc)
-            db.add(log)
-
-    await db.commit()
\ No newline at end of file
+                await db.commit()
+        except Exception as e:
+            # The lease expires and the delivery is attempted again
+            logger.error(f"Failed to record webhook delivery {delivery.id}: {e}")
+
+        if attempt is not None:
+            webhook_log_buffer.add(
+                webhook_id=delivery.webhook_id,
+                event=delivery.event,
+                payload=delivery.body.get("payload", {}),
+                response_status=attempt.status_code,
+                response_body=attempt.response_body,
+                success=attempt.success,
+            )
+
+
+delivery_worker = WebhookDeliveryWorker()
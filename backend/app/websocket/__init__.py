@@ -1,3 +1,10 @@
+from app.core import metrics
+from app.core.config import settings
+from app.websocket.backends import create_backend
 from app.websocket.manager import ConnectionManager
 
-manager = ConnectionManager()
+manager = ConnectionManager(create_backend(settings.BROADCAST_BACKEND, settings.REDIS_URL))
+
+metrics.register_gauge("websocket_connections", manager.connection_count)
+metrics.register_gauge("websocket_queue_depth_total", lambda: sum(manager.queue_depths()))
+metrics.register_gauge("websocket_queue_depth_max", lambda: max(manager.queue_depths(), default=0))
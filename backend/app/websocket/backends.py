@@ -0,0 +1,164 @@
+"""Broadcast backends that carry space events between API workers.
+
+ConnectionManager publishes every space event through a backend. The backend
+hands the event back to each worker subscribed to that space, and the worker
+fans it out to its own WebSocket connections. Events are passed around already
+encoded as JSON text so no worker has to serialize them again.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, str], Awaitable[None]]
+
+
+class BroadcastBackend:
+    """Interface for space event transports."""
+
+    def __init__(self):
+        self._handler: Optional[MessageHandler] = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Begin delivering events for subscribed spaces to handler."""
+        self._handler = handler
+
+    async def stop(self) -> None:
+        self._handler = None
+
+    async def subscribe(self, space_id: str) -> None:
+        raise NotImplementedError
+
+    async def unsubscribe(self, space_id: str) -> None:
+        raise NotImplementedError
+
+    async def publish(self, space_id: str, payload: str) -> None:
+        raise NotImplementedError
+
+    async def _deliver(self, space_id: str, payload: str) -> None:
+        if self._handler is not None:
+            await self._handler(space_id, payload)
+
+
+class MemoryBroadcastBackend(BroadcastBackend):
+    """Single-process backend: events only reach connections in this worker."""
+
+    def __init__(self):
+        super().__init__()
+        self.subscriptions: Set[str] = set()
+
+    async def subscribe(self, space_id: str) -> None:
+        self.subscriptions.add(space_id)
+
+    async def unsubscribe(self, space_id: str) -> None:
+        self.subscriptions.discard(space_id)
+
+    async def publish(self, space_id: str, payload: str) -> None:
+        if space_id in self.subscriptions:
+            await self._deliver(space_id, payload)
+
+
+class RedisBroadcastBackend(BroadcastBackend):
+    """Redis pub/sub backend: one channel per space, shared by all workers.
+
+    A worker only subscribes to the spaces it has clients for, so Redis does
+    not push events for other spaces to it. If a publish fails the event is
+    still delivered locally so a single worker keeps working without Redis.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, client=None, channel_prefix: str = "kanbot:space:"):
+        super().__init__()
+        if client is None:
+            import redis.asyncio as aioredis
+            client = aioredis.from_url(redis_url)
+        self.client = client
+        self.channel_prefix = channel_prefix
+        self.subscriptions: Set[str] = set()
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._has_subscriptions = asyncio.Event()
+
+    def channel(self, space_id: str) -> str:
+        return f"{self.channel_prefix}{space_id}"
+
+    async def start(self, handler: MessageHandler) -> None:
+        await super().start(handler)
+        self._pubsub = self.client.pubsub()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.client.aclose()
+        self.subscriptions.clear()
+        await super().stop()
+
+    async def subscribe(self, space_id: str) -> None:
+        if space_id in self.subscriptions:
+            return
+        self.subscriptions.add(space_id)
+        await self._pubsub.subscribe(self.channel(space_id))
+        self._has_subscriptions.set()
+
+    async def unsubscribe(self, space_id: str) -> None:
+        if space_id not in self.subscriptions:
+            return
+        self.subscriptions.discard(space_id)
+        if not self.subscriptions:
+            self._has_subscriptions.clear()
+        await self._pubsub.unsubscribe(self.channel(space_id))
+
+    async def publish(self, space_id: str, payload: str) -> None:
+        try:
+            await self.client.publish(self.channel(space_id), payload)
+        except Exception as e:
+            logger.error(f"Redis publish failed for space {space_id}, delivering locally: {e}")
+            if space_id in self.subscriptions:
+                await self._deliver(space_id, payload)
+
+    async def _listen(self) -> None:
+        while True:
+            # get_message fails on a pubsub with no channels, so idle until one is added
+            await self._has_subscriptions.wait()
+            try:
+                raw = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis pub/sub receive failed: {e}")
+                await asyncio.sleep(1)
+                continue
+
+            if not raw or raw.get("type") != "message":
+                continue
+
+            channel = raw["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            space_id = channel[len(self.channel_prefix):]
+            payload = raw["data"]
+            if isinstance(payload, bytes):
+                payload = payload.decode()
+
+            try:
+                await self._deliver(space_id, payload)
+            except Exception as e:
+                logger.error(f"Error delivering event for space {space_id}: {e}")
+
+
+def create_backend(name: str, redis_url: Optional[str] = None) -> BroadcastBackend:
+    """Build the backend selected by the BROADCAST_BACKEND setting."""
+    if name == "redis":
+        return RedisBroadcastBackend(redis_url)
+    if name == "memory":
+        return MemoryBroadcastBackend()
+    raise ValueError(f"Unknown broadcast backend: {name}")
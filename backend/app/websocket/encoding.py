@@ -0,0 +1,23 @@
+"""Encoding of WebSocket events.
+
+Each event is encoded exactly once, when it is broadcast. The resulting text is
+what travels over Redis and what every client's writer sends, so no step after
+broadcast_to_space re-serializes it. orjson is used when it is installed.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def encode_message(message: dict) -> str:
+    """Serialize an event to the JSON text sent in a WebSocket frame."""
+    if orjson is not None:
+        return orjson.dumps(message).decode()
+    return json.dumps(message, separators=(",", ":"))
+
+
+def encoder_name() -> str:
+    return "orjson" if orjson is not None else "json"
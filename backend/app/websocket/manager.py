@@ -1,43 +1,205 @@
 from fastapi import WebSocket
-from typing import Dict, Set
-import json
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
 import logging
 
+from app.core import metrics
+from app.core.config import settings
+from app.websocket.backends import BroadcastBackend, MemoryBroadcastBackend
+from app.websocket.encoding import encode_message
+
 logger = logging.getLogger(__name__)
 
+# Close code sent to clients dropped for not keeping up (RFC 6455 "Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Close code sent when a send fails or times out (RFC 6455 "Internal Error")
+SEND_FAILED_CLOSE_CODE = 1011
+
+RESYNC_REQUIRED = encode_message({"type": "resync_required"})
+
+_CLOSE = object()
+
+
+class ClientConnection:
+    """One WebSocket client with a bounded outbound queue and its own writer task.
+
+    Broadcasting only enqueues, so a slow client never delays other clients or
+    the request that produced the event. When the queue overflows the client
+    has missed events: with the "resync" policy its backlog is replaced by a
+    resync_required message, with "drop" the connection is closed.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        space_id: str,
+        on_close: Callable[["ClientConnection"], Awaitable[None]],
+        queue_size: int,
+        send_timeout: float,
+        slow_consumer_policy: str,
+    ):
+        self.websocket = websocket
+        self.space_id = space_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.send_timeout = send_timeout
+        self.slow_consumer_policy = slow_consumer_policy
+        self._on_close = on_close
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    def stop(self):
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._writer = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def enqueue(self, payload: str):
+        """Queue an encoded message without waiting."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._handle_overflow()
+
+    def _handle_overflow(self):
+        dropped = 0
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            dropped += 1
+        metrics.inc("websocket_messages_dropped", dropped + 1)
+        metrics.inc("websocket_slow_consumers")
+        if self.slow_consumer_policy == "drop":
+            logger.warning(f"Closing slow WebSocket client in space {self.space_id}")
+            self.queue.put_nowait(_CLOSE)
+        else:
+            logger.warning(f"WebSocket client in space {self.space_id} fell behind, requesting resync")
+            self.queue.put_nowait(RESYNC_REQUIRED)
+
+    async def _write_loop(self):
+        try:
+            while True:
+                payload = await self.queue.get()
+                if payload is _CLOSE:
+                    self.closed = True
+                    await self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+                    break
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending message, closing WebSocket client in space {self.space_id}: {e!r}")
+            self.closed = True
+            try:
+                await asyncio.wait_for(self.websocket.close(code=SEND_FAILED_CLOSE_CODE), timeout=self.send_timeout)
+            except Exception:
+                # The socket is already broken; the client is dropped either way
+                pass
+        self.closed = True
+        await self._on_close(self)
+
 
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+    """Tracks this worker's WebSocket clients per space.
+
+    Events are published through the broadcast backend, which hands them back
+    to every worker subscribed to the space (including this one). A worker is
+    subscribed to a space while it has at least one client connected to it.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[BroadcastBackend] = None,
+        queue_size: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        slow_consumer_policy: Optional[str] = None,
+    ):
+        self.active_connections: Dict[str, Dict[WebSocket, ClientConnection]] = {}
+        self.backend = backend or MemoryBroadcastBackend()
+        self.queue_size = queue_size or settings.WS_SEND_QUEUE_SIZE
+        self.send_timeout = send_timeout or settings.WS_SEND_TIMEOUT_SECONDS
+        self.slow_consumer_policy = slow_consumer_policy or settings.WS_SLOW_CONSUMER_POLICY
+        self._listeners: List[Callable[[str, dict], Awaitable[None]]] = []
+
+    def add_listener(self, listener: Callable[[str, dict], Awaitable[None]]):
+        """Call listener(space_id, message) for every event before it is published."""
+        self._listeners.append(listener)
 
-    async def connect(self, websocket: WebSocket, space_id: str):
+    def remove_listener(self, listener: Callable[[str, dict], Awaitable[None]]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def start(self):
+        await self.backend.start(self.deliver_local)
+
+    async def stop(self):
+        await self.backend.stop()
+        for clients in self.active_connections.values():
+            for client in clients.values():
+                client.stop()
+        self.active_connections.clear()
+
+    async def connect(self, websocket: WebSocket, space_id: str) -> ClientConnection:
         await websocket.accept()
+        client = ClientConnection(
+            websocket,
+            space_id,
+            on_close=self._client_closed,
+            queue_size=self.queue_size,
+            send_timeout=self.send_timeout,
+            slow_consumer_policy=self.slow_consumer_policy,
+        )
         if space_id not in self.active_connections:
-            self.active_connections[space_id] = set()
-        self.active_connections[space_id].add(websocket)
+            self.active_connections[space_id] = {}
+            await self.backend.subscribe(space_id)
+        self.active_connections[space_id][websocket] = client
+        client.start()
         logger.info(f"Client connected to space {space_id}")
+        return client
 
-    def disconnect(self, websocket: WebSocket, space_id: str):
-        if space_id in self.active_connections:
-            self.active_connections[space_id].discard(websocket)
-            if not self.active_connections[space_id]:
+    async def disconnect(self, websocket: WebSocket, space_id: str):
+        clients = self.active_connections.get(space_id)
+        if clients is not None:
+            client = clients.pop(websocket, None)
+            if client is not None:
+                client.stop()
+            if not clients:
                 del self.active_connections[space_id]
+                await self.backend.unsubscribe(space_id)
         logger.info(f"Client disconnected from space {space_id}")
 
+    async def _client_closed(self, client: ClientConnection):
+        await self.disconnect(client.websocket, client.space_id)
+
     async def broadcast_to_space(self, space_id: str, message: dict):
-        if space_id not in self.active_connections:
-            return
-        
-        dead_connections = set()
-        for connection in self.active_connections[space_id]:
+        # Listeners run first so e.g. cached analytics are stale before clients refetch
+        for listener in self._listeners:
             try:
-                await connection.send_json(message)
+                await listener(str(space_id), message)
             except Exception as e:
-                logger.error(f"Error sending message: {e}")
-                dead_connections.add(connection)
+                logger.error(f"WebSocket event listener failed: {e}")
+        await self.backend.publish(space_id, encode_message(message))
+
+    async def deliver_local(self, space_id: str, payload: str):
+        """Queue an encoded event for the clients connected to this worker."""
+        clients = self.active_connections.get(space_id)
+        if not clients:
+            return
         
-        for dead in dead_connections:
-            self.active_connections[space_id].discard(dead)
+        for client in list(clients.values()):
+            client.enqueue(payload)
+
+    def connection_count(self) -> int:
+        return sum(len(clients) for clients in self.active_connections.values())
+
+    def queue_depths(self) -> list:
+        return [client.depth for clients in self.active_connections.values() for client in clients.values()]
 
     async def send_card_created(self, space_id: str, card: dict, initiated_by: str | None = None):
         await self.broadcast_to_space(space_id, {
@@ -0,0 +1,97 @@
+"""Per-broadcast CPU cost of WebSocket fan-out as the subscriber count grows.
+
+Compares the old path, where every connection ran json.dumps on the event
+(Starlette's send_json), with encoding once through encode_message and
+enqueueing the same text on every client.
+
+    python -m benchmarks.bench_broadcast
+"""
+import asyncio
+import json
+import time
+import uuid
+
+from app.websocket.backends import MemoryBroadcastBackend
+from app.websocket.encoding import encoder_name
+from app.websocket.manager import ConnectionManager
+
+SUBSCRIBER_COUNTS = [1, 10, 50, 200, 1000]
+ROUNDS = 200
+
+
+class NullWebSocket:
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        pass
+
+
+def card_event() -> dict:
+    """A card_updated event shaped like the ones cards.py broadcasts."""
+    return {
+        "type": "card_updated",
+        "card": {
+            "id": str(uuid.uuid4()),
+            "column_id": str(uuid.uuid4()),
+            "name": "Migrate reporting jobs to the new scheduler",
+            "description": "Move the nightly exports and the weekly digest. " * 8,
+            "start_date": "2026-10-01 09:00:00+00:00",
+            "end_date": "2026-10-20 17:00:00+00:00",
+            "location": None,
+            "position": 12,
+            "task_counter": 6,
+            "task_completed_counter": 2,
+            "tags": [
+                {"tag": {"id": str(uuid.uuid4()), "name": name, "color": "#3b82f6"}}
+                for name in ("backend", "ops", "reporting")
+            ],
+            "assignees": [
+                {"id": str(uuid.uuid4()), "username": f"user{i}", "email": f"user{i}@example.com"}
+                for i in range(3)
+            ],
+        },
+        "initiated_by": str(uuid.uuid4()),
+    }
+
+
+def per_connection_dumps(message: dict, subscribers: int) -> float:
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        for _ in range(subscribers):
+            json.dumps(message)
+    return (time.process_time() - start) / ROUNDS
+
+
+async def encode_once(message: dict, subscribers: int) -> float:
+    # Queues are sized so nothing overflows; writers are stopped so only
+    # encoding and enqueueing are measured.
+    manager = ConnectionManager(MemoryBroadcastBackend(), queue_size=ROUNDS + 1)
+    await manager.start()
+    for _ in range(subscribers):
+        client = await manager.connect(NullWebSocket(), "space")
+        client.stop()
+
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        await manager.broadcast_to_space("space", message)
+    elapsed = (time.process_time() - start) / ROUNDS
+    await manager.stop()
+    return elapsed
+
+
+async def main():
+    message = card_event()
+    print(f"encoder: {encoder_name()}, event size: {len(json.dumps(message))} bytes, {ROUNDS} rounds")
+    print(f"{'subscribers':>11} {'per-conn dumps':>16} {'encode once':>13} {'speedup':>8}")
+    for subscribers in SUBSCRIBER_COUNTS:
+        before = per_connection_dumps(message, subscribers)
+        after = await encode_once(message, subscribers)
+        print(
+            f"{subscribers:>11} {before * 1e6:>13.1f} us {after * 1e6:>10.1f} us "
+            f"{before / after if after else float('inf'):>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""Latency of one forecast simulation against a year of throughput history.
+
+The forecast endpoint has a 50 ms budget for the simulation itself; the
+history query is a single aggregate over the daily rollup.
+
+    python -m benchmarks.bench_forecast
+"""
+import time
+
+import numpy as np
+
+from app.services.forecast import DEFAULT_TRIALS, forecast_dates, simulate_completion_days
+
+BUDGET_MS = 50
+HISTORY_DAYS = 365
+REMAINING = [10, 40, 200, 1000]
+TRIALS = [DEFAULT_TRIALS, 50_000]
+ROUNDS = 20
+
+
+def main():
+    rng = np.random.default_rng(11)
+    # A team finishing about three cards on weekdays and almost nothing at weekends
+    weekday = np.arange(HISTORY_DAYS) % 7 < 5
+    history = np.where(weekday, rng.poisson(3.0, HISTORY_DAYS), rng.poisson(0.2, HISTORY_DAYS)).astype(np.int32)
+
+    print(f"{HISTORY_DAYS} days of history, mean {history.mean():.2f} cards/day, budget {BUDGET_MS} ms")
+    print(f"{'trials':>7} {'remaining':>9} {'p50 days':>9} {'p95 days':>9} {'median':>10} {'worst':>10}")
+    over_budget = False
+    for trials in TRIALS:
+        for remaining in REMAINING:
+            timings = []
+            for _ in range(ROUNDS):
+                start = time.perf_counter()
+                days = simulate_completion_days(history, remaining, trials, rng)
+                forecast = forecast_dates(days, np.datetime64("2026-10-16").astype(object))
+                timings.append((time.perf_counter() - start) * 1e3)
+            timings.sort()
+            median, worst = timings[len(timings) // 2], timings[-1]
+            over_budget |= trials == DEFAULT_TRIALS and median > BUDGET_MS
+            print(
+                f"{trials:>7} {remaining:>9} {forecast['p50']['days']:>9} {forecast['p95']['days']:>9} "
+                f"{median:>7.2f} ms {worst:>7.2f} ms"
+            )
+    print("over budget" if over_budget else f"default trials within {BUDGET_MS} ms")
+
+
+if __name__ == "__main__":
+    main()
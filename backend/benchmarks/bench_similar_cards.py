@@ -0,0 +1,112 @@
+"""Cost of one find_similar_cards call as the space grows.
+
+Compares the old path, which loaded every card of the space and ran
+SequenceMatcher against each name, with re-scoring only the trigram
+candidates. The Python side always runs. If BENCH_DATABASE_URL points at a
+Postgres database (asyncpg URL), the KNN candidate query is also timed
+against a temporary table with the same GiST index; nothing persists.
+
+    python -m benchmarks.bench_similar_cards
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_similar_cards
+"""
+import asyncio
+import os
+import random
+import time
+
+from app.services.duplicates import calculate_similarity, rank_similar, MIN_CANDIDATES
+
+CARD_COUNTS = [10_000, 100_000]
+QUERIES = 20
+THRESHOLD = 0.7
+
+VERBS = ["Fix", "Add", "Remove", "Refactor", "Document", "Test", "Migrate", "Review", "Deploy", "Investigate"]
+NOUNS = [
+    "login", "billing", "export", "webhook", "search", "dashboard", "scheduler",
+    "notifications", "permissions", "reporting", "onboarding", "API keys",
+]
+TAILS = ["bug", "flow", "page", "job", "endpoint", "timeout", "for agents", "in staging", "v2", "cleanup"]
+
+
+class BenchCard:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+def card_names(count: int, rng: random.Random) -> list:
+    return [
+        f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(TAILS)} #{rng.randint(1, 5000)}"
+        for _ in range(count)
+    ]
+
+
+def full_scan(name: str, cards: list) -> list:
+    similar = [(card, calculate_similarity(name, card.name)) for card in cards]
+    similar = [item for item in similar if item[1] >= THRESHOLD]
+    similar.sort(key=lambda x: x[1], reverse=True)
+    return similar[:5]
+
+
+def time_python(names: list, queries: list) -> tuple:
+    cards = [BenchCard(name) for name in names]
+    # The database hands back this many nearest names; a slice stands in for them
+    candidates = cards[:MIN_CANDIDATES]
+
+    start = time.perf_counter()
+    for query in queries:
+        full_scan(query, cards)
+    before = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for query in queries:
+        rank_similar(query, candidates, THRESHOLD, 5)
+    after = (time.perf_counter() - start) / len(queries)
+    return before, after
+
+
+async def time_knn(url: str, names: list, queries: list) -> float:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.execute(text("CREATE TEMP TABLE bench_cards (id serial PRIMARY KEY, name text NOT NULL)"))
+            await conn.execute(text("INSERT INTO bench_cards (name) VALUES (:name)"), [{"name": n} for n in names])
+            await conn.execute(text("CREATE INDEX ON bench_cards USING gist (lower(name) gist_trgm_ops)"))
+            await conn.execute(text("ANALYZE bench_cards"))
+
+            knn = text(
+                "SELECT id, name FROM bench_cards ORDER BY lower(name) <-> :name LIMIT :limit"
+            )
+            start = time.perf_counter()
+            for query in queries:
+                await conn.execute(knn, {"name": query.lower(), "limit": MIN_CANDIDATES})
+            return (time.perf_counter() - start) / len(queries)
+    finally:
+        await engine.dispose()
+
+
+async def main():
+    rng = random.Random(7)
+    url = os.environ.get("BENCH_DATABASE_URL")
+    print(f"threshold {THRESHOLD}, {MIN_CANDIDATES} candidates, {QUERIES} queries per size")
+    print(f"{'cards':>8} {'full scan':>12} {'re-score':>11} {'knn query':>12} {'speedup':>8}")
+    for count in CARD_COUNTS:
+        names = card_names(count, rng)
+        queries = rng.sample(names, QUERIES)
+        before, after = time_python(names, queries)
+        knn = await time_knn(url, names, queries) if url else None
+        total = after + (knn or 0)
+        knn_column = f"{knn * 1e3:>9.2f} ms" if knn is not None else f"{'-':>12}"
+        print(
+            f"{count:>8} {before * 1e3:>9.1f} ms {after * 1e3:>8.2f} ms {knn_column} "
+            f"{before / total if total else float('inf'):>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+"""Tests for the single-statement admin dashboard counts"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core import metrics
+from app.core.config import settings
+from app.services import admin_stats
+from app.services.admin_stats import get_system_stats, system_stats_query
+
+NOW = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+
+STATS = {
+    "total_users": 10,
+    "new_users_this_week": 2,
+    "new_users_this_month": 5,
+    "active_users_7_days": 4,
+    "total_spaces": 6,
+    "personal_spaces": 3,
+    "team_spaces": 2,
+    "agent_spaces": 1,
+    "total_cards": 100,
+    "completed_cards": 40,
+    "total_comments": 12,
+}
+
+
+class CountingSession:
+    """Returns STATS as a single row and counts executed statements"""
+
+    def __init__(self):
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        row = SimpleNamespace(_mapping=STATS)
+        return SimpleNamespace(one=lambda: row)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    metrics.reset()
+    admin_stats.clear_cache()
+    yield
+    metrics.reset()
+    admin_stats.clear_cache()
+
+
+class TestSystemStatsQuery:
+    """Test suite for the combined statement"""
+
+    def compile(self) -> str:
+        return str(system_stats_query(NOW).compile(dialect=postgresql.dialect()))
+
+    def test_one_statement_per_table(self):
+        """Each table is aggregated once, with FILTER for the subsets"""
+        sql = self.compile()
+        for table in ("users", "spaces", "cards", "tasks", "comments", "card_history"):
+            assert sql.count(f"FROM {table}") == 1
+        assert sql.count("FILTER (WHERE") == 6
+
+    def test_active_users_from_history(self):
+        """Active users are distinct card history actors of the last week, agents excluded"""
+        sql = self.compile()
+        assert "count(DISTINCT card_history.actor_id) AS active_users_7_days" in sql
+        assert "card_history.created_at >=" in sql
+        assert "card_history.actor_type = %(actor_type_1)s" in sql
+
+    def test_returns_every_field(self):
+        """The row has exactly the SystemStats fields"""
+        from app.api.v1.admin import SystemStats
+        assert set(system_stats_query(NOW).selected_columns.keys()) == set(SystemStats.model_fields)
+
+
+class TestStatsCache:
+    """Test suite for the short-TTL cache"""
+
+    @pytest.mark.asyncio
+    async def test_reused_within_ttl(self, monkeypatch):
+        """A second load within the TTL runs no query"""
+        monkeypatch.setattr(settings, "ADMIN_STATS_CACHE_SECONDS", 30.0)
+        db = CountingSession()
+
+        assert await get_system_stats(db, NOW) == STATS
+        assert await get_system_stats(db, NOW) == STATS
+
+        assert db.statements == 1
+        assert metrics.snapshot()["counters"]["admin_stats_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_expires(self, monkeypatch):
+        """The counts are recomputed once the TTL has passed"""
+        clock = [100.0]
+        monkeypatch.setattr(admin_stats.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(settings, "ADMIN_STATS_CACHE_SECONDS", 30.0)
+        db = CountingSession()
+
+        await get_system_stats(db, NOW)
+        clock[0] += 31
+        await get_system_stats(db, NOW)
+
+        assert db.statements == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_disabled(self, monkeypatch):
+        """refresh bypasses the cache and a zero TTL disables it"""
+        monkeypatch.setattr(settings, "ADMIN_STATS_CACHE_SECONDS", 30.0)
+        db = CountingSession()
+        await get_system_stats(db, NOW)
+        await get_system_stats(db, NOW, refresh=True)
+        assert db.statements == 2
+
+        monkeypatch.setattr(settings, "ADMIN_STATS_CACHE_SECONDS", 0)
+        admin_stats.clear_cache()
+        await get_system_stats(db, NOW)
+        await get_system_stats(db, NOW)
+        assert db.statements == 4
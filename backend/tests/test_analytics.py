@@ -0,0 +1,872 @@
+"""Tests for analytics aggregates"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+
+from app.api.deps import get_current_user
+from app.api.v1.analytics import (
+    get_aging_wip,
+    get_cards_time_in_columns,
+    get_column_stats,
+    get_cumulative_flow,
+    get_space_activity,
+    get_space_cycle_time,
+    get_space_forecast,
+    router,
+    workload_viewer,
+)
+from app.models.analytics import DailyFlowRollup
+from app.models.column import ColumnCategory
+from app.schemas.analytics import TimeInColumnsBatch
+from app.services.analytics import (
+    columnar_timeline,
+    deadline_query,
+    due_timeline_query,
+    activity_entry,
+    activity_query,
+    aging_wip_query,
+    batch_time_in_columns,
+    board_summary_query,
+    bucket_range,
+    cfd_query,
+    columnar_cfd,
+    done_column_ids,
+    flow_row,
+    merge_flow_rows,
+    rollup_upsert,
+    summarize_column,
+    summarize_workload,
+    time_in_columns,
+    wip_limit,
+    workload_query,
+)
+
+
+NOW = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def summary_row(**overrides):
+    row = {
+        "id": uuid.uuid4(),
+        "name": "In Progress",
+        "settings": {},
+        "card_count": 0,
+        "oldest_entered_at": None,
+        "age_percentiles": None,
+    }
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class TestBoardSummaryQuery:
+    """Test suite for the grouped board summary statement"""
+
+    def compile(self) -> str:
+        return str(board_summary_query(uuid.uuid4(), NOW).compile(dialect=postgresql.dialect()))
+
+    def test_single_grouped_statement(self):
+        """Counts and ages for every column come from one GROUP BY"""
+        sql = self.compile()
+        assert "LEFT OUTER JOIN cards" in sql
+        assert "GROUP BY columns.id" in sql
+        assert "ORDER BY columns.position" in sql
+
+    def test_percentiles_share_one_sort(self):
+        """All age percentiles are one ordered-set aggregate call"""
+        sql = self.compile()
+        assert sql.count("percentile_cont") == 1
+        assert "WITHIN GROUP (ORDER BY" in sql
+
+
+class TestWipLimit:
+    """Test suite for reading WIP limits from column settings"""
+
+    def test_configured(self):
+        """A positive integer is the limit"""
+        assert wip_limit({"wip_limit": 3}) == 3
+
+    @pytest.mark.parametrize("settings", [None, {}, {"wip_limit": 0}, {"wip_limit": -1}, {"wip_limit": "3"}, {"wip_limit": True}])
+    def test_not_configured(self, settings):
+        """Missing or invalid values mean no limit"""
+        assert wip_limit(settings) is None
+
+
+class TestSummarizeColumn:
+    """Test suite for formatting summary rows"""
+
+    def test_empty_column(self):
+        """A column without cards has zero counts and no ages"""
+        result = summarize_column(summary_row(), NOW)
+        assert result["card_count"] == 0
+        assert result["oldest_card_age_days"] == 0
+        assert result["median_age_days"] is None
+        assert result["age_percentiles_days"] == {"p50": None, "p85": None, "p95": None}
+        assert result["over_wip_limit"] is False
+
+    def test_ages(self):
+        """Oldest age is whole days, percentiles are rounded days"""
+        result = summarize_column(
+            summary_row(
+                card_count=4,
+                oldest_entered_at=NOW - timedelta(days=9, hours=20),
+                age_percentiles=[2.04, 6.58, 9.12],
+            ),
+            NOW,
+        )
+        assert result["oldest_card_age_days"] == 9
+        assert result["median_age_days"] == 2.0
+        assert result["age_percentiles_days"] == {"p50": 2.0, "p85": 6.6, "p95": 9.1}
+
+    def test_over_wip_limit(self):
+        """Columns holding more cards than their limit are flagged"""
+        over = summarize_column(summary_row(settings={"wip_limit": 3}, card_count=4), NOW)
+        at = summarize_column(summary_row(settings={"wip_limit": 3}, card_count=3), NOW)
+        assert over["wip_limit"] == 3
+        assert over["over_wip_limit"] is True
+        assert at["over_wip_limit"] is False
+
+
+def column(name, position):
+    return SimpleNamespace(id=uuid.uuid4(), name=name, position=position)
+
+
+class TestDoneColumns:
+    """Test suite for picking the columns that count as completed"""
+
+    def test_last_two_and_named(self):
+        """The last two columns and any done-like name are done"""
+        inbox, doing, done, review, archive = (
+            column("Inbox", 0), column("Doing", 1), column("Done", 2), column("Review", 3), column("Later", 4),
+        )
+        assert done_column_ids([inbox, doing, done, review, archive]) == {done.id, review.id, archive.id}
+
+
+class TestTimeInColumns:
+    """Test suite for per-column durations from card transitions"""
+
+    INBOX = uuid.uuid4()
+    DOING = uuid.uuid4()
+    DONE = uuid.uuid4()
+
+    def transition(self, from_column, to_column, hours_ago):
+        return SimpleNamespace(from_column_id=from_column, to_column_id=to_column, at=NOW - timedelta(hours=hours_ago))
+
+    def test_from_creation(self):
+        """Each stay runs from entering a column to leaving it"""
+        times = time_in_columns(
+            [
+                self.transition(None, self.INBOX, 10),
+                self.transition(self.INBOX, self.DOING, 7),
+                self.transition(self.DOING, self.DONE, 2),
+            ],
+            NOW - timedelta(hours=10),
+            self.DONE,
+            NOW,
+        )
+        assert times == {
+            self.INBOX: timedelta(hours=3),
+            self.DOING: timedelta(hours=5),
+            self.DONE: timedelta(hours=2),
+        }
+
+    def test_revisits_accumulate(self):
+        """Returning to a column adds to its total"""
+        times = time_in_columns(
+            [
+                self.transition(None, self.DOING, 6),
+                self.transition(self.DOING, self.INBOX, 4),
+                self.transition(self.INBOX, self.DOING, 3),
+            ],
+            NOW - timedelta(hours=6),
+            self.DOING,
+            NOW,
+        )
+        assert times == {self.DOING: timedelta(hours=5), self.INBOX: timedelta(hours=1)}
+
+    def test_without_creation_transition(self):
+        """Cards without a creation row start in their first source column at created_at"""
+        times = time_in_columns(
+            [self.transition(self.INBOX, self.DOING, 1)],
+            NOW - timedelta(hours=4),
+            self.DOING,
+            NOW,
+        )
+        assert times == {self.INBOX: timedelta(hours=3), self.DOING: timedelta(hours=1)}
+
+    def test_never_moved(self):
+        """A card without transitions has spent its whole life in its column"""
+        assert time_in_columns([], NOW - timedelta(hours=4), self.INBOX, NOW) == {self.INBOX: timedelta(hours=4)}
+
+
+class TestFlowRollup:
+    """Test suite for daily flow rollup increments"""
+
+    SPACE = uuid.uuid4()
+    DOING = uuid.uuid4()
+    DONE = uuid.uuid4()
+    ARCHIVE = uuid.uuid4()
+    DONE_IDS = {DONE, ARCHIVE}
+
+    def test_completion(self):
+        """Entering a done column from an open one is a completion with its cycle time"""
+        row = flow_row(self.SPACE, self.DOING, self.DONE, NOW, NOW - timedelta(hours=5), self.DONE_IDS)
+        assert row["day"] == NOW.date()
+        assert row["arrivals"] == 1
+        assert row["completions"] == 1
+        assert row["timed_completions"] == 1
+        assert row["cycle_time_seconds_sum"] == 5 * 3600
+        assert row["cycle_time_seconds_min"] == row["cycle_time_seconds_max"] == 5 * 3600
+
+    def test_done_to_done_is_not_completion(self):
+        """Archiving a finished card does not count it twice"""
+        row = flow_row(self.SPACE, self.DONE, self.ARCHIVE, NOW, NOW - timedelta(hours=5), self.DONE_IDS)
+        assert row["arrivals"] == 1
+        assert row["completions"] == 0
+        assert row["cycle_time_seconds_min"] is None
+
+    def test_day_is_utc(self):
+        """Moves are bucketed by their UTC date"""
+        late = datetime(2026, 10, 16, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+        row = flow_row(self.SPACE, self.DOING, self.DONE, late, None, self.DONE_IDS)
+        assert row["day"].isoformat() == "2026-10-17"
+
+    def test_untimed_completion(self):
+        """A card without created_at completes but adds no cycle time"""
+        row = flow_row(self.SPACE, self.DOING, self.DONE, NOW, None, self.DONE_IDS)
+        assert row["completions"] == 1
+        assert row["timed_completions"] == 0
+        assert row["cycle_time_seconds_sum"] == 0.0
+
+    def test_merge(self):
+        """Increments for the same day and column are summed"""
+        rows = merge_flow_rows([
+            flow_row(self.SPACE, self.DOING, self.DONE, NOW, NOW - timedelta(hours=2), self.DONE_IDS),
+            flow_row(self.SPACE, self.DOING, self.DONE, NOW, NOW - timedelta(hours=6), self.DONE_IDS),
+            flow_row(self.SPACE, self.DONE, self.DOING, NOW, NOW - timedelta(hours=6), self.DONE_IDS),
+        ])
+        by_column = {row["column_id"]: row for row in rows}
+        assert by_column[self.DONE]["completions"] == 2
+        assert by_column[self.DONE]["timed_completions"] == 2
+        assert by_column[self.DONE]["cycle_time_seconds_sum"] == 8 * 3600
+        assert by_column[self.DONE]["cycle_time_seconds_min"] == 2 * 3600
+        assert by_column[self.DONE]["cycle_time_seconds_max"] == 6 * 3600
+        assert by_column[self.DOING]["arrivals"] == 1
+        assert by_column[self.DOING]["cycle_time_seconds_min"] is None
+
+    def test_upsert_adds_to_existing_totals(self):
+        """Concurrent moves on the same day accumulate instead of overwriting"""
+        row = flow_row(self.SPACE, self.DOING, self.DONE, NOW, NOW, self.DONE_IDS)
+        sql = str(rollup_upsert([row]).compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (space_id, column_id, day) DO UPDATE" in sql
+        assert "completions = (daily_flow_rollups.completions + excluded.completions)" in sql
+        assert "timed_completions = (daily_flow_rollups.timed_completions + excluded.timed_completions)" in sql
+        assert "least(daily_flow_rollups.cycle_time_seconds_min, excluded.cycle_time_seconds_min)" in sql
+
+    def test_rows_outlive_their_column(self):
+        """Deleting a column does not cascade into the space's flow history"""
+        assert not DailyFlowRollup.__table__.c.column_id.foreign_keys
+        assert DailyFlowRollup.__table__.c.space_id.foreign_keys
+
+
+class TestCumulativeFlow:
+    """Test suite for the cumulative flow query and its columnar output"""
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Only members of the space can read its cumulative flow"""
+        db = outsider_session()
+        with pytest.raises(HTTPException) as exc:
+            await get_cumulative_flow(
+                uuid.uuid4(), interval="day", buckets=30, current_user=SimpleNamespace(id=uuid.uuid4()), db=db
+            )
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 1
+
+    def test_bucket_range_days(self):
+        """Day buckets end with today's UTC midnight"""
+        first, last = bucket_range(NOW, "day", 7)
+        assert last == datetime(2026, 10, 16)
+        assert first == datetime(2026, 10, 10)
+
+    def test_bucket_range_hours(self):
+        """Hour buckets end with the current hour"""
+        first, last = bucket_range(NOW + timedelta(minutes=42), "hour", 3)
+        assert (first, last) == (datetime(2026, 10, 16, 10), datetime(2026, 10, 16, 12))
+
+    def test_running_sum_over_deltas(self):
+        """Counts are a running window sum of per-bucket arrival/departure deltas"""
+        first, last = bucket_range(NOW, "day", 7)
+        sql = str(cfd_query(uuid.uuid4(), "day", first, last).compile(dialect=postgresql.dialect()))
+        assert "UNION ALL" in sql
+        assert "generate_series" in sql
+        assert "OVER (PARTITION BY grid.column_id ORDER BY grid.bucket)" in sql
+        assert sql.count("FROM card_transitions") == 2
+
+    def test_columnar(self):
+        """Rows become one bucket list and one count array per column"""
+        todo, done = uuid.uuid4(), uuid.uuid4()
+        days = [datetime(2026, 10, 15), datetime(2026, 10, 16)]
+        rows = [
+            SimpleNamespace(column_id=todo, name="To do", bucket=days[0], cards=3),
+            SimpleNamespace(column_id=todo, name="To do", bucket=days[1], cards=2),
+            SimpleNamespace(column_id=done, name="Done", bucket=days[0], cards=-1),
+            SimpleNamespace(column_id=done, name="Done", bucket=days[1], cards=1),
+        ]
+        result = columnar_cfd(rows)
+        assert result["buckets"] == ["2026-10-15T00:00:00+00:00", "2026-10-16T00:00:00+00:00"]
+        assert result["columns"] == [{"id": str(todo), "name": "To do"}, {"id": str(done), "name": "Done"}]
+        assert result["counts"] == [[3, 2], [0, 1]]
+
+    def test_empty(self):
+        """A space without columns has no buckets"""
+        assert columnar_cfd([]) == {"buckets": [], "columns": [], "counts": []}
+
+
+class TestForecastAccess:
+    """Test suite for access to the delivery forecast"""
+
+    def test_requires_login(self):
+        """The forecast route depends on get_current_user"""
+        route = next(r for r in router.routes if r.path.endswith("/forecast"))
+        assert get_current_user in [d.call for d in route.dependant.dependencies]
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Only members of the space can forecast it"""
+        db = outsider_session()
+        with pytest.raises(HTTPException) as exc:
+            await get_space_forecast(
+                uuid.uuid4(), remaining=None, days=90, trials=1000,
+                current_user=SimpleNamespace(id=uuid.uuid4()), db=db,
+            )
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 1
+
+
+def outsider_session():
+    """Session whose membership lookup finds the space but no membership"""
+    return CannedSession([SimpleNamespace(owner_id=uuid.uuid4(), role=None)])
+
+
+OWNER = SimpleNamespace(id=uuid.uuid4(), is_admin=False)
+
+
+def owner_session(*results):
+    """Session whose membership lookup finds OWNER owning the space, then returns results"""
+    return CannedSession([SimpleNamespace(owner_id=OWNER.id, role=None)], *results)
+
+
+class TestAgingWip:
+    """Test suite for the aging work-in-progress query"""
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Only members of the space can list its aging cards"""
+        db = outsider_session()
+        with pytest.raises(HTTPException) as exc:
+            await get_aging_wip(uuid.uuid4(), unit="day", current_user=SimpleNamespace(id=uuid.uuid4()), db=db)
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 1
+
+    def test_ages_in_whole_units(self):
+        """Ages are floored to the requested unit and start at the first move"""
+        sql = str(aging_wip_query([uuid.uuid4()], NOW, "hour").compile(dialect=postgresql.dialect()))
+        assert "min(card_transitions.at) AS started_at" in sql
+        assert "card_transitions.from_column_id IS NOT NULL" in sql
+        assert "floor(" in sql
+
+
+class Row(tuple):
+    """Result row of select(Card, column_name)"""
+
+    def __new__(cls, card, column_name):
+        return super().__new__(cls, (card, column_name))
+
+    @property
+    def Card(self):
+        return self[0]
+
+
+class CannedResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+    def one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def one(self):
+        return self.rows[0]
+
+    def scalar_one_or_none(self):
+        return self.one_or_none()
+
+    def scalar(self):
+        return self.one_or_none()
+
+
+class CannedSession:
+    """Returns prepared rows for each executed statement, in order"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+        self.info = {}
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return CannedResult(self.results.pop(0))
+
+
+class TestBatchTimeInColumns:
+    """Test suite for time-in-columns over many cards"""
+
+    SPACE = uuid.uuid4()
+    TODO = uuid.uuid4()
+    DOING = uuid.uuid4()
+
+    def card(self, hours_ago, column_id):
+        return SimpleNamespace(
+            id=uuid.uuid4(), name="Card", created_at=NOW - timedelta(hours=hours_ago),
+            column_id=column_id, space_id=self.SPACE,
+        )
+
+    @pytest.mark.asyncio
+    async def test_one_scan_for_all_cards(self):
+        """Cards, transitions and column names are three queries in total"""
+        moved, fresh = self.card(5, self.DOING), self.card(2, self.TODO)
+        transitions = [
+            SimpleNamespace(card_id=moved.id, from_column_id=None, to_column_id=self.TODO, at=NOW - timedelta(hours=5)),
+            SimpleNamespace(card_id=moved.id, from_column_id=self.TODO, to_column_id=self.DOING, at=NOW - timedelta(hours=1)),
+        ]
+        names = [SimpleNamespace(id=self.TODO, name="To do"), SimpleNamespace(id=self.DOING, name="Doing")]
+        db = CannedSession([moved, fresh], transitions, names)
+
+        results, columns = await batch_time_in_columns(db, NOW, card_ids=[moved.id, fresh.id])
+
+        assert len(db.statements) == 3
+        assert columns == {self.TODO: "To do", self.DOING: "Doing"}
+        assert results[0] == (moved, {self.TODO: timedelta(hours=4), self.DOING: timedelta(hours=1)})
+        assert results[1] == (fresh, {self.TODO: timedelta(hours=2)})
+
+    @pytest.mark.asyncio
+    async def test_no_cards(self):
+        """Nothing else is queried when no card matches"""
+        db = CannedSession([])
+        assert await batch_time_in_columns(db, NOW, column_id=self.TODO) == ([], {})
+        assert len(db.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Cards in a space the caller does not belong to are refused before any data is read"""
+        user = SimpleNamespace(id=uuid.uuid4())
+        db = CannedSession([self.SPACE], [SimpleNamespace(owner_id=uuid.uuid4(), role=None)])
+
+        with pytest.raises(HTTPException) as exc:
+            await get_cards_time_in_columns(TimeInColumnsBatch(card_ids=[uuid.uuid4()]), user, db)
+
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 2
+        assert "JOIN cards" in str(db.statements[0].compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_member_gets_times(self):
+        """Members get the breakdown once every space has been checked"""
+        user = SimpleNamespace(id=uuid.uuid4())
+        db = CannedSession([self.SPACE], [SimpleNamespace(owner_id=user.id, role=None)], [])
+
+        result = await get_cards_time_in_columns(TimeInColumnsBatch(column_id=self.TODO), user, db)
+
+        assert result == {"cards": [], "missing": []}
+
+    def test_selector_required(self):
+        """Exactly one of card_ids and column_id must be given"""
+        with pytest.raises(ValidationError):
+            TimeInColumnsBatch()
+        with pytest.raises(ValidationError):
+            TimeInColumnsBatch(card_ids=[uuid.uuid4()], column_id=uuid.uuid4())
+        assert TimeInColumnsBatch(column_id=self.TODO).card_ids is None
+
+    def test_batch_size_limit(self):
+        """Batches are capped at 500 cards"""
+        with pytest.raises(ValidationError):
+            TimeInColumnsBatch(card_ids=[uuid.uuid4() for _ in range(501)])
+
+
+class TestCycleTime:
+    """Test suite for the cycle time endpoint"""
+
+    SPACE = uuid.uuid4()
+
+    async def cycle_time(self, totals):
+        space = SimpleNamespace(id=self.SPACE, name="Board")
+        db = CannedSession([space], [totals])
+        return await get_space_cycle_time.__wrapped__(self.SPACE, days=30, current_user=None, db=db)
+
+    @pytest.mark.asyncio
+    async def test_min_and_max_reported(self):
+        """Timed completions report average, min and max"""
+        totals = SimpleNamespace(
+            completions=2, timed_completions=2, cycle_time_sum=3000.0, cycle_time_min=1000.0, cycle_time_max=2000.0,
+        )
+        response = await self.cycle_time(totals)
+        assert response["average_cycle_time_seconds"] == 1500
+        assert response["min_cycle_time_seconds"] == 1000
+        assert response["max_cycle_time_seconds"] == 2000
+
+    @pytest.mark.asyncio
+    async def test_average_over_timed_completions_only(self):
+        """Untimed completions count as completed but do not pull the average down"""
+        totals = SimpleNamespace(
+            completions=3, timed_completions=2, cycle_time_sum=3000.0, cycle_time_min=1000.0, cycle_time_max=2000.0,
+        )
+        response = await self.cycle_time(totals)
+        assert response["completed_cards"] == 3
+        assert response["average_cycle_time_seconds"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_untimed_completions_counted(self):
+        """Completions of cards without a creation time have no cycle time to report"""
+        totals = SimpleNamespace(
+            completions=3, timed_completions=0, cycle_time_sum=0.0, cycle_time_min=None, cycle_time_max=None,
+        )
+        response = await self.cycle_time(totals)
+        assert response["completed_cards"] == 3
+        assert response["average_cycle_time_seconds"] is None
+
+
+class TestColumnStats:
+    """Test suite for per-column statistics"""
+
+    def column(self):
+        return SimpleNamespace(id=uuid.uuid4(), space_id=uuid.uuid4(), name="Doing")
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Only members of the column's space can read its stats"""
+        column = self.column()
+        db = CannedSession([column], [SimpleNamespace(owner_id=uuid.uuid4(), role=None)])
+        with pytest.raises(HTTPException) as exc:
+            await get_column_stats(column.id, current_user=SimpleNamespace(id=uuid.uuid4()), db=db)
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_throughput_from_transitions(self):
+        """Weekly throughput counts transitions out of the column"""
+        column = self.column()
+        card = SimpleNamespace(column_entered_at=NOW - timedelta(days=2))
+        db = CannedSession([column], [SimpleNamespace(owner_id=OWNER.id, role=None)], [card], [4])
+
+        stats = await get_column_stats(column.id, current_user=OWNER, db=db)
+
+        sql = str(db.statements[3].compile(dialect=postgresql.dialect()))
+        assert "FROM card_transitions" in sql
+        assert "card_transitions.from_column_id =" in sql
+        assert stats["weekly_throughput"] == 4
+        assert stats["card_count"] == 1
+
+
+class TestWorkload:
+    """Test suite for the grouped user workload"""
+
+    ALICE = uuid.uuid4()
+    BOB = uuid.uuid4()
+    SPACE = uuid.uuid4()
+
+    def row(self, user_id, column_name, category, card_count, overdue=0, due_soon=0, space_id=None):
+        return SimpleNamespace(
+            user_id=user_id,
+            space_id=space_id or self.SPACE,
+            space_name="Board",
+            column_name=column_name,
+            category=category,
+            card_count=card_count,
+            overdue=overdue,
+            due_soon=due_soon,
+        )
+
+    def test_single_grouped_statement(self):
+        """Counts, overdue and due-soon come from one grouped query"""
+        sql = str(workload_query([self.ALICE], NOW, 7).compile(dialect=postgresql.dialect()))
+        assert sql.count("SELECT") == 1
+        assert "FILTER (WHERE" in sql
+        assert "GROUP BY card_assignees.user_id" in sql
+        assert "cards.end_date <" in sql
+
+    def test_limited_to_viewer_spaces(self):
+        """With a viewer only spaces the viewer belongs to are counted"""
+        viewer = uuid.uuid4()
+        statement = workload_query([self.ALICE], NOW, 7, viewer_id=viewer)
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "JOIN space_members ON space_members.space_id = spaces.id AND space_members.user_id = " in sql
+        assert viewer in statement.compile().params.values()
+
+    def test_admin_sees_every_space(self):
+        """Admins are not restricted to their own spaces"""
+        assert workload_viewer(SimpleNamespace(id=self.ALICE, is_admin=True)) is None
+        assert workload_viewer(SimpleNamespace(id=self.ALICE, is_admin=False)) == self.ALICE
+
+    def test_folded_per_space_and_category(self):
+        """Rows are summed per user, space, column name and category"""
+        other_space = uuid.uuid4()
+        rows = [
+            self.row(self.ALICE, "Doing", ColumnCategory.IN_PROGRESS, 3, overdue=1, due_soon=1),
+            self.row(self.ALICE, "Review", ColumnCategory.REVIEW, 2, due_soon=2),
+            self.row(self.ALICE, "Doing", ColumnCategory.IN_PROGRESS, 1, space_id=other_space),
+            self.row(self.BOB, "Done", ColumnCategory.ARCHIVE, 4),
+        ]
+
+        workloads = summarize_workload(rows, [self.ALICE, self.BOB])
+
+        alice = workloads[self.ALICE]
+        assert (alice["total_assigned"], alice["overdue"], alice["due_soon"]) == (6, 1, 3)
+        assert [s["card_count"] for s in alice["by_space"]] == [5, 1]
+        assert alice["by_space"][0]["by_column"] == {"Doing": 3, "Review": 2}
+        assert alice["by_space"][0]["by_category"] == {"in_progress": 3, "review": 2}
+        assert workloads[self.BOB]["by_space"][0]["by_category"] == {"archive": 4}
+
+    def test_users_without_cards(self):
+        """Requested users with no assignments get an empty workload"""
+        workloads = summarize_workload([], [self.ALICE])
+        assert workloads[self.ALICE] == {
+            "user_id": str(self.ALICE),
+            "total_assigned": 0,
+            "overdue": 0,
+            "due_soon": 0,
+            "by_space": [],
+        }
+
+
+class TestActivityFeed:
+    """Test suite for the merged, keyset-paginated activity feed"""
+
+    SPACE = uuid.uuid4()
+
+    def compile(self, **kwargs) -> str:
+        return str(activity_query(self.SPACE, 20, **kwargs).compile(dialect=postgresql.dialect()))
+
+    def entry(self, type="card_change", minutes_ago=0):
+        return SimpleNamespace(
+            type=type,
+            id=uuid.uuid4(),
+            card_id=uuid.uuid4(),
+            created_at=NOW - timedelta(minutes=minutes_ago),
+            action="commented" if type == "comment" else "moved",
+            actor_type="user",
+            actor_id="user-1",
+            actor_name="Alice",
+            changes=None if type == "comment" else {"from_column": "a", "to_column": "b"},
+            content_preview="Looks good" if type == "comment" else None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Only members of the space can read its activity"""
+        from fastapi import Response
+
+        db = outsider_session()
+        with pytest.raises(HTTPException) as exc:
+            await get_space_activity(
+                self.SPACE, Response(), limit=20, cursor=None, since=None, actor_id=None, types=None,
+                current_user=SimpleNamespace(id=uuid.uuid4()), db=db,
+            )
+        assert exc.value.status_code == 403
+        assert len(db.statements) == 1
+
+    def test_single_union_all(self):
+        """History and comments are merged by one UNION ALL ordered by (created_at, id)"""
+        sql = self.compile()
+        assert sql.count("UNION ALL") == 1
+        assert "ORDER BY activity.created_at DESC, activity.id DESC" in sql
+        assert "comments.is_deleted IS NOT true" in sql
+
+    def test_keyset_seek_in_each_branch(self):
+        """The cursor is applied inside both branches, before their own LIMIT"""
+        sql = self.compile(before=(NOW, uuid.uuid4()))
+        assert "(card_history.created_at, card_history.id) <" in sql
+        assert "(comments.created_at, comments.id) <" in sql
+        assert sql.count("LIMIT") == 3
+        assert "OFFSET" not in sql
+
+    def test_type_filter_drops_branch(self):
+        """Filtering to one type queries only that table"""
+        sql = self.compile(types={"comment"})
+        assert "UNION ALL" not in sql
+        assert "card_history" not in sql
+
+    def test_since_and_actor_filters(self):
+        """since and actor_id narrow both branches"""
+        sql = self.compile(since=NOW, actor_id="user-1")
+        assert "card_history.created_at >=" in sql
+        assert "comments.created_at >=" in sql
+        assert "card_history.actor_id =" in sql
+        assert "CAST(comments.user_id AS VARCHAR) =" in sql
+
+    def test_entries(self):
+        """Comments carry a preview, card changes their changes"""
+        change, comment = activity_entry(self.entry()), activity_entry(self.entry("comment"))
+        assert change["type"] == "card_change"
+        assert change["changes"] == {"from_column": "a", "to_column": "b"}
+        assert "content_preview" not in change
+        assert comment["content_preview"] == "Looks good"
+        assert "changes" not in comment
+
+    @pytest.mark.asyncio
+    async def test_cursor_round_trip(self):
+        """A full page returns a cursor that seeks past its last entry"""
+        from fastapi import Response
+        from app.api.v1.analytics import get_space_activity
+        from app.core.pagination import decode_cursor
+
+        rows = [self.entry(minutes_ago=1), self.entry("comment", minutes_ago=2)]
+        db = owner_session(rows, [])
+        response = Response()
+
+        page = await get_space_activity(
+            self.SPACE, response, limit=2, cursor=None, since=None, actor_id=None,
+            types=None, current_user=OWNER, db=db,
+        )
+        cursor = response.headers["X-Next-Cursor"]
+        assert decode_cursor(cursor) == {"created_at": rows[1].created_at.isoformat(), "id": str(rows[1].id)}
+        assert page["count"] == 2
+
+        response = Response()
+        page = await get_space_activity(
+            self.SPACE, response, limit=2, cursor=cursor, since=None, actor_id=None,
+            types=None, current_user=OWNER, db=db,
+        )
+        assert page["count"] == 0
+        assert "X-Next-Cursor" not in response.headers
+        params = db.statements[2].compile().params
+        assert rows[1].id in params.values()
+
+    @pytest.mark.asyncio
+    async def test_unknown_type_rejected(self):
+        """Only card_change and comment can be filtered on"""
+        from fastapi import HTTPException, Response
+        from app.api.v1.analytics import get_space_activity
+
+        with pytest.raises(HTTPException) as exc:
+            await get_space_activity(
+                self.SPACE, Response(), limit=20, cursor=None, since=None, actor_id=None,
+                types=["moved"], current_user=OWNER, db=owner_session(),
+            )
+        assert exc.value.status_code == 400
+
+
+class TestDeadlines:
+    """Test suite for overdue, upcoming and due-date timeline queries"""
+
+    SPACE = uuid.uuid4()
+
+    def row(self, hours_from_now, column_name="Doing"):
+        card = SimpleNamespace(
+            id=uuid.uuid4(),
+            name="Ship it",
+            end_date=NOW + timedelta(hours=hours_from_now),
+            assignees=[SimpleNamespace(username="alice")],
+            tags=[],
+        )
+        return Row(card, column_name)
+
+    def test_deadline_query_uses_partial_index(self):
+        """Cards without an end date or in archive columns are excluded"""
+        sql = str(deadline_query(self.SPACE, due_until=NOW, after=(NOW, uuid.uuid4())).compile(dialect=postgresql.dialect()))
+        assert "cards.end_date IS NOT NULL" in sql
+        assert "columns.category !=" in sql
+        assert "(cards.end_date, cards.id) >" in sql
+        assert sql.endswith("ORDER BY cards.end_date, cards.id")
+
+    def test_timeline_single_grouped_query(self):
+        """Counts per UTC day come from one GROUP BY over the range"""
+        sql = str(due_timeline_query(self.SPACE, NOW.date(), NOW.date()).compile(dialect=postgresql.dialect()))
+        assert sql.count("SELECT") == 1
+        assert "GROUP BY date(timezone(" in sql
+
+    def test_timeline_zero_filled(self):
+        """Every day in the range is reported, in order"""
+        start = NOW.date()
+        rows = [SimpleNamespace(day=start + timedelta(days=2), cards=3)]
+        timeline = columnar_timeline(rows, start, start + timedelta(days=3))
+        assert timeline["counts"] == [0, 0, 3, 0]
+        assert timeline["days"][0] == start.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_overdue_page_with_cursor(self, monkeypatch):
+        """A full page sets X-Next-Cursor; unrequested relationships are omitted"""
+        from fastapi import Response
+        from app.api.v1 import analytics as api
+        from app.core.pagination import decode_cursor, encode_cursor
+
+        rows = [self.row(-30), self.row(-5)]
+        db = owner_session(rows)
+        response = Response()
+        cursor = encode_cursor({"end_date": (NOW - timedelta(days=5)).isoformat(), "id": str(uuid.uuid4())})
+
+        page = await api.get_overdue_cards(
+            self.SPACE, response, limit=2, cursor=cursor, fields="", current_user=OWNER, db=db,
+        )
+
+        assert len(db.statements) == 2
+        assert decode_cursor(response.headers["X-Next-Cursor"])["id"] == str(rows[1].Card.id)
+        assert page["overdue_count"] == 2
+        assert page["cards"][0]["days_overdue"] >= 1
+        assert "assignees" not in page["cards"][0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_fields_rejected(self):
+        """Only assignees and tags can be loaded"""
+        from fastapi import HTTPException, Response
+        from app.api.v1 import analytics as api
+
+        with pytest.raises(HTTPException) as exc:
+            await api.get_upcoming_deadlines(
+                self.SPACE, Response(), days=7, limit=None, cursor=None, fields="creator",
+                current_user=OWNER, db=owner_session(),
+            )
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_non_member_rejected(self):
+        """Overdue and upcoming cards are only listed for members of the space"""
+        from fastapi import Response
+        from app.api.v1 import analytics as api
+
+        for call in (
+            lambda db, user: api.get_overdue_cards(
+                self.SPACE, Response(), limit=None, cursor=None, fields=None, current_user=user, db=db,
+            ),
+            lambda db, user: api.get_upcoming_deadlines(
+                self.SPACE, Response(), days=7, limit=None, cursor=None, fields=None,
+                current_user=user, db=db,
+            ),
+        ):
+            db = outsider_session()
+            with pytest.raises(HTTPException) as exc:
+                await call(db, SimpleNamespace(id=uuid.uuid4()))
+            assert exc.value.status_code == 403
+            assert len(db.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_timeline_range_limited(self):
+        """Ranges longer than a year are rejected"""
+        from fastapi import HTTPException
+        from app.api.v1 import analytics as api
+
+        with pytest.raises(HTTPException) as exc:
+            await api.get_due_timeline.__wrapped__(
+                self.SPACE, start=NOW.date(), end=NOW.date() + timedelta(days=400),
+                current_user=None, db=CannedSession(),
+            )
+        assert exc.value.status_code == 400
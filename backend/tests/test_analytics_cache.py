@@ -0,0 +1,355 @@
+"""Tests for the event-invalidated analytics response cache"""
+import inspect
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1 import analytics as analytics_api
+from app.api.v1 import columns as columns_api
+from app.core import metrics
+from app.models.space import MemberRole
+from app.schemas.column import ColumnUpdate
+from app.services import analytics_cache as cache_module
+from app.services.analytics_cache import AnalyticsCache, DisabledAnalyticsCache
+from app.services.authorization import MEMO_KEY, Membership, membership_cache
+from app.websocket.backends import MemoryBroadcastBackend
+from app.websocket.manager import ConnectionManager
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class Counter:
+    """Compute function that returns how often it was called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"calls": self.calls}
+
+
+class TestMemoryCache:
+    """Test suite for the in-process tier"""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        """The second request with the same parameters is served from the cache"""
+        cache, compute = AnalyticsCache(), Counter()
+
+        first = await cache.get_or_compute("space-1", "summary", {"days": 30}, compute)
+        second = await cache.get_or_compute("space-1", "summary", {"days": 30}, compute)
+
+        assert first == second == {"calls": 1}
+        counters = metrics.snapshot()["counters"]
+        assert counters["analytics_cache_misses"] == 1
+        assert counters["analytics_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_parameters_and_endpoints_keyed_separately(self):
+        """Different parameters, endpoints or spaces never share an entry"""
+        cache, compute = AnalyticsCache(), Counter()
+
+        await cache.get_or_compute("space-1", "throughput", {"days": 30}, compute)
+        await cache.get_or_compute("space-1", "throughput", {"days": 7}, compute)
+        await cache.get_or_compute("space-1", "cycle_time", {"days": 30}, compute)
+        await cache.get_or_compute("space-2", "throughput", {"days": 30}, compute)
+
+        assert compute.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_evicted(self):
+        """Past max_entries the least recently read entry is dropped"""
+        cache, compute = AnalyticsCache(max_entries=2), Counter()
+        await cache.get_or_compute("space-1", "a", {}, compute)
+        await cache.get_or_compute("space-1", "b", {}, compute)
+        await cache.get_or_compute("space-1", "a", {}, compute)
+
+        await cache.get_or_compute("space-1", "c", {}, compute)
+        await cache.get_or_compute("space-1", "a", {}, compute)
+        await cache.get_or_compute("space-1", "b", {}, compute)
+
+        assert compute.calls == 4
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_recomputed(self, monkeypatch):
+        """Entries are not served past their TTL"""
+        clock = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache, compute = AnalyticsCache(ttl_seconds=60), Counter()
+
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        clock[0] += 59
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        clock[0] += 2
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+
+        assert compute.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self):
+        """A failing computation is retried on the next request"""
+        cache = AnalyticsCache()
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await cache.get_or_compute("space-1", "summary", {}, fail)
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self):
+        """DisabledAnalyticsCache passes every request through"""
+        cache, compute = DisabledAnalyticsCache(), Counter()
+
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+
+        assert compute.calls == 2
+
+
+class TestInvalidation:
+    """Test suite for event-driven invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_card_event_invalidates_space(self):
+        """A card_moved event drops the space's entries but not other spaces'"""
+        cache, compute = AnalyticsCache(), Counter()
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        await cache.get_or_compute("space-2", "summary", {}, compute)
+
+        await cache.on_event("space-1", {"type": "card_moved"})
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        await cache.get_or_compute("space-2", "summary", {}, compute)
+
+        assert compute.calls == 3
+        assert metrics.snapshot()["counters"]["analytics_cache_invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_notification_does_not_invalidate(self):
+        """Events that do not change the board keep the cache"""
+        cache, compute = AnalyticsCache(), Counter()
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+
+        await cache.on_event("space-1", {"type": "notification"})
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_listener_runs_before_publish(self):
+        """The cache is stale before any client is told about the move"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        cache, compute = AnalyticsCache(), Counter()
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        seen = []
+
+        async def publish(space_id, payload):
+            seen.append(await cache.get_or_compute("space-1", "summary", {}, compute))
+
+        manager.backend.publish = publish
+        manager.add_listener(cache.on_event)
+        await manager.send_card_moved("space-1", "card-1", "column-1", "column-2", 0)
+
+        assert seen == [{"calls": 2}]
+
+    @pytest.mark.asyncio
+    async def test_failing_listener_does_not_block_broadcast(self):
+        """A listener error is logged and the event is still published"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        published = []
+
+        async def broken(space_id, message):
+            raise RuntimeError("boom")
+
+        async def publish(space_id, payload):
+            published.append(space_id)
+
+        manager.backend.publish = publish
+        manager.add_listener(broken)
+        await manager.send_card_deleted("space-1", "card-1", "column-1")
+
+        assert published == ["space-1"]
+
+
+class TestRedisCache:
+    """Test suite for the shared Redis tier"""
+
+    @pytest.fixture
+    def server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeServer()
+
+    def worker(self, server):
+        import fakeredis
+        return AnalyticsCache(redis_client=fakeredis.FakeAsyncRedis(server=server))
+
+    @pytest.mark.asyncio
+    async def test_entry_shared_across_workers(self, server):
+        """A response computed by one worker is served to another"""
+        first, second, compute = self.worker(server), self.worker(server), Counter()
+
+        await first.get_or_compute("space-1", "summary", {"days": 30}, compute)
+        value = await second.get_or_compute("space-1", "summary", {"days": 30}, compute)
+
+        assert value == {"calls": 1}
+        assert metrics.snapshot()["counters"]["analytics_cache_redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self, server):
+        """An event handled by one worker invalidates every worker's entries"""
+        first, second, compute = self.worker(server), self.worker(server), Counter()
+        await first.get_or_compute("space-1", "summary", {}, compute)
+        await second.get_or_compute("space-1", "summary", {}, compute)
+
+        await first.on_event("space-1", {"type": "column_updated"})
+        value = await second.get_or_compute("space-1", "summary", {}, compute)
+
+        assert value == {"calls": 2}
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_computes_directly(self):
+        """When Redis is down requests are computed without the cache"""
+        class DownRedis:
+            async def get(self, key):
+                raise ConnectionError("down")
+
+        cache, compute = AnalyticsCache(redis_client=DownRedis()), Counter()
+
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+        await cache.get_or_compute("space-1", "summary", {}, compute)
+
+        assert compute.calls == 2
+        assert metrics.snapshot()["counters"]["analytics_cache_errors"] == 2
+
+
+class MembershipSession:
+    """Session whose only query is the membership lookup"""
+
+    def __init__(self, owner_id, role=None):
+        self.row = SimpleNamespace(owner_id=owner_id, role=role)
+        self.info = {}
+
+    async def execute(self, statement):
+        return SimpleNamespace(one_or_none=lambda: self.row)
+
+
+class TestCachedEndpoint:
+    """Test suite for the cached() endpoint decorator"""
+
+    SPACE_ID = uuid.uuid4()
+
+    @pytest.fixture(autouse=True)
+    def memory_cache(self, monkeypatch):
+        membership_cache.clear()
+        monkeypatch.setattr(analytics_api, "analytics_cache", AnalyticsCache())
+        yield
+        membership_cache.clear()
+
+    def endpoint(self):
+        counter = Counter()
+
+        @analytics_api.cached("probe")
+        async def probe(space_id, days: int = 30, current_user=None, db=None):
+            return await counter()
+
+        return probe, counter
+
+    @pytest.mark.asyncio
+    async def test_members_share_cached_response(self):
+        """A second member's request is served from the cache"""
+        probe, counter = self.endpoint()
+        owner, member = SimpleNamespace(id=uuid.uuid4()), SimpleNamespace(id=uuid.uuid4())
+
+        await probe(self.SPACE_ID, days=30, current_user=owner, db=MembershipSession(owner.id))
+        value = await probe(
+            self.SPACE_ID, days=30, current_user=member, db=MembershipSession(uuid.uuid4(), MemberRole.MEMBER)
+        )
+
+        assert value == {"calls": 1}
+
+    @pytest.mark.asyncio
+    async def test_cached_response_not_served_to_outsider(self):
+        """A non-member gets 403 even when the response is cached"""
+        probe, counter = self.endpoint()
+        owner, outsider = SimpleNamespace(id=uuid.uuid4()), SimpleNamespace(id=uuid.uuid4())
+        await probe(self.SPACE_ID, days=30, current_user=owner, db=MembershipSession(owner.id))
+
+        with pytest.raises(HTTPException) as exc:
+            await probe(self.SPACE_ID, days=30, current_user=outsider, db=MembershipSession(owner.id))
+
+        assert exc.value.status_code == 403
+        assert counter.calls == 1
+
+    def test_every_cached_endpoint_requires_login(self):
+        """The membership check needs current_user on every decorated space endpoint"""
+        for route in analytics_api.router.routes:
+            if getattr(route.endpoint, "__wrapped__", None) is not None:
+                assert "current_user" in inspect.signature(route.endpoint).parameters, route.path
+
+
+class ColumnSession:
+    """Session holding one column, with the caller's membership already memoized"""
+
+    def __init__(self, column, user):
+        self.column = column
+        self.info = {MEMO_KEY: {(column.space_id, user.id): Membership(True, MemberRole.OWNER)}}
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalar_one_or_none=lambda: self.column)
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+    async def delete(self, obj):
+        pass
+
+
+class TestColumnInvalidation:
+    """Test suite for column changes, which publish no ws_manager events"""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = AnalyticsCache()
+        monkeypatch.setattr(columns_api, "analytics_cache", cache)
+        return cache
+
+    async def cached_summary(self, cache, space_id):
+        await cache.get_or_compute(space_id, "summary", {}, Counter())
+        return len(cache)
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates(self, cache):
+        """Renaming, reordering or changing a WIP limit drops the space's cached analytics"""
+        user = SimpleNamespace(id=uuid.uuid4())
+        column = SimpleNamespace(id=uuid.uuid4(), space_id=uuid.uuid4(), name="Doing")
+        assert await self.cached_summary(cache, column.space_id) == 1
+
+        await columns_api.update_column(
+            column.id, ColumnUpdate(name="Review"), current_user=user, db=ColumnSession(column, user),
+        )
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self, cache):
+        """Deleting a column drops the space's cached analytics"""
+        user = SimpleNamespace(id=uuid.uuid4())
+        column = SimpleNamespace(id=uuid.uuid4(), space_id=uuid.uuid4())
+        await self.cached_summary(cache, column.space_id)
+
+        await columns_api.delete_column(column.id, current_user=user, db=ColumnSession(column, user))
+
+        assert len(cache) == 0
@@ -0,0 +1,279 @@
+"""Tests for the authenticated-user and API key caches"""
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_actor_info, get_current_user
+from app.core import cache as cache_module
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.security import create_access_token, hash_api_key
+from app.models.user import User
+from app.services.auth_cache import (
+    APIKeyUsage,
+    api_key_cache,
+    api_key_usage,
+    get_user,
+    invalidate_api_key,
+    invalidate_user,
+    user_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    metrics.reset()
+    user_cache.clear()
+    api_key_cache.clear()
+    api_key_usage._pending.clear()
+    yield
+    metrics.reset()
+    user_cache.clear()
+    api_key_cache.clear()
+    api_key_usage._pending.clear()
+
+
+def make_user(**overrides) -> User:
+    values = {
+        "id": uuid.uuid4(),
+        "email": "alice@example.com",
+        "username": "alice",
+        "password_hash": "hash",
+        "language": "en",
+        "settings": {"theme": "dark"},
+        "is_active": True,
+        "is_admin": False,
+        "is_banned": False,
+        "banned_at": None,
+        "failed_login_count": 0,
+        "locked_until": None,
+        "created_at": None,
+    }
+    values.update(overrides)
+    return User(**values)
+
+
+def session_returning(user: User, key_row=None):
+    """A real AsyncSession whose queries return user (or key_row) and are counted"""
+    db = AsyncSession()
+    db.queries = 0
+
+    async def execute(statement, *args, **kwargs):
+        db.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: user, one_or_none=lambda: key_row)
+
+    db.execute = execute
+    return db
+
+
+class TestTTLCache:
+    """Test suite for the generic LRU + TTL cache"""
+
+    def test_hit_and_miss_counted(self):
+        """Lookups are counted as <name>_cache_hits and _misses"""
+        cache = TTLCache("things", max_entries=10, ttl_seconds=30)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        counters = metrics.snapshot()["counters"]
+        assert counters["things_cache_hits"] == counters["things_cache_misses"] == 1
+
+    def test_expiry(self, monkeypatch):
+        """Entries are dropped once their TTL has passed"""
+        clock = [0.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: clock[0])
+        cache = TTLCache("things", max_entries=10, ttl_seconds=30)
+        cache.set("a", 1)
+        clock[0] = 31
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first"""
+        cache = TTLCache("things", max_entries=2, ttl_seconds=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_disabled(self):
+        """A zero TTL stores nothing"""
+        cache = TTLCache("things", max_entries=10, ttl_seconds=0)
+        cache.set("a", 1)
+        assert len(cache) == 0
+
+
+class TestUserCache:
+    """Test suite for get_current_user's user lookups"""
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_query(self):
+        """The users SELECT runs once; later requests attach the cached user"""
+        user = make_user()
+        token = create_access_token({"sub": str(user.id)})
+        first, second = session_returning(user), session_returning(user)
+
+        await get_current_user(token, None, first)
+        cached = await get_current_user(token, None, second)
+
+        assert (first.queries, second.queries) == (1, 0)
+        assert cached.id == user.id and cached.username == "alice"
+        assert cached in second and not second.dirty
+        counters = metrics.snapshot()["counters"]
+        assert counters["auth_user_queries"] == 1
+        assert counters["auth_user_cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_changes_do_not_leak(self):
+        """Each request gets its own copy, including mutable JSON values"""
+        user = make_user()
+        await get_user(session_returning(user), user.id)
+
+        mine = await get_user(AsyncSession(), user.id)
+        mine.settings["theme"] = "light"
+        mine.username = "mallory"
+
+        theirs = await get_user(AsyncSession(), user.id)
+        assert theirs.settings == {"theme": "dark"}
+        assert theirs.username == "alice"
+
+    @pytest.mark.asyncio
+    async def test_ban_takes_effect_after_invalidation(self):
+        """Invalidating a user makes the next request read the ban"""
+        user = make_user()
+        token = create_access_token({"sub": str(user.id)})
+        await get_current_user(token, None, session_returning(user))
+
+        invalidate_user(user.id)
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(token, None, session_returning(make_user(id=user.id, is_banned=True)))
+
+        assert exc.value.status_code == 403
+        assert metrics.snapshot()["counters"]["auth_user_cache_invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_user_not_cached(self):
+        """Unknown users are looked up again on every request"""
+        user_id = uuid.uuid4()
+        token = create_access_token({"sub": str(user_id)})
+        db = session_returning(None)
+
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await get_current_user(token, None, db)
+
+        assert db.queries == 2
+
+
+class TestAPIKeyCache:
+    """Test suite for API key resolution"""
+
+    RAW_KEY = "kb_test_key"
+
+    def key_row(self, user):
+        return SimpleNamespace(id=uuid.uuid4(), user_id=user.id)
+
+    @pytest.mark.asyncio
+    async def test_cached_key_needs_no_query(self):
+        """Once resolved, a key and its owner come from the caches"""
+        user = make_user()
+        row = self.key_row(user)
+        first = session_returning(user, row)
+        await get_current_user(None, self.RAW_KEY, first)
+
+        second = session_returning(user, row)
+        actor = await get_actor_info(None, self.RAW_KEY, second)
+
+        assert first.queries == 2
+        assert second.queries == 0
+        assert actor.is_agent and actor.user.id == user.id
+        assert not second.dirty and not second.new
+
+    @pytest.mark.asyncio
+    async def test_use_recorded_without_commit(self):
+        """Requests only record last use in memory"""
+        user = make_user()
+        row = self.key_row(user)
+        await get_current_user(None, self.RAW_KEY, session_returning(user, row))
+        assert row.id in api_key_usage._pending
+
+    @pytest.mark.asyncio
+    async def test_revoked_key_rejected(self):
+        """After invalidation the key is looked up again and rejected"""
+        user = make_user()
+        await get_current_user(None, self.RAW_KEY, session_returning(user, self.key_row(user)))
+
+        invalidate_api_key(hash_api_key(self.RAW_KEY))
+        with pytest.raises(HTTPException) as exc:
+            await get_actor_info(None, self.RAW_KEY, session_returning(user, None))
+        assert exc.value.status_code == 401
+
+
+class FakeSessionMaker:
+    """Session factory recording executed statements"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.statements = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.statements.append(statement)
+
+    async def commit(self):
+        pass
+
+
+class TestAPIKeyUsage:
+    """Test suite for coalesced last_used updates"""
+
+    NOW = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_latest_use_kept(self):
+        """Repeated use of a key keeps only its latest time"""
+        usage, key_id = APIKeyUsage(FakeSessionMaker()), uuid.uuid4()
+        usage.touch(key_id, self.NOW)
+        usage.touch(key_id, self.NOW - timedelta(seconds=5))
+        usage.touch(key_id, self.NOW + timedelta(seconds=5))
+        assert usage._pending == {key_id: self.NOW + timedelta(seconds=5)}
+
+    @pytest.mark.asyncio
+    async def test_flush_is_one_update(self):
+        """All pending keys are written by a single UPDATE ... FROM VALUES"""
+        session_maker = FakeSessionMaker()
+        usage = APIKeyUsage(session_maker)
+        for _ in range(3):
+            usage.touch(uuid.uuid4(), self.NOW)
+
+        assert await usage.flush() == 3
+        assert len(session_maker.statements) == 1
+        sql = str(session_maker.statements[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE api_keys SET last_used=greatest(")
+        assert "FROM (VALUES" in sql
+        assert len(usage) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_retried(self):
+        """Pending uses survive a failed flush"""
+        usage, key_id = APIKeyUsage(FakeSessionMaker(fail=True)), uuid.uuid4()
+        usage.touch(key_id, self.NOW)
+
+        assert await usage.flush() == 0
+        assert usage._pending == {key_id: self.NOW}
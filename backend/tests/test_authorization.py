@@ -0,0 +1,146 @@
+"""Tests for the shared space membership checks"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.models.space import MemberRole
+from app.services.authorization import (
+    get_membership,
+    invalidate_membership,
+    membership_cache,
+    membership_query,
+    verify_space_access,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    metrics.reset()
+    membership_cache.clear()
+    yield
+    metrics.reset()
+    membership_cache.clear()
+
+
+def session_returning(row):
+    """A real AsyncSession whose queries return row and are counted"""
+    db = AsyncSession()
+    db.queries = 0
+
+    async def execute(statement, *args, **kwargs):
+        db.queries += 1
+        return SimpleNamespace(one_or_none=lambda: row)
+
+    db.execute = execute
+    return db
+
+
+class TestMembershipQuery:
+    """Test suite for the membership lookup statement"""
+
+    def test_single_outer_join_on_keys(self):
+        """One spaces row outer-joined to the user's space_members row"""
+        sql = str(membership_query(uuid.uuid4(), uuid.uuid4()).compile(dialect=postgresql.dialect()))
+        assert sql.count("SELECT") == 1
+        assert "LEFT OUTER JOIN space_members ON space_members.space_id = spaces.id AND space_members.user_id = " in sql
+        assert "WHERE spaces.id = " in sql
+
+
+class TestVerifySpaceAccess:
+    """Test suite for verify_space_access"""
+
+    SPACE_ID = uuid.uuid4()
+
+    def user(self):
+        return SimpleNamespace(id=uuid.uuid4())
+
+    @pytest.mark.asyncio
+    async def test_member_role_returned(self):
+        """Members get their role back"""
+        user = self.user()
+        db = session_returning(SimpleNamespace(owner_id=uuid.uuid4(), role=MemberRole.GUEST))
+        assert await verify_space_access(self.SPACE_ID, user, db) == MemberRole.GUEST
+
+    @pytest.mark.asyncio
+    async def test_owner_without_row_allowed(self):
+        """The space owner counts as a member without a space_members row"""
+        user = self.user()
+        db = session_returning(SimpleNamespace(owner_id=user.id, role=None))
+        assert await verify_space_access(self.SPACE_ID, user, db) == MemberRole.OWNER
+
+    @pytest.mark.asyncio
+    async def test_missing_space_is_404(self):
+        """An unknown space is reported as not found, and is not cached"""
+        db = session_returning(None)
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                await verify_space_access(self.SPACE_ID, self.user(), db)
+            assert exc.value.status_code == 404
+        assert len(membership_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_non_member_is_403(self):
+        """A user without a membership row is forbidden"""
+        db = session_returning(SimpleNamespace(owner_id=uuid.uuid4(), role=None))
+        with pytest.raises(HTTPException) as exc:
+            await verify_space_access(self.SPACE_ID, self.user(), db)
+        assert exc.value.status_code == 403
+
+
+class TestMembershipCache:
+    """Test suite for the per-request memo and the cross-request cache"""
+
+    SPACE_ID = uuid.uuid4()
+
+    def member_row(self):
+        return SimpleNamespace(owner_id=uuid.uuid4(), role=MemberRole.MEMBER)
+
+    @pytest.mark.asyncio
+    async def test_repeated_checks_in_request_query_once(self):
+        """Checking the same space twice in one request runs one query"""
+        user_id, db = uuid.uuid4(), session_returning(self.member_row())
+        await get_membership(db, self.SPACE_ID, user_id)
+        await get_membership(db, self.SPACE_ID, user_id)
+        assert db.queries == 1
+        assert metrics.snapshot()["counters"]["space_membership_queries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_later_request_uses_cache(self):
+        """A second request for the same member needs no query"""
+        user_id = uuid.uuid4()
+        await get_membership(session_returning(self.member_row()), self.SPACE_ID, user_id)
+
+        second = session_returning(None)
+        membership = await get_membership(second, self.SPACE_ID, user_id)
+
+        assert membership.is_member and second.queries == 0
+
+    @pytest.mark.asyncio
+    async def test_removal_invalidates(self):
+        """After a member is removed the next check reads the database"""
+        user_id = uuid.uuid4()
+        db = session_returning(self.member_row())
+        await get_membership(db, self.SPACE_ID, user_id)
+
+        invalidate_membership(self.SPACE_ID, user_id, db)
+        removed = session_returning(SimpleNamespace(owner_id=uuid.uuid4(), role=None))
+        membership = await get_membership(removed, self.SPACE_ID, user_id)
+
+        assert not membership.is_member
+        assert db.info["space_memberships"] == {}
+
+    @pytest.mark.asyncio
+    async def test_space_invalidation_covers_all_members(self):
+        """Invalidating a whole space drops every member's entry, and only that space's"""
+        other_space = uuid.uuid4()
+        for space_id in (self.SPACE_ID, self.SPACE_ID, other_space):
+            await get_membership(session_returning(self.member_row()), space_id, uuid.uuid4())
+
+        invalidate_membership(self.SPACE_ID)
+
+        assert len(membership_cache) == 1
@@ -0,0 +1,120 @@
+"""Tests for engine configuration and pool telemetry"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.core import database, metrics
+from app.core.database import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedNullPool,
+    engine_options,
+    pool_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def config(**overrides):
+    values = {
+        "DB_POOL_SIZE": 3,
+        "DB_MAX_OVERFLOW": 2,
+        "DB_POOL_TIMEOUT_SECONDS": 0.01,
+        "DB_POOL_RECYCLE_SECONDS": 600,
+        "DB_POOL_PRE_PING": True,
+        "DB_STATEMENT_CACHE_SIZE": 50,
+        "DB_PGBOUNCER": False,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestEngineOptions:
+    """Test suite for the settings-driven engine arguments"""
+
+    def test_pool_settings_applied(self):
+        """Pool sizing, recycle, pre-ping and statement cache come from settings"""
+        options = engine_options(config())
+        assert options["poolclass"] is InstrumentedAsyncQueuePool
+        assert (options["pool_size"], options["max_overflow"]) == (3, 2)
+        assert options["pool_timeout"] == 0.01
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is True
+        assert options["connect_args"] == {"prepared_statement_cache_size": 50}
+
+    def test_pgbouncer_mode(self):
+        """PgBouncer mode leaves pooling to PgBouncer and disables statement caches"""
+        options = engine_options(config(DB_PGBOUNCER=True))
+        assert options["poolclass"] is InstrumentedNullPool
+        assert "pool_size" not in options
+        args = options["connect_args"]
+        assert args["statement_cache_size"] == args["prepared_statement_cache_size"] == 0
+        assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+
+    def test_sync_engine_is_lazy(self):
+        """Importing the module does not build the CLI's psycopg2 engine"""
+        assert database._sync_engine is None
+
+
+class TestPoolTelemetry:
+    """Test suite for the instrumented pool"""
+
+    def pool(self, **overrides):
+        options = {"pool_size": 1, "max_overflow": 1, "timeout": 0.01}
+        options.update(overrides)
+        return InstrumentedAsyncQueuePool(MagicMock, **options)
+
+    def test_checkouts_counted_and_timed(self):
+        """Every checkout adds to the checkout count and total wait"""
+        pool = self.pool()
+        connection = pool.connect()
+        connection.close()
+        pool.connect().close()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["db_pool_checkouts"] == 2
+        assert snapshot["counters"]["db_pool_checkout_wait_seconds"] >= 0
+        assert "db_pool_checkout_wait_max_seconds" in snapshot["gauges"]
+
+    def test_overflow_and_utilisation(self):
+        """Stats report connections beyond pool_size and the share in use"""
+        pool = self.pool()
+        first, second = pool.connect(), pool.connect()
+
+        stats = pool_stats(pool, config(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=1))
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+        assert stats["utilisation"] == 1.0
+        first.close()
+        second.close()
+
+    def test_utilisation_uses_configured_overflow(self):
+        """Capacity is pool_size plus the DB_MAX_OVERFLOW setting"""
+        pool = self.pool()
+        first = pool.connect()
+
+        assert pool_stats(pool, config(DB_MAX_OVERFLOW=3))["utilisation"] == 0.25
+        first.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_counted(self):
+        """A checkout that times out on a full pool is counted"""
+        pool = self.pool(max_overflow=0)
+        held = pool.connect()
+
+        with pytest.raises(PoolTimeoutError):
+            await greenlet_spawn(pool.connect)
+
+        assert metrics.snapshot()["counters"]["db_pool_checkout_timeouts"] == 1
+        held.close()
+
+    def test_null_pool_has_no_stats(self):
+        """Without an app-side pool the gauges read zero"""
+        assert pool_stats(InstrumentedNullPool(MagicMock))["utilisation"] == 0.0
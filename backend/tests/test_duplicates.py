@@ -1,6 +1,16 @@
 """Tests for duplicate detection functionality"""
+import uuid
+
 import pytest
-from app.services.duplicates import calculate_similarity, format_duplicate_warning
+from sqlalchemy.dialects import postgresql
+
+from app.services.duplicates import (
+    calculate_similarity,
+    candidate_query,
+    format_duplicate_warning,
+    rank_similar,
+    MIN_CANDIDATES,
+)
 
 
 class TestCalculateSimilarity:
@@ -105,3 +115,72 @@ class TestSimilarityThresholds:
         """Exact duplicates always pass any threshold"""
         score = calculate_similarity("Same title", "Same title")
         assert score == 1.0
+
+
+class MockCard:
+    def __init__(self, name):
+        self.name = name
+
+
+class TestRankSimilar:
+    """Test suite for exact re-scoring of trigram candidates"""
+
+    NAMES = [
+        "Fix bug in login",
+        "Fix bug in logging",
+        "Fix login bug",
+        "Login issue fix",
+        "Deploy to production",
+        "Deploy to staging",
+        "Create user interface",
+        "",
+    ]
+
+    @pytest.mark.parametrize("threshold", [0.3, 0.4, 0.7, 0.9])
+    def test_matches_full_scan(self, threshold):
+        """Same cards and scores as comparing every name with calculate_similarity"""
+        cards = [MockCard(name) for name in self.NAMES]
+        expected = sorted(
+            (
+                (card, calculate_similarity("fix Bug in login ", card.name))
+                for card in cards
+                if calculate_similarity("fix Bug in login ", card.name) >= threshold
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+        assert rank_similar("fix Bug in login ", cards, threshold, limit=10) == expected
+
+    def test_limit_keeps_best(self):
+        """Only the highest scoring cards are returned"""
+        cards = [MockCard(name) for name in self.NAMES]
+        result = rank_similar("Fix bug in login", cards, 0.3, limit=2)
+        assert [card.name for card, _ in result] == ["Fix bug in login", "Fix bug in logging"]
+
+    def test_empty_name(self):
+        """An empty name matches nothing"""
+        assert rank_similar("  ", [MockCard("anything")], 0.0, limit=5) == []
+
+
+class TestCandidateQuery:
+    """Test suite for the trigram KNN candidate query"""
+
+    def compile(self, query) -> str:
+        return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    def test_orders_by_trigram_distance(self):
+        """Candidates come from a KNN scan on lower(name)"""
+        sql = self.compile(candidate_query("Fix Login ", uuid.uuid4(), 5))
+        assert "ORDER BY lower(cards.name) <-> 'fix login'" in sql
+        assert f"LIMIT {MIN_CANDIDATES}" in sql
+
+    def test_candidate_count_scales_with_limit(self):
+        """Large limits fetch proportionally more candidates"""
+        sql = self.compile(candidate_query("x", uuid.uuid4(), 20))
+        assert "LIMIT 200" in sql
+
+    def test_excludes_card(self):
+        """The card being compared is left out"""
+        card_id = uuid.uuid4()
+        sql = self.compile(candidate_query("x", uuid.uuid4(), 5, exclude_card_id=card_id))
+        assert "cards.id !=" in sql
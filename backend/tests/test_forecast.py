@@ -0,0 +1,91 @@
+"""Tests for Monte Carlo delivery forecasting"""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.forecast import (
+    MAX_FORECAST_DAYS,
+    daily_history,
+    forecast_dates,
+    simulate_completion_days,
+)
+
+
+class TestDailyHistory:
+    """Test suite for building the resampling pool"""
+
+    def test_zero_fills_quiet_days(self):
+        """Days without completions are part of the history as zeros"""
+        rows = [
+            SimpleNamespace(day=date(2026, 10, 11), completions=3),
+            SimpleNamespace(day=date(2026, 10, 13), completions=1),
+        ]
+        history = daily_history(rows, date(2026, 10, 10), date(2026, 10, 15))
+        assert history.tolist() == [0, 3, 0, 1, 0]
+
+    def test_ignores_days_outside_window(self):
+        """Today's partial count is left out"""
+        rows = [SimpleNamespace(day=date(2026, 10, 15), completions=9)]
+        assert daily_history(rows, date(2026, 10, 13), date(2026, 10, 15)).tolist() == [0, 0]
+
+
+class TestSimulation:
+    """Test suite for the vectorized simulation"""
+
+    def test_constant_throughput(self):
+        """Two cards a day finish ten cards on day five in every trial"""
+        days = simulate_completion_days(np.array([2, 2, 2]), 10, trials=1000)
+        assert days.shape == (1000,)
+        assert (days == 5).all()
+
+    def test_spans_several_blocks(self):
+        """Trials carry their progress across simulation blocks"""
+        days = simulate_completion_days(np.array([1]), 300, trials=100)
+        assert (days == 300).all()
+
+    def test_reproducible_with_seed(self):
+        """The same generator seed gives the same trials"""
+        history = np.array([0, 1, 3, 0, 2, 5, 0])
+        a = simulate_completion_days(history, 40, trials=2000, rng=np.random.default_rng(1))
+        b = simulate_completion_days(history, 40, trials=2000, rng=np.random.default_rng(1))
+        assert (a == b).all()
+
+    def test_no_throughput_never_finishes(self):
+        """Without completions in the history no trial finishes"""
+        days = simulate_completion_days(np.zeros(30, dtype=np.int32), 5, trials=100)
+        assert (days > MAX_FORECAST_DAYS).all()
+
+    def test_bounds(self):
+        """Durations lie between the best and worst case of the history"""
+        history = np.array([1, 4])
+        days = simulate_completion_days(history, 20, trials=5000, rng=np.random.default_rng(7))
+        assert days.min() >= 5
+        assert days.max() <= 20
+
+
+class TestForecastDates:
+    """Test suite for percentile completion dates"""
+
+    def test_percentiles_are_ordered(self):
+        """Higher confidence never gives an earlier date"""
+        history = np.array([0, 1, 3, 0, 2, 5, 0])
+        days = simulate_completion_days(history, 40, rng=np.random.default_rng(3))
+        forecast = forecast_dates(days, date(2026, 10, 16))
+        assert forecast["p50"]["days"] <= forecast["p85"]["days"] <= forecast["p95"]["days"]
+
+    def test_dates_count_from_first_simulated_day(self):
+        """Finishing on the first simulated day is that day's date"""
+        forecast = forecast_dates(np.array([1, 1, 3]), date(2026, 10, 16))
+        assert forecast["p50"] == {"days": 1, "date": "2026-10-16"}
+        assert forecast["p95"] == {"days": 3, "date": "2026-10-18"}
+
+    def test_unfinished_percentile(self):
+        """Percentiles that land on unfinished trials have no date"""
+        days = np.array([4] * 60 + [MAX_FORECAST_DAYS + 1] * 40)
+        forecast = forecast_dates(days, date(2026, 10, 16))
+        assert forecast["p50"]["days"] == 4
+        assert forecast["p85"] is None
+        assert forecast["p95"] is None
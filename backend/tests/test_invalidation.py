@@ -0,0 +1,204 @@
+"""Tests for cache invalidations shared between workers"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.cache import TTLCache
+from app.core.invalidation import (
+    InvalidationBus,
+    RedisInvalidationBus,
+    create_invalidation_bus,
+    publish_invalidation,
+)
+from app.models.space import MemberRole
+from app.services import auth_cache, authorization
+from app.services.authorization import Membership, membership_cache
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestMemoryBus:
+    """Test suite for the single-worker bus"""
+
+    def test_invalidates_registered_cache(self):
+        """The handler registered under the name runs at once"""
+        cache = TTLCache("test", max_entries=10, ttl_seconds=60)
+        cache.set("key", 1)
+        bus = InvalidationBus()
+        bus.register("test", cache.invalidate)
+
+        bus.invalidate("test", "key")
+
+        assert cache.get("key") is None
+
+    def test_unknown_name_ignored(self):
+        """Invalidating a cache nobody registered does not fail"""
+        InvalidationBus().invalidate("missing", "key")
+
+
+class TestRedisBus:
+    """Test suite for invalidations over Redis pub/sub"""
+
+    @pytest.fixture
+    def server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeServer()
+
+    async def make_worker(self, server):
+        import fakeredis
+        cache = TTLCache("auth_api_key", max_entries=10, ttl_seconds=60)
+        bus = RedisInvalidationBus(client=fakeredis.FakeAsyncRedis(server=server))
+        bus.register("auth_api_key", cache.invalidate)
+        await bus.start()
+        return bus, cache
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self, server):
+        """A key revoked in one worker is dropped from another worker's cache"""
+        bus_a, cache_a = await self.make_worker(server)
+        bus_b, cache_b = await self.make_worker(server)
+        cache_a.set("hash", ("key", "user"))
+        cache_b.set("hash", ("key", "user"))
+
+        bus_a.invalidate("auth_api_key", "hash")
+
+        assert cache_a.get("hash") is None
+        await wait_for(lambda: cache_b.get("hash") is None)
+        await bus_a.stop()
+        await bus_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_still_invalidates_locally(self, server):
+        """Without Redis the calling worker still forgets the entry"""
+        bus, cache = await self.make_worker(server)
+        cache.set("hash", ("key", "user"))
+        server.connected = False
+
+        bus.invalidate("auth_api_key", "hash")
+        await asyncio.gather(*bus._publishing)
+
+        assert cache.get("hash") is None
+        server.connected = True
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_api_key_goes_through_bus(self, server, monkeypatch):
+        """invalidate_api_key publishes instead of only clearing this worker"""
+        bus, _ = await self.make_worker(server)
+        bus.register("auth_api_key", auth_cache.api_key_cache.invalidate)
+        monkeypatch.setattr(auth_cache, "invalidation_bus", bus)
+        auth_cache.api_key_cache.set("hash", ("key", "user"))
+        other, other_cache = await self.make_worker(server)
+        other_cache.set("hash", ("key", "user"))
+
+        auth_cache.invalidate_api_key("hash")
+
+        assert auth_cache.api_key_cache.get("hash") is None
+        await wait_for(lambda: other_cache.get("hash") is None)
+        await bus.stop()
+        await other.stop()
+
+    @pytest.mark.asyncio
+    async def test_member_removal_reaches_other_workers(self, server, monkeypatch):
+        """Removing a member drops their cached membership in other workers too"""
+        import fakeredis
+        space_id, user_id, other_user = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        bus, _ = await self.make_worker(server)
+        monkeypatch.setattr(authorization, "invalidation_bus", bus)
+        other = RedisInvalidationBus(client=fakeredis.FakeAsyncRedis(server=server))
+        other.register("space_membership", authorization._forget_memberships)
+        await other.start()
+        membership_cache.clear()
+        membership_cache.set((space_id, user_id), Membership(True, MemberRole.MEMBER))
+        membership_cache.set((space_id, other_user), Membership(True, MemberRole.MEMBER))
+
+        # Only the other worker handles it, so its delivery alone clears the entry
+        authorization.invalidate_membership(space_id, user_id)
+        await wait_for(lambda: membership_cache.get((space_id, user_id)) is None)
+
+        assert membership_cache.get((space_id, other_user)) is not None
+        membership_cache.clear()
+        await bus.stop()
+        await other.stop()
+
+
+    @pytest.mark.asyncio
+    async def test_user_change_reaches_other_workers(self, server, monkeypatch):
+        """Banning or demoting a user drops them from other workers' user caches"""
+        import fakeredis
+        user_id = uuid.uuid4()
+        bus, _ = await self.make_worker(server)
+        monkeypatch.setattr(auth_cache, "invalidation_bus", bus)
+        other = RedisInvalidationBus(client=fakeredis.FakeAsyncRedis(server=server))
+        other.register("auth_user", lambda key: auth_cache.user_cache.invalidate(uuid.UUID(key)))
+        await other.start()
+        auth_cache.user_cache.set(user_id, {"id": user_id})
+
+        # Only the other worker handles it, so its delivery alone clears the entry
+        auth_cache.invalidate_user(user_id)
+        await wait_for(lambda: auth_cache.user_cache.get(user_id) is None)
+
+        auth_cache.user_cache.clear()
+        await bus.stop()
+        await other.stop()
+
+    @pytest.mark.asyncio
+    async def test_cli_publish_reaches_workers(self, server, monkeypatch):
+        """publish_invalidation lets a process without a bus, like the CLI, reach the workers"""
+        import fakeredis
+        import redis
+        bus, cache = await self.make_worker(server)
+        cache.set("hash", ("key", "user"))
+        monkeypatch.setattr(redis, "from_url", lambda url: fakeredis.FakeRedis(server=server))
+
+        config = SimpleNamespace(BROADCAST_BACKEND="redis", REDIS_URL="redis://localhost:6379/0")
+        assert publish_invalidation("auth_api_key", "hash", config)
+
+        await wait_for(lambda: cache.get("hash") is None)
+        await bus.stop()
+
+
+class TestPublishInvalidation:
+    """Test suite for invalidations published outside the API"""
+
+    def test_memory_backend_publishes_nothing(self):
+        """Without Redis there are no other workers to tell"""
+        config = SimpleNamespace(BROADCAST_BACKEND="memory", REDIS_URL="redis://localhost:6379/0")
+        assert publish_invalidation("auth_user", str(uuid.uuid4()), config) is False
+
+    def test_unreachable_redis_reported(self, monkeypatch):
+        """A Redis failure is reported instead of failing the command"""
+        import redis
+
+        def unreachable(url):
+            raise redis.ConnectionError("refused")
+
+        monkeypatch.setattr(redis, "from_url", unreachable)
+        config = SimpleNamespace(BROADCAST_BACKEND="redis", REDIS_URL="redis://localhost:6379/0")
+        assert publish_invalidation("auth_user", str(uuid.uuid4()), config) is False
+
+
+class TestCreateBus:
+    """Test suite for bus selection"""
+
+    def test_memory(self):
+        """'memory' builds the in-process bus"""
+        assert type(create_invalidation_bus("memory")) is InvalidationBus
+
+    def test_redis(self):
+        """'redis' builds the pub/sub bus without connecting"""
+        pytest.importorskip("redis")
+        assert isinstance(create_invalidation_bus("redis", "redis://localhost:6379/0"), RedisInvalidationBus)
+
+    def test_unknown_backend_rejected(self):
+        """Typos in BROADCAST_BACKEND fail at startup"""
+        with pytest.raises(ValueError):
+            create_invalidation_bus("carrier-pigeon")
@@ -0,0 +1,33 @@
+"""Tests for the in-process metrics registry"""
+import pytest
+
+from app.core import metrics
+
+
+class TestMetrics:
+    """Test suite for counters and gauges"""
+
+    @pytest.fixture(autouse=True)
+    def clean_metrics(self):
+        metrics.reset()
+        yield
+        metrics.reset()
+
+    def test_counter_accumulates(self):
+        """inc adds to the counter, starting from zero"""
+        metrics.inc("requests")
+        metrics.inc("requests", 4)
+        assert metrics.snapshot()["counters"] == {"requests": 5}
+
+    def test_gauge_overwrites(self):
+        """set_gauge keeps only the latest value"""
+        metrics.set_gauge("depth", 3)
+        metrics.set_gauge("depth", 1)
+        assert metrics.snapshot()["gauges"] == {"depth": 1}
+
+    def test_registered_gauge_read_on_snapshot(self):
+        """Callback gauges are evaluated when metrics are read"""
+        values = [1]
+        metrics.register_gauge("live", lambda: values[-1])
+        values.append(7)
+        assert metrics.snapshot()["gauges"]["live"] == 7
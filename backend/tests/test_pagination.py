@@ -0,0 +1,188 @@
+"""Tests for keyset pagination cursors"""
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.cards import list_cards
+from app.core.pagination import encode_cursor, decode_cursor
+
+
+class TestCursorRoundTrip:
+    """Test suite for cursor encoding"""
+
+    def test_round_trip(self):
+        """Decoded cursor matches the encoded values"""
+        card_id = str(uuid4())
+        cursor = encode_cursor({"position": 3, "id": card_id})
+        assert decode_cursor(cursor) == {"position": 3, "id": card_id}
+
+    def test_cursor_is_url_safe(self):
+        """Cursor contains no characters needing URL escaping"""
+        cursor = encode_cursor({"position": 12345, "id": str(uuid4())})
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    def test_garbage_cursor_rejected(self):
+        """Non-base64 input raises a 400"""
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor("not a cursor!")
+        assert exc.value.status_code == 400
+
+    def test_non_object_cursor_rejected(self):
+        """Cursor must decode to a JSON object"""
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(encode_cursor([1, 2]))  # type: ignore[arg-type]
+        assert exc.value.status_code == 400
+
+
+class Result:
+    def __init__(self, rows=(), scalar=None):
+        self.rows = list(rows)
+        self._scalar = scalar
+
+    def scalar(self):
+        return self._scalar
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class RecordingSession:
+    """Returns prepared results in order and keeps the executed statements"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+def card(position):
+    return SimpleNamespace(id=uuid4(), position=position)
+
+
+def top_level_loaders(statement):
+    """{relationship name: lazy strategy} of the statement's loader options on Card"""
+    loaders = {}
+    for option in statement._with_options:
+        for load in option.context:
+            if len(load.path) == 3:
+                loaders[load.path[1].key] = dict(load.strategy)["lazy"]
+    return loaders
+
+
+class TestListCards:
+    """Test suite for paging and field selection in GET /cards"""
+
+    async def list_cards(self, db, limit=None, cursor=None, fields=None):
+        response = Response()
+        cards = await list_cards(
+            response, limit=limit, cursor=cursor, fields=fields,
+            current_user=SimpleNamespace(id=uuid4()), db=db,
+            **{name: None for name in (
+                "space_id", "column_id", "assignee_id", "tag_id", "start_date_from", "start_date_to",
+                "end_date_from", "end_date_to", "search", "waiting_only", "urgent_only",
+            )},
+        )
+        return cards, response.headers
+
+    def compile(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        return str(compiled), compiled.params
+
+    @pytest.mark.asyncio
+    async def test_first_page_counts_and_limits(self):
+        """The first page reports the total and is ordered by (position, id)"""
+        db = RecordingSession(Result(scalar=7), Result([card(0), card(1)]))
+
+        _, headers = await self.list_cards(db, limit=2)
+
+        assert headers["X-Total-Count"] == "7"
+        count_sql, _ = self.compile(db.statements[0])
+        assert "count(DISTINCT cards.id)" in count_sql and "ORDER BY" not in count_sql
+        sql, params = self.compile(db.statements[1])
+        assert sql.endswith("ORDER BY cards.position, cards.id \n LIMIT %(param_1)s")
+        assert params["param_1"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_page_returns_next_cursor(self):
+        """A full page hands out a cursor for its last card"""
+        page = [card(4), card(5)]
+        _, headers = await self.list_cards(RecordingSession(Result(scalar=3), Result(page)), limit=2)
+
+        assert decode_cursor(headers["X-Next-Cursor"]) == {"position": 5, "id": str(page[-1].id)}
+
+    @pytest.mark.asyncio
+    async def test_short_page_is_last(self):
+        """A page with fewer cards than the limit has no next cursor"""
+        _, headers = await self.list_cards(RecordingSession(Result(scalar=1), Result([card(0)])), limit=2)
+        assert "X-Next-Cursor" not in headers
+
+    @pytest.mark.asyncio
+    async def test_cursor_applies_keyset_predicate(self):
+        """Later pages continue after the cursor's (position, id) and skip the count"""
+        after = uuid4()
+        db = RecordingSession(Result([]))
+
+        _, headers = await self.list_cards(db, limit=2, cursor=encode_cursor({"position": 5, "id": str(after)}))
+
+        assert len(db.statements) == 1 and "X-Total-Count" not in headers
+        sql, params = self.compile(db.statements[0])
+        assert "(cards.position, cards.id) > (%(param_1)s, %(param_2)s::UUID)" in sql
+        assert (params["param_1"], params["param_2"]) == (5, after)
+
+    @pytest.mark.asyncio
+    async def test_position_ties_broken_by_id(self):
+        """Cards sharing a position are paged by id, so none is skipped or repeated"""
+        first, second = sorted((card(5), card(5)), key=lambda c: c.id)
+        _, headers = await self.list_cards(RecordingSession(Result(scalar=2), Result([first])), limit=1)
+
+        db = RecordingSession(Result([second]))
+        await self.list_cards(db, limit=1, cursor=headers["X-Next-Cursor"])
+
+        sql, params = self.compile(db.statements[0])
+        assert "(cards.position, cards.id) >" in sql and "ORDER BY cards.position, cards.id" in sql
+        assert (params["param_1"], params["param_2"]) == (5, first.id)
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_rejected(self):
+        """A cursor without a usable position and id is a 400"""
+        with pytest.raises(HTTPException) as exc:
+            await self.list_cards(RecordingSession(), limit=2, cursor=encode_cursor({"position": "x"}))
+        assert exc.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_fields_select_relationships(self):
+        """Only the requested relationships are loaded; the rest are noload"""
+        db = RecordingSession(Result([]))
+        await self.list_cards(db, fields="tags")
+
+        assert top_level_loaders(db.statements[0]) == {
+            "tags": "selectin",
+            "assignees": "noload",
+            "creator": "noload",
+        }
+
+    @pytest.mark.asyncio
+    async def test_all_relationships_loaded_by_default(self):
+        """Without fields every relationship is eager-loaded"""
+        db = RecordingSession(Result([]))
+        await self.list_cards(db)
+
+        assert set(top_level_loaders(db.statements[0]).values()) == {"selectin"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_field_rejected(self):
+        """Typos in fields are a 400 instead of being ignored"""
+        with pytest.raises(HTTPException) as exc:
+            await self.list_cards(RecordingSession(), fields="tags,owner")
+        assert exc.value.status_code == 400
@@ -0,0 +1,264 @@
+"""Query plan checks for hot read paths.
+
+Seeds a scratch PostgreSQL database and asserts that none of the queries in
+HOT_QUERIES plans a sequential scan on the table it filters. Add new hot
+queries to HOT_QUERIES so index regressions fail here instead of in production.
+
+Requires TEST_DATABASE_URL (postgresql+asyncpg://...) pointing at a database
+that may be dropped and recreated; the plan check is skipped otherwise.
+"""
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL not set",
+)
+
+USERS = 500
+COLUMNS_PER_SPACE = 4
+CARDS_PER_COLUMN = 20
+HISTORY_PER_CARD = 2
+NOTIFICATIONS_PER_USER = 100
+LOGS_PER_WEBHOOK = 100
+
+
+def find_seq_scans(plan: dict) -> set:
+    """Return relation names that a JSON EXPLAIN plan reads with a Seq Scan."""
+    found = set()
+    if plan.get("Node Type") == "Seq Scan":
+        found.add(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found |= find_seq_scans(child)
+    return found
+
+
+def build_hot_queries(ids: dict) -> list:
+    """(label, table expected to use an index, statement) for each hot query."""
+    from sqlalchemy import select
+    from app.models.card import Card, CardHistory, ActorType
+    from app.models.column import Column
+    from app.models.notification import Notification
+    from app.models.space import SpaceMember
+    from app.models.webhook import WebhookLog
+
+    return [
+        (
+            "cards in column by position",
+            "cards",
+            select(Card).where(Card.column_id == ids["column_id"]).order_by(Card.position),
+        ),
+        (
+            "oldest card in column",
+            "cards",
+            select(Card.column_entered_at)
+            .where(Card.column_id == ids["column_id"])
+            .order_by(Card.column_entered_at.asc())
+            .limit(1),
+        ),
+        (
+            "card history timeline",
+            "card_history",
+            select(CardHistory)
+            .where(CardHistory.card_id == ids["card_id"])
+            .order_by(CardHistory.created_at.desc()),
+        ),
+        (
+            "last activity by actor",
+            "card_history",
+            select(CardHistory)
+            .where(CardHistory.actor_id == str(ids["user_id"]))
+            .order_by(CardHistory.created_at.desc())
+            .limit(1),
+        ),
+        (
+            "recent agent history",
+            "card_history",
+            select(CardHistory)
+            .where(CardHistory.actor_type == ActorType.AGENT)
+            .order_by(CardHistory.created_at.desc())
+            .limit(20),
+        ),
+        (
+            "columns in space",
+            "columns",
+            select(Column).where(Column.space_id == ids["space_id"]).order_by(Column.position),
+        ),
+        (
+            "notification inbox",
+            "notifications",
+            select(Notification)
+            .where(Notification.user_id == ids["user_id"])
+            .order_by(Notification.created_at.desc())
+            .limit(50),
+        ),
+        (
+            "unread notifications",
+            "notifications",
+            select(Notification)
+            .where(Notification.user_id == ids["user_id"], Notification.read == False)
+            .order_by(Notification.created_at.desc())
+            .limit(50),
+        ),
+        (
+            "webhook logs",
+            "webhook_logs",
+            select(WebhookLog)
+            .where(WebhookLog.webhook_id == ids["webhook_id"])
+            .order_by(WebhookLog.created_at.desc())
+            .limit(100),
+        ),
+        (
+            "memberships of user",
+            "space_members",
+            select(SpaceMember.space_id).where(SpaceMember.user_id == ids["user_id"]),
+        ),
+    ]
+
+
+async def seed(conn) -> dict:
+    from sqlalchemy import insert
+    from app.models.user import User
+    from app.models.space import Space, SpaceMember
+    from app.models.column import Column
+    from app.models.card import Card, CardHistory, ActorType
+    from app.models.notification import Notification
+    from app.models.webhook import Webhook, WebhookLog
+
+    now = datetime.now(timezone.utc)
+    users = [
+        {"id": uuid.uuid4(), "email": f"user{i}@example.com", "username": f"user{i}", "password_hash": "x"}
+        for i in range(USERS)
+    ]
+    spaces = [{"id": uuid.uuid4(), "name": f"Space {i}", "owner_id": u["id"]} for i, u in enumerate(users)]
+    members = [{"space_id": s["id"], "user_id": s["owner_id"]} for s in spaces]
+    columns = [
+        {"id": uuid.uuid4(), "space_id": s["id"], "name": f"Column {p}", "position": p}
+        for s in spaces
+        for p in range(COLUMNS_PER_SPACE)
+    ]
+    cards = [
+        {
+            "id": uuid.uuid4(),
+            "column_id": c["id"],
+            "name": f"Card {p}",
+            "position": p,
+            "column_entered_at": now - timedelta(hours=p),
+        }
+        for c in columns
+        for p in range(CARDS_PER_COLUMN)
+    ]
+    history = [
+        {
+            "card_id": card["id"],
+            "action": "moved",
+            "changes": {},
+            "actor_type": ActorType.AGENT if (i + n) % 50 == 0 else ActorType.USER,
+            "actor_id": str(users[(i + n) % USERS]["id"]),
+            "created_at": now - timedelta(minutes=i + n),
+        }
+        for i, card in enumerate(cards)
+        for n in range(HISTORY_PER_CARD)
+    ]
+    notifications = [
+        {
+            "user_id": u["id"],
+            "type": "mention",
+            "title": "Mentioned",
+            "read": n % 10 != 0,
+            "created_at": now - timedelta(minutes=n),
+        }
+        for u in users
+        for n in range(NOTIFICATIONS_PER_USER)
+    ]
+    webhooks = [{"id": uuid.uuid4(), "space_id": s["id"], "url": "http://example.invalid/hook"} for s in spaces]
+    logs = [
+        {"webhook_id": w["id"], "event": "card_moved", "created_at": now - timedelta(minutes=n)}
+        for w in webhooks
+        for n in range(LOGS_PER_WEBHOOK)
+    ]
+
+    for model, rows in [
+        (User, users),
+        (Space, spaces),
+        (SpaceMember, members),
+        (Column, columns),
+        (Card, cards),
+        (CardHistory, history),
+        (Notification, notifications),
+        (Webhook, webhooks),
+        (WebhookLog, logs),
+    ]:
+        await conn.execute(insert(model), rows)
+
+    return {
+        "user_id": users[0]["id"],
+        "space_id": spaces[0]["id"],
+        "column_id": columns[0]["id"],
+        "card_id": cards[0]["id"],
+        "webhook_id": webhooks[0]["id"],
+    }
+
+
+@requires_postgres
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes():
+    """No hot query plans a sequential scan on its filtered table"""
+    from sqlalchemy import text
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.models import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            # ix_cards_name_trgm needs the trigram operator classes
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.run_sync(Base.metadata.create_all)
+            ids = await seed(conn)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            failures = []
+            for label, table, stmt in build_hot_queries(ids):
+                sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                explained = result.scalar()
+                if isinstance(explained, str):
+                    explained = json.loads(explained)
+                plan = explained[0]["Plan"]
+                if table in find_seq_scans(plan):
+                    failures.append(f"{label}: sequential scan on {table}")
+
+        assert not failures, "\n".join(failures)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+class TestFindSeqScans:
+    """Test suite for the plan walker itself"""
+
+    def test_nested_seq_scan_found(self):
+        """Seq scans below joins are reported"""
+        plan = {
+            "Node Type": "Nested Loop",
+            "Plans": [
+                {"Node Type": "Index Scan", "Relation Name": "columns"},
+                {"Node Type": "Seq Scan", "Relation Name": "cards"},
+            ],
+        }
+        assert find_seq_scans(plan) == {"cards"}
+
+    def test_index_only_plan(self):
+        """Plans without seq scans report nothing"""
+        plan = {"Node Type": "Limit", "Plans": [{"Node Type": "Index Scan", "Relation Name": "cards"}]}
+        assert find_seq_scans(plan) == set()
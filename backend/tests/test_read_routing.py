@@ -0,0 +1,101 @@
+"""Tests for read replica routing and read-your-writes"""
+import pytest
+from starlette.requests import Request
+
+from app.core import database, metrics
+from app.core.read_routing import mark_write, recent_writes, wants_primary
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    metrics.reset()
+    recent_writes.clear()
+    yield
+    metrics.reset()
+    recent_writes.clear()
+
+
+def request(method="GET", **headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": method, "headers": raw})
+
+
+class TestReadYourWrites:
+    """Test suite for deciding when reads stay on the primary"""
+
+    def test_header_forces_primary(self):
+        """X-Read-Primary: true sends the read to the primary"""
+        assert wants_primary(request(x_read_primary="true"))
+        assert not wants_primary(request(x_read_primary="false"))
+
+    def test_recent_write_marks_caller(self):
+        """After a successful write, the same caller reads from the primary"""
+        mark_write(request("PATCH", authorization="Bearer alice"), 200)
+        assert wants_primary(request(authorization="Bearer alice"))
+        assert not wants_primary(request(authorization="Bearer bob"))
+
+    def test_reads_and_failures_do_not_mark(self):
+        """GETs and rejected writes leave the caller on the replica"""
+        mark_write(request("GET", authorization="Bearer alice"), 200)
+        mark_write(request("POST", authorization="Bearer alice"), 422)
+        assert not wants_primary(request(authorization="Bearer alice"))
+
+    def test_api_key_callers_marked(self):
+        """Agents are identified by their X-API-Key"""
+        mark_write(request("POST", x_api_key="kb_agent"), 201)
+        assert wants_primary(request(x_api_key="kb_agent"))
+
+
+class FakeSessionMaker:
+    """Session factory recording which database it stands for"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def close(self):
+        pass
+
+
+class TestGetReadDb:
+    """Test suite for the get_read_db dependency"""
+
+    async def session_for(self, req):
+        dependency = database.get_read_db(req)
+        session = await dependency.__anext__()
+        await dependency.aclose()
+        return session.name
+
+    @pytest.fixture
+    def replica(self, monkeypatch):
+        monkeypatch.setattr(database, "async_session_maker", FakeSessionMaker("primary"))
+        monkeypatch.setattr(database, "read_session_maker", FakeSessionMaker("replica"))
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, replica):
+        """Plain reads are served by the replica"""
+        assert await self.session_for(request(authorization="Bearer alice")) == "replica"
+        assert metrics.snapshot()["counters"]["db_read_replica_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_recent_writer_reads_primary(self, replica):
+        """A caller that just wrote is served by the primary"""
+        mark_write(request("DELETE", authorization="Bearer alice"), 204)
+        assert await self.session_for(request(authorization="Bearer alice")) == "primary"
+        assert metrics.snapshot()["counters"]["db_read_primary_sessions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_without_replica_uses_primary(self, monkeypatch):
+        """Without DATABASE_READ_URL every read uses the primary"""
+        primary = FakeSessionMaker("primary")
+        monkeypatch.setattr(database, "async_session_maker", primary)
+        monkeypatch.setattr(database, "read_session_maker", primary)
+        assert await self.session_for(request()) == "primary"
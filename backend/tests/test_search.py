@@ -0,0 +1,167 @@
+"""Tests for full-text search query building"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.cards import list_cards
+from app.api.v1.search import global_search
+from app.models.card import Card
+from app.services.search import HTML_ESCAPES, build_tsquery, headline, to_tsquery, MAX_QUERY_TERMS
+
+
+class TestBuildTsquery:
+    """Test suite for turning user input into tsquery strings"""
+
+    def test_single_word_is_prefix(self):
+        """A single word matches as a prefix"""
+        assert build_tsquery("deplo") == "deplo:*"
+
+    def test_words_are_anded(self):
+        """All words must match"""
+        assert build_tsquery("deploy prod") == "deploy:* & prod:*"
+
+    def test_input_is_lowercased(self):
+        """Terms are lowercased to match the 'simple' configuration"""
+        assert build_tsquery("Deploy") == "deploy:*"
+
+    def test_operators_are_stripped(self):
+        """tsquery syntax typed by the user cannot alter the query"""
+        assert build_tsquery("a & !b | (c:*)") == "a:* & b:* & c:*"
+
+    def test_unicode_words_kept(self):
+        """Non-ASCII words are searchable"""
+        assert build_tsquery("Größe") == "größe:*"
+
+    def test_no_words_returns_none(self):
+        """Input with nothing searchable yields None"""
+        assert build_tsquery("!!! ...") is None
+        assert build_tsquery("") is None
+
+    def test_term_count_is_capped(self):
+        """Very long inputs are truncated to MAX_QUERY_TERMS terms"""
+        query = build_tsquery(" ".join(f"w{i}" for i in range(MAX_QUERY_TERMS + 5)))
+        assert query.count(":*") == MAX_QUERY_TERMS
+
+
+class Result:
+    def __init__(self, rows=(), scalar=None):
+        self.rows = list(rows)
+        self._scalar = scalar
+
+    def fetchall(self):
+        return self.rows
+
+    def scalar(self):
+        return self._scalar
+
+    def scalars(self):
+        return self
+
+    def unique(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class RecordingSession:
+    """Returns prepared results in order and keeps the executed statements"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return self.results.pop(0)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestHeadline:
+    """Test suite for search result snippets"""
+
+    def test_text_escaped_before_highlighting(self):
+        """Markup in the document is escaped so only <mark> tags remain"""
+        compiled = select(headline(Card.description, to_tsquery("deplo:*"))).compile(dialect=postgresql.dialect())
+        assert "replace(replace(replace(coalesce(cards.description, %(coalesce_1)s)" in str(compiled)
+        replacements = sorted(value for name, value in compiled.params.items() if name.startswith("replace"))
+        assert replacements == sorted(["&", "&amp;", "<", "&lt;", ">", "&gt;"])
+
+    def test_name_used_when_description_does_not_match(self):
+        """A card that matched only on its name gets a highlighted name as snippet"""
+        sql = compile_sql(select(headline(Card.description, to_tsquery("deplo:*"), fallback=Card.name)))
+        assert sql.count("ts_headline(") == 2
+        assert "CASE WHEN (to_tsvector(%(to_tsvector_1)s, coalesce(cards.description" in sql
+        assert "ELSE ts_headline(%(ts_headline_3)s, replace(replace(replace(coalesce(cards.name" in sql
+
+    def test_escapes_ampersand_first(self):
+        """Entities added for < and > are not escaped a second time"""
+        assert HTML_ESCAPES[0] == ("&", "&amp;")
+
+    @pytest.mark.asyncio
+    async def test_search_snippets_use_escaped_headline(self):
+        """Card and comment snippets both come from the escaped headline"""
+        space_id = uuid.uuid4()
+        card = SimpleNamespace(
+            id=uuid.uuid4(), name="Deploy", description="<b>deploy</b>", snippet="&lt;b&gt;<mark>deploy</mark>&lt;/b&gt;",
+            column_name="Doing", space_name="Ops", space_id=space_id, rank=0.5,
+        )
+        comment = SimpleNamespace(
+            id=uuid.uuid4(), card_id=card.id, card_name="Deploy", snippet="<mark>deploy</mark> now",
+            space_name="Ops", space_id=space_id, rank=0.2,
+        )
+        db = RecordingSession(
+            Result([(space_id,)]),
+            Result(scalar=1), Result([card]),
+            Result(scalar=1), Result([comment]),
+        )
+
+        response = await global_search(
+            q="deploy", types=["cards", "comments"], space_id=None, limit=20,
+            current_user=SimpleNamespace(id=uuid.uuid4()), db=db,
+        )
+
+        assert response.cards[0].snippet == card.snippet
+        assert response.comments[0].snippet == comment.snippet
+        card_sql = compile_sql(db.statements[2])
+        assert "replace(replace(replace(coalesce(cards.description" in card_sql
+        assert "replace(replace(replace(coalesce(cards.name" in card_sql
+        assert "replace(replace(replace(coalesce(comments.content" in compile_sql(db.statements[4])
+
+
+class TestCardSearchFilter:
+    """Test suite for the search parameter of GET /cards"""
+
+    async def list_with_search(self, search):
+        db = RecordingSession(Result([]))
+        await list_cards(
+            Response(), search=search, limit=None, cursor=None, fields=None,
+            current_user=SimpleNamespace(id=uuid.uuid4()), db=db,
+            **{name: None for name in (
+                "space_id", "column_id", "assignee_id", "tag_id", "start_date_from", "start_date_to",
+                "end_date_from", "end_date_to", "waiting_only", "urgent_only",
+            )},
+        )
+        compiled = db.statements[0].compile(dialect=postgresql.dialect())
+        return str(compiled), compiled.params
+
+    @pytest.mark.asyncio
+    async def test_words_matched_against_search_vector(self):
+        """The search text filters through the indexed search_vector"""
+        sql, params = await self.list_with_search("deplo prod")
+        assert params["to_tsquery_2"] == "deplo:* & prod:*"
+        assert "cards.search_vector @@ to_tsquery(%(to_tsquery_1)s, %(to_tsquery_2)s)" in sql
+
+    @pytest.mark.asyncio
+    async def test_unsearchable_input_matches_nothing(self):
+        """Input without words returns no cards instead of every card"""
+        sql, _ = await self.list_with_search("!!!")
+        assert "@@" not in sql
+        assert "WHERE false" in sql
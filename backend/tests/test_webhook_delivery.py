@@ -0,0 +1,251 @@
+"""Tests for the webhook delivery queue helpers"""
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.webhook import DeliveryStatus
+from app.services import webhooks
+from app.services.webhooks import (
+    EndpointLimiter,
+    WebhookDeliveryWorker,
+    backoff_delay,
+    claim_query,
+    is_retryable,
+    post_webhook,
+)
+
+
+class TestBackoff:
+    """Test suite for retry scheduling"""
+
+    def test_doubles_each_attempt(self):
+        """Without jitter the delay doubles from the base"""
+        delays = [backoff_delay(n, base=10, cap=3600, jitter=lambda: 1.0) for n in range(1, 5)]
+        assert delays == [10, 20, 40, 80]
+
+    def test_capped(self):
+        """Delay never exceeds the cap"""
+        assert backoff_delay(30, base=10, cap=3600, jitter=lambda: 1.0) == 3600
+
+    def test_jitter_keeps_at_least_half(self):
+        """Jitter only randomizes the upper half of the delay"""
+        assert backoff_delay(3, base=10, cap=3600, jitter=lambda: 0.0) == 20
+
+
+class TestRetryable:
+    """Test suite for deciding which failures to retry"""
+
+    @pytest.mark.parametrize("status_code", [None, 408, 429, 500, 502, 503])
+    def test_transient_failures_retried(self, status_code):
+        """Network errors, timeouts, rate limits and 5xx are retried"""
+        assert is_retryable(status_code)
+
+    @pytest.mark.parametrize("status_code", [400, 401, 404, 410, 422])
+    def test_client_errors_not_retried(self, status_code):
+        """Other 4xx responses go straight to the dead letters"""
+        assert not is_retryable(status_code)
+
+
+class TestPostWebhook:
+    """Test suite for a single delivery attempt"""
+
+    @pytest.mark.asyncio
+    async def test_success_sends_secret(self):
+        """2xx counts as success and the secret header is sent"""
+        seen = {}
+
+        def handler(request):
+            seen["secret"] = request.headers.get("X-Kanbot-Secret")
+            return httpx.Response(204)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await post_webhook(client, "http://hook.test/", "s3cret", {"event": "card_created"})
+
+        assert result.success
+        assert seen["secret"] == "s3cret"
+
+    @pytest.mark.asyncio
+    async def test_server_error_recorded(self):
+        """Non-2xx responses are failures with the body kept"""
+        transport = httpx.MockTransport(lambda request: httpx.Response(503, text="down"))
+        async with httpx.AsyncClient(transport=transport) as client:
+            result = await post_webhook(client, "http://hook.test/", None, {})
+
+        assert not result.success
+        assert result.status_code == 503
+        assert result.response_body == "down"
+
+    @pytest.mark.asyncio
+    async def test_network_error_has_no_status(self):
+        """Connection failures become retryable attempts without a status"""
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            result = await post_webhook(client, "http://hook.test/", None, {})
+
+        assert result.status_code is None
+        assert "refused" in result.response_body
+        assert is_retryable(result.status_code)
+
+
+class TestEndpointLimiter:
+    """Test suite for per-endpoint concurrency"""
+
+    def test_caps_concurrency_per_url(self):
+        """No more than the limit are taken for one URL, others are unaffected"""
+        limiter = EndpointLimiter(2)
+        taken = [limiter.try_acquire("http://slow.test/") for _ in range(3)]
+        assert taken == [True, True, False]
+        assert limiter.try_acquire("http://other.test/")
+        assert limiter.saturated() == ["http://slow.test/"]
+
+    def test_idle_endpoints_forgotten(self):
+        """Counts are dropped once an endpoint has no deliveries in flight"""
+        limiter = EndpointLimiter(1)
+        limiter.try_acquire("http://a.test/")
+        limiter.release("http://a.test/")
+        assert limiter._in_use == {}
+
+
+class ClaimSession:
+    """Session factory returning canned claim rows and recording statements"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+    async def commit(self):
+        pass
+
+
+def delivery_row(url, active=True, attempts=0):
+    delivery = SimpleNamespace(id=uuid.uuid4(), webhook_id=uuid.uuid4(), event="card_created", body={"payload": {}}, attempts=attempts)
+    return (delivery, url, None, active)
+
+
+class TestClaim:
+    """Test suite for claiming due deliveries"""
+
+    NOW = datetime(2026, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+
+    def test_saturated_urls_excluded(self):
+        """Endpoints without a free slot are filtered out in SQL"""
+        sql = str(claim_query(self.NOW, 10, ["http://slow.test/"]).compile(dialect=postgresql.dialect()))
+        assert "webhooks.url NOT IN" in sql
+        assert "FOR UPDATE OF webhook_deliveries SKIP LOCKED" in sql
+
+    @pytest.mark.asyncio
+    async def test_only_free_slots_leased(self, monkeypatch):
+        """Rows beyond an endpoint's free slots are left unleased for other endpoints"""
+        rows = [delivery_row("http://slow.test/") for _ in range(3)] + [delivery_row("http://other.test/")]
+        session = ClaimSession(rows)
+        monkeypatch.setattr(webhooks, "async_session_maker", session)
+        worker = WebhookDeliveryWorker()
+        worker.limiter = EndpointLimiter(2)
+
+        claimed = await worker._claim(10)
+
+        assert [row[1] for row in claimed] == ["http://slow.test/", "http://slow.test/", "http://other.test/"]
+        leased = session.statements[1].compile().params
+        assert leased["status"] == DeliveryStatus.DELIVERING
+        assert worker.limiter.saturated() == ["http://slow.test/"]
+
+
+class RecordingSession(ClaimSession):
+    """Records the UPDATE written by _finish"""
+
+    def __init__(self):
+        super().__init__([])
+
+    def values(self):
+        return self.statements[-1].compile().params
+
+
+class TestDeliver:
+    """Test suite for recording attempt outcomes"""
+
+    @pytest.fixture
+    def session(self, monkeypatch):
+        session = RecordingSession()
+        monkeypatch.setattr(webhooks, "async_session_maker", session)
+        monkeypatch.setattr(webhooks.webhook_log_buffer, "add", lambda **kwargs: None)
+        return session
+
+    def respond_with(self, monkeypatch, status_code):
+        async def post(client, url, secret, body):
+            return webhooks.AttemptResult(status_code=status_code, response_body="")
+        monkeypatch.setattr(webhooks, "post_webhook", post)
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_rescheduled(self, session, monkeypatch):
+        """A 503 puts the delivery back to pending with a backoff delay"""
+        self.respond_with(monkeypatch, 503)
+        before = datetime.now(timezone.utc)
+        delivery, url, secret, active = delivery_row("http://a.test/")
+
+        await WebhookDeliveryWorker()._deliver(delivery, url, secret, active)
+
+        values = session.values()
+        assert values["status"] == DeliveryStatus.PENDING
+        assert values["attempts"] == 1
+        assert values["next_attempt_at"] > before
+        assert "completed_at" not in values
+
+    @pytest.mark.asyncio
+    async def test_last_attempt_dead_lettered(self, session, monkeypatch):
+        """The final allowed attempt moves the delivery to dead"""
+        self.respond_with(monkeypatch, 503)
+        delivery, url, secret, active = delivery_row(
+            "http://a.test/", attempts=webhooks.settings.WEBHOOK_MAX_ATTEMPTS - 1
+        )
+
+        await WebhookDeliveryWorker()._deliver(delivery, url, secret, active)
+
+        values = session.values()
+        assert values["status"] == DeliveryStatus.DEAD
+        assert values["completed_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, session, monkeypatch):
+        """A 400 is dead-lettered on the first attempt"""
+        self.respond_with(monkeypatch, 400)
+        delivery, url, secret, active = delivery_row("http://a.test/")
+
+        await WebhookDeliveryWorker()._deliver(delivery, url, secret, active)
+
+        assert session.values()["status"] == DeliveryStatus.DEAD
+
+    @pytest.mark.asyncio
+    async def test_cancelled_delivery_releases_slot(self):
+        """A delivery cancelled before it ran does not keep its endpoint slot"""
+        worker = WebhookDeliveryWorker()
+        worker.limiter.try_acquire("http://a.test/")
+        task = asyncio.create_task(asyncio.sleep(10))
+        worker._in_flight[task] = "http://a.test/"
+        task.add_done_callback(worker._delivery_done)
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0)
+
+        assert worker.limiter._in_use == {}
+        assert worker._in_flight == {}
@@ -0,0 +1,212 @@
+"""Tests for buffered webhook logging and retention"""
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError, ProgrammingError
+
+from app.core import metrics
+from app.core.config import settings
+from app.services.webhook_logs import (
+    COMPACTION_LOCK_KEY,
+    WebhookLogBuffer,
+    compaction_statements,
+    payload_hash,
+)
+
+
+class FakeSession:
+    """Records executed statements in place of a database session"""
+
+    def __init__(self, log, fail=False):
+        self.log = log
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def execute(self, statement, params=None):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.log.append((statement, params))
+
+    async def commit(self):
+        self.log.append(("commit", None))
+
+
+class WebhookDeletedSession(FakeSession):
+    """Fails log inserts that reference a deleted webhook, as the foreign key would"""
+
+    def __init__(self, log, live):
+        super().__init__(log)
+        self.live = live
+
+    async def execute(self, statement, params=None):
+        if isinstance(params, list) and any(row["webhook_id"] not in self.live for row in params):
+            raise IntegrityError("INSERT INTO webhook_logs", params, Exception("foreign key violation"))
+        await super().execute(statement, params)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.live)))
+
+
+def add_attempt(buffer, payload=None, webhook_id=None):
+    buffer.add(
+        webhook_id=webhook_id or uuid.uuid4(),
+        event="card_created",
+        payload=payload or {"card_id": "c1"},
+        response_status=200,
+        response_body="ok",
+        success=True,
+    )
+
+
+class TestPayloadHash:
+    """Test suite for payload content hashing"""
+
+    def test_key_order_ignored(self):
+        """Equal payloads hash the same regardless of key order"""
+        assert payload_hash({"a": 1, "b": [1, 2]}) == payload_hash({"b": [1, 2], "a": 1})
+
+    def test_different_payloads_differ(self):
+        """Different content gives different hashes"""
+        assert payload_hash({"a": 1}) != payload_hash({"a": 2})
+
+
+class TestWebhookLogBuffer:
+    """Test suite for batched log writes"""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_batch(self):
+        """All buffered rows go out in a single insert and commit"""
+        executed = []
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession(executed))
+        for _ in range(5):
+            add_attempt(buffer)
+
+        written = await buffer.flush()
+
+        assert written == 5
+        assert len(buffer) == 0
+        inserts = [params for statement, params in executed if statement != "commit"]
+        assert len(inserts) == 1 and len(inserts[0]) == 5
+        assert executed[-1][0] == "commit"
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_rows(self):
+        """Rows stay buffered when the database is unavailable"""
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession([], fail=True))
+        add_attempt(buffer)
+
+        assert await buffer.flush() == 0
+        assert len(buffer) == 1
+
+    @pytest.mark.asyncio
+    async def test_deleted_webhook_logs_dropped(self):
+        """Logs of a webhook deleted mid-delivery are dropped instead of blocking every flush"""
+        metrics.reset()
+        live, deleted = uuid.uuid4(), uuid.uuid4()
+        executed = []
+        buffer = WebhookLogBuffer(session_maker=lambda: WebhookDeletedSession(executed, {live}))
+        add_attempt(buffer, webhook_id=live)
+        add_attempt(buffer, webhook_id=deleted)
+
+        assert await buffer.flush() == 1
+
+        assert len(buffer) == 0
+        inserted = [params for _, params in executed if isinstance(params, list)]
+        assert [[row["webhook_id"] for row in batch] for batch in inserted] == [[live]]
+        assert metrics.snapshot()["counters"]["webhook_logs_orphaned"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_batch_not_retried(self):
+        """Errors other than an unreachable database drop the batch"""
+        class BrokenSession(FakeSession):
+            async def execute(self, statement, params=None):
+                raise ProgrammingError("INSERT INTO webhook_logs", params, Exception("syntax error"))
+
+        buffer = WebhookLogBuffer(session_maker=lambda: BrokenSession([]))
+        add_attempt(buffer)
+
+        assert await buffer.flush() == 0
+        assert len(buffer) == 0
+
+    def test_buffer_is_bounded(self, monkeypatch):
+        """The oldest rows are dropped beyond WEBHOOK_LOG_BUFFER_MAX"""
+        monkeypatch.setattr(settings, "WEBHOOK_LOG_BUFFER_MAX", 3)
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession([]))
+        for n in range(5):
+            add_attempt(buffer, {"n": n})
+
+        assert [row["payload"]["n"] for row in buffer._rows] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_dedupe_stores_payload_once(self, monkeypatch):
+        """With dedupe on, logs reference one stored copy per distinct payload"""
+        monkeypatch.setattr(settings, "WEBHOOK_LOG_DEDUPE_PAYLOADS", True)
+        executed = []
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession(executed))
+        for _ in range(3):
+            add_attempt(buffer, {"card_id": "same"})
+        add_attempt(buffer, {"card_id": "other"})
+
+        rows = list(buffer._rows)
+        await buffer.flush()
+
+        assert all(row["payload"] is None for row in rows)
+        assert len({row["payload_hash"] for row in rows}) == 2
+        payload_insert = executed[1][0]
+        compiled = payload_insert.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT" in str(compiled)
+        assert len([name for name in compiled.params if name.startswith("hash")]) == 2
+
+    @pytest.mark.asyncio
+    async def test_payload_flush_holds_compaction_lock_shared(self, monkeypatch):
+        """Payloads are stored under the compaction lock so they cannot be deleted as orphans meanwhile"""
+        monkeypatch.setattr(settings, "WEBHOOK_LOG_DEDUPE_PAYLOADS", True)
+        executed = []
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession(executed))
+        add_attempt(buffer)
+
+        await buffer.flush()
+
+        lock, params = executed[0]
+        assert "pg_advisory_xact_lock_shared" in str(lock)
+        assert params == {"key": COMPACTION_LOCK_KEY}
+
+    @pytest.mark.asyncio
+    async def test_flush_without_payloads_takes_no_lock(self):
+        """Logs that carry their payload inline do not wait for compaction"""
+        executed = []
+        buffer = WebhookLogBuffer(session_maker=lambda: FakeSession(executed))
+        add_attempt(buffer)
+
+        await buffer.flush()
+
+        assert not any("advisory" in str(statement) for statement, _ in executed)
+
+
+class TestCompaction:
+    """Test suite for retention statements"""
+
+    def compile(self, statement):
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    def test_steps_in_order(self):
+        """Logs are pruned before the payloads they reference"""
+        labels = [label for label, _ in compaction_statements(datetime.now(timezone.utc), 30, 1000)]
+        assert labels == ["expired_logs", "excess_logs", "finished_deliveries", "orphaned_payloads"]
+
+    def test_excess_logs_ranked_per_webhook(self):
+        """Per-webhook caps use a row_number window partitioned by webhook"""
+        statements = dict(compaction_statements(datetime.now(timezone.utc), 30, 1000))
+        sql = self.compile(statements["excess_logs"])
+        assert "row_number() OVER (PARTITION BY webhook_logs.webhook_id ORDER BY webhook_logs.created_at DESC)" in sql
+
+    def test_orphaned_payloads_use_not_exists(self):
+        """Only payloads no remaining log references are removed"""
+        statements = dict(compaction_statements(datetime.now(timezone.utc), 30, 1000))
+        assert "NOT (EXISTS" in self.compile(statements["orphaned_payloads"])
@@ -0,0 +1,366 @@
+"""Tests for WebSocket broadcast backends and per-client send queues"""
+import asyncio
+import json
+import sys
+import pytest
+
+from app.core import metrics
+
+from app.websocket import encoding
+from app.websocket.backends import MemoryBroadcastBackend, RedisBroadcastBackend, create_backend
+from app.websocket.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Records messages sent to a client"""
+
+    def __init__(self, fail: bool = False, blocked: bool = False, hang: bool = False):
+        self.fail = fail
+        self.hang = hang
+        self.sent = []
+        self.closed_with = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        if self.hang:
+            await asyncio.Event().wait()
+        await self.unblocked.wait()
+        if self.fail:
+            raise RuntimeError("connection closed")
+        self.sent.append(payload if payload == "pong" else json.loads(payload))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestMemoryBackend:
+    """Test suite for the single-process backend"""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_connected_clients(self):
+        """Events reach every client in the space"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        await manager.start()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(first, "space-1")
+        await manager.connect(second, "space-1")
+
+        await manager.send_card_deleted("space-1", "card-1", "column-1")
+
+        await wait_for(lambda: first.sent and second.sent)
+        assert first.sent == second.sent == [{
+            "type": "card_deleted",
+            "card_id": "card-1",
+            "column_id": "column-1",
+            "initiated_by": None,
+        }]
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_other_spaces_not_notified(self):
+        """Clients only receive events for their own space"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        await manager.start()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "space-1")
+
+        await manager.broadcast_to_space("space-2", {"type": "card_created"})
+
+        await asyncio.sleep(0.05)
+        assert ws.sent == []
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_last_disconnect_unsubscribes(self):
+        """The backend drops a space once its last client leaves"""
+        backend = MemoryBroadcastBackend()
+        manager = ConnectionManager(backend)
+        await manager.start()
+        ws = FakeWebSocket()
+        await manager.connect(ws, "space-1")
+        assert backend.subscriptions == {"space-1"}
+
+        await manager.disconnect(ws, "space-1")
+
+        assert backend.subscriptions == set()
+        assert manager.active_connections == {}
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_dead_connection_removed(self):
+        """A client that fails to receive is disconnected"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        await manager.start()
+        healthy, dead = FakeWebSocket(), FakeWebSocket(fail=True)
+        await manager.connect(healthy, "space-1")
+        await manager.connect(dead, "space-1")
+
+        await manager.broadcast_to_space("space-1", {"type": "ping"})
+
+        await wait_for(lambda: dead not in manager.active_connections["space-1"])
+        assert set(manager.active_connections["space-1"]) == {healthy}
+        assert healthy.sent == [{"type": "ping"}]
+        await manager.stop()
+
+
+class TestSendQueues:
+    """Test suite for per-client outbound queues"""
+
+    @pytest.fixture(autouse=True)
+    def clean_metrics(self):
+        metrics.reset()
+        yield
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_block_others(self):
+        """A stalled client does not delay delivery to the rest of the space"""
+        manager = ConnectionManager(MemoryBroadcastBackend(), queue_size=8)
+        await manager.start()
+        stalled, healthy = FakeWebSocket(blocked=True), FakeWebSocket()
+        await manager.connect(stalled, "space-1")
+        await manager.connect(healthy, "space-1")
+
+        await asyncio.wait_for(manager.broadcast_to_space("space-1", {"type": "ping"}), timeout=0.5)
+
+        await wait_for(lambda: healthy.sent)
+        assert stalled.sent == []
+        stalled.unblocked.set()
+        await wait_for(lambda: stalled.sent)
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_overflow_requests_resync(self):
+        """An overflowing client gets its backlog replaced by resync_required"""
+        manager = ConnectionManager(MemoryBroadcastBackend(), queue_size=3, slow_consumer_policy="resync")
+        await manager.start()
+        stalled = FakeWebSocket(blocked=True)
+        await manager.connect(stalled, "space-1")
+        # The writer holds the first message while blocked; the next three fill the queue
+        for i in range(5):
+            await manager.broadcast_to_space("space-1", {"type": "card_updated", "n": i})
+            await asyncio.sleep(0)
+
+        stalled.unblocked.set()
+        await wait_for(lambda: len(stalled.sent) >= 2)
+        assert stalled.sent == [{"type": "card_updated", "n": 0}, {"type": "resync_required"}]
+        assert metrics.snapshot()["counters"]["websocket_slow_consumers"] == 1
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_client(self):
+        """With the drop policy an overflowing client is closed and removed"""
+        manager = ConnectionManager(MemoryBroadcastBackend(), queue_size=2, slow_consumer_policy="drop")
+        await manager.start()
+        stalled = FakeWebSocket(blocked=True)
+        await manager.connect(stalled, "space-1")
+        for i in range(4):
+            await manager.broadcast_to_space("space-1", {"type": "card_updated", "n": i})
+            await asyncio.sleep(0)
+
+        stalled.unblocked.set()
+        await wait_for(lambda: "space-1" not in manager.active_connections)
+        assert stalled.closed_with == 1013
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_reported(self):
+        """Queue depths are visible to the metrics gauges"""
+        manager = ConnectionManager(MemoryBroadcastBackend(), queue_size=10)
+        await manager.start()
+        stalled = FakeWebSocket(blocked=True)
+        await manager.connect(stalled, "space-1")
+        for i in range(4):
+            await manager.broadcast_to_space("space-1", {"type": "ping"})
+            await asyncio.sleep(0)
+
+        # One message is held by the blocked writer, the rest wait in the queue
+        assert manager.queue_depths() == [3]
+        assert manager.connection_count() == 1
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_hung_send_closes_client(self):
+        """A send that never completes closes the socket and stops queueing"""
+        manager = ConnectionManager(MemoryBroadcastBackend(), send_timeout=0.05)
+        await manager.start()
+        hung = FakeWebSocket(hang=True)
+        client = await manager.connect(hung, "space-1")
+
+        await manager.broadcast_to_space("space-1", {"type": "ping"})
+
+        await wait_for(lambda: "space-1" not in manager.active_connections)
+        assert hung.closed_with == 1011
+        assert client.closed
+        client.enqueue("pong")
+        assert client.depth == 0
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_pong_goes_through_queue(self):
+        """Direct sends such as heartbeats use the same writer"""
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        await manager.start()
+        ws = FakeWebSocket()
+        client = await manager.connect(ws, "space-1")
+
+        client.enqueue("pong")
+
+        await wait_for(lambda: ws.sent)
+        assert ws.sent == ["pong"]
+        await manager.stop()
+
+
+class TestRedisBackend:
+    """Test suite for Redis fan-out between workers"""
+
+    @pytest.fixture
+    def server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis.FakeServer()
+
+    def make_manager(self, server):
+        import fakeredis
+        client = fakeredis.FakeAsyncRedis(server=server)
+        return ConnectionManager(RedisBroadcastBackend(client=client))
+
+    @pytest.mark.asyncio
+    async def test_event_crosses_workers(self, server):
+        """An event published by one worker reaches clients of another"""
+        worker_a = self.make_manager(server)
+        worker_b = self.make_manager(server)
+        await worker_a.start()
+        await worker_b.start()
+        ws = FakeWebSocket()
+        await worker_b.connect(ws, "space-1")
+
+        await worker_a.send_tag_deleted("space-1", "tag-1", initiated_by="user-1")
+
+        await wait_for(lambda: ws.sent)
+        assert ws.sent == [{"type": "tag_deleted", "tag_id": "tag-1", "initiated_by": "user-1"}]
+        await worker_a.stop()
+        await worker_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_publisher_clients_also_receive(self, server):
+        """The publishing worker's own clients get the event once"""
+        worker = self.make_manager(server)
+        await worker.start()
+        ws = FakeWebSocket()
+        await worker.connect(ws, "space-1")
+
+        await worker.broadcast_to_space("space-1", {"type": "ping"})
+
+        await wait_for(lambda: ws.sent)
+        await asyncio.sleep(0.05)
+        assert ws.sent == [{"type": "ping"}]
+        await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_only_subscribed_spaces_delivered(self, server):
+        """Workers receive events only for spaces with local clients"""
+        worker_a = self.make_manager(server)
+        worker_b = self.make_manager(server)
+        await worker_a.start()
+        await worker_b.start()
+        in_space_1, in_space_2 = FakeWebSocket(), FakeWebSocket()
+        await worker_b.connect(in_space_1, "space-1")
+        await worker_b.connect(in_space_2, "space-2")
+
+        await worker_a.broadcast_to_space("space-2", {"type": "ping"})
+
+        await wait_for(lambda: in_space_2.sent)
+        assert in_space_1.sent == []
+        await worker_a.stop()
+        await worker_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribed_after_last_disconnect(self, server):
+        """A worker stops receiving a space after its last client leaves"""
+        worker_a = self.make_manager(server)
+        worker_b = self.make_manager(server)
+        await worker_a.start()
+        await worker_b.start()
+        leaving, staying = FakeWebSocket(), FakeWebSocket()
+        await worker_b.connect(leaving, "space-1")
+        await worker_a.connect(staying, "space-1")
+        await worker_b.disconnect(leaving, "space-1")
+
+        await worker_a.broadcast_to_space("space-1", {"type": "ping"})
+
+        await wait_for(lambda: staying.sent)
+        assert leaving.sent == []
+        assert worker_b.backend.subscriptions == set()
+        await worker_a.stop()
+        await worker_b.stop()
+
+
+class TestEncoding:
+    """Test suite for serialize-once event encoding"""
+
+    MESSAGE = {"type": "card_updated", "card": {"id": "c1", "name": "Größe ✓", "tags": []}, "initiated_by": None}
+
+    def test_round_trip(self):
+        """Encoded text decodes back to the event"""
+        assert json.loads(encoding.encode_message(self.MESSAGE)) == self.MESSAGE
+
+    def test_json_fallback_matches(self, monkeypatch):
+        """Without orjson the stdlib encoder produces equivalent JSON"""
+        monkeypatch.setattr(encoding, "orjson", None)
+        assert encoding.encoder_name() == "json"
+        assert json.loads(encoding.encode_message(self.MESSAGE)) == self.MESSAGE
+
+    @pytest.mark.asyncio
+    async def test_encoded_once_per_broadcast(self, monkeypatch):
+        """One broadcast encodes once regardless of subscriber count"""
+        calls = []
+        real_encode = encoding.encode_message
+        # "app.websocket.manager" resolves to the singleton, so patch the module directly
+        manager_module = sys.modules[ConnectionManager.__module__]
+        monkeypatch.setattr(
+            manager_module,
+            "encode_message",
+            lambda message: calls.append(message) or real_encode(message),
+        )
+        manager = ConnectionManager(MemoryBroadcastBackend())
+        await manager.start()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for ws in sockets:
+            await manager.connect(ws, "space-1")
+
+        await manager.broadcast_to_space("space-1", self.MESSAGE)
+
+        await wait_for(lambda: all(ws.sent for ws in sockets))
+        assert len(calls) == 1
+        await manager.stop()
+
+
+class TestCreateBackend:
+    """Test suite for backend selection"""
+
+    def test_memory(self):
+        """'memory' builds the in-process backend"""
+        assert isinstance(create_backend("memory"), MemoryBroadcastBackend)
+
+    def test_redis(self):
+        """'redis' builds the pub/sub backend without connecting"""
+        pytest.importorskip("redis")
+        assert isinstance(create_backend("redis", "redis://localhost:6379/0"), RedisBroadcastBackend)
+
+    def test_unknown_backend_rejected(self):
+        """Typos in BROADCAST_BACKEND fail at startup"""
+        with pytest.raises(ValueError):
+            create_backend("carrier-pigeon")
@@ -120,6 +120,15 @@ export default function KanbanBoard({ spaceId }: KanbanBoardProps) {
     onTagDeleted: () => {
       queryClient.invalidateQueries({ queryKey: ['tags', spaceId] })
     },
+    onResyncRequired: () => {
+      queryClient.invalidateQueries({ queryKey: ['columns', spaceId] })
+      queryClient.invalidateQueries({ queryKey: ['tags', spaceId] })
+      columns.forEach((col) => {
+        cardsApi.list({ column_id: col.id }).then((columnCards) => {
+          setCards(col.id, columnCards)
+        })
+      })
+    },
   })
 
   // Handle opening card from URL param (e.g., from notification click)
@@ -35,6 +35,7 @@ interface WebSocketCallbacks {
   onTagUpdated?: (tag: any) => void
   onTagDeleted?: (tagId: string) => void
   onColumnUpdated?: (column: any) => void
+  onResyncRequired?: () => void
 }
 
 export function useWebSocket(spaceId: string | undefined, callbacks?: WebSocketCallbacks) {
@@ -165,6 +166,10 @@ export function useWebSocket(spaceId: string | undefined, callbacks?: WebSocketC
         }
         break
 
+      case 'resync_required':
+        callbacksRef.current?.onResyncRequired?.()
+        break
+
       default:
         if (message.type !== 'pong') {
           console.log('Unknown WebSocket message type:', message.type)